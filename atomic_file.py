@@ -0,0 +1,52 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterator, Union
+
+
+def _fsync_directory(directory: str):
+    """Make a rename durable; directories can't be opened like this on Windows"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    except OSError:
+        pass
+
+
+@contextmanager
+def atomic_open(path: str, mode: str = "w", durable: bool = True, **open_kwargs) -> Iterator[IO]:
+    """Write to a temp file next to path that replaces it only if the block finishes.
+
+    Readers see either the old file or the new one, never half of it; on an
+    exception the temp file is removed and path is left alone. durable also
+    fsyncs the data and the rename, for files that must survive a power cut.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, mode, **open_kwargs) as f:
+            yield f
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    if durable:
+        _fsync_directory(directory)
+
+
+def atomic_write(path: str, data: Union[str, bytes], mode: str = "w", durable: bool = True):
+    """Replace path with data in one step (see atomic_open)"""
+    open_kwargs = {} if "b" in mode else {"encoding": "utf-8"}
+    with atomic_open(path, mode, durable, **open_kwargs) as f:
+        f.write(data)
@@ -0,0 +1,244 @@
+"""Offline benchmark of the message handling path.
+
+Builds a synthetic config and a stream of fake discord.Message-like objects,
+runs them through the same steps as bot.on_message (channel check, trigger
+match, cooldown, reply with the send stubbed out) and reports per-message
+p50/p99 and messages/sec for each keyword matcher.
+
+    python benchmark.py --messages 20000 --keywords 500 --channels 50
+    python benchmark.py --matchers aho-corasick --json
+"""
+import argparse
+import asyncio
+import dataclasses
+import json
+import random
+import string
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from cooldowns import CooldownScheduler
+from triggers import CompiledConfig, KeywordMatcher
+
+
+class NaiveKeywordMatcher:
+    """The pre-automaton matcher: one `in` check per keyword, in config order"""
+
+    def __init__(self, keywords, case_sensitive: bool = False):
+        self.keywords = list(keywords)
+        self.case_sensitive = case_sensitive
+        self._patterns = self.keywords if case_sensitive else [keyword.lower() for keyword in self.keywords]
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def first_match(self, text: str) -> Optional[str]:
+        if not self.case_sensitive:
+            text = text.lower()
+        for keyword, pattern in zip(self.keywords, self._patterns):
+            if pattern in text:
+                return keyword
+        return None
+
+
+MATCHERS = {
+    "naive": NaiveKeywordMatcher,
+    "aho-corasick": KeywordMatcher,
+}
+
+
+def _word(rng: random.Random, min_length: int = 3, max_length: int = 9) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(min_length, max_length)))
+
+
+def build_config(rng: random.Random, keyword_count: int, channel_count: int, role_count: int,
+                 rule_count: int, cooldown_minutes: int) -> Dict[str, Any]:
+    keywords = {}
+    while len(keywords) < keyword_count:
+        keywords[f"{_word(rng)} {_word(rng)}"] = f"response {len(keywords)}"
+
+    rules = [{"name": f"rule {index}", "all_of": [_word(rng, 5, 8), _word(rng, 5, 8)], "word_boundary": True,
+              "response": f"rule response {index}"} for index in range(rule_count)]
+
+    return {
+        "token": "benchmark",
+        "keywords": keywords,
+        "case_sensitive": False,
+        "respond_to_self": False,
+        "reply_to_message": True,
+        "role_mentions": {str(10**17 + index): f"role response {index}" for index in range(role_count)},
+        "allowed_channels": [str(2 * 10**17 + index) for index in range(channel_count)],
+        "message_delay_minutes": cooldown_minutes,
+        "cooldown_scope": "channel_trigger",
+        "rules": rules,
+    }
+
+
+class _Sink:
+    """Stands in for Messageable.send/Message.reply - records instead of hitting Discord"""
+
+    def __init__(self):
+        self.sent = 0
+
+    async def send(self, content):
+        self.sent += 1
+
+
+def build_messages(rng: random.Random, config: Dict[str, Any], count: int, length: int,
+                   hit_rate: float, role_mention_rate: float, foreign_channel_rate: float) -> List[SimpleNamespace]:
+    """Fake messages with just the attributes on_message touches"""
+    keywords = list(config["keywords"])
+    channels = [int(channel_id) for channel_id in config["allowed_channels"]] or [1]
+    role_ids = [int(role_id) for role_id in config["role_mentions"]]
+    guild = SimpleNamespace(id=3 * 10**17, name="Benchmark Guild")
+    author = SimpleNamespace(id=4 * 10**17, name="someone")
+
+    messages = []
+    for index in range(count):
+        words = []
+        while sum(len(word) + 1 for word in words) < length:
+            words.append(_word(rng))
+        if keywords and rng.random() < hit_rate:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+        content = " ".join(words)
+
+        role_mentions = []
+        if role_ids and rng.random() < role_mention_rate:
+            role_id = rng.choice(role_ids)
+            role_mentions.append(SimpleNamespace(id=role_id, name=f"role-{role_id}"))
+
+        channel_id = rng.choice(channels)
+        if rng.random() < foreign_channel_rate:
+            channel_id = 5 * 10**17 + index  # not in the allow-list
+
+        sink = _Sink()
+        messages.append(SimpleNamespace(
+            id=index, content=content, author=author, guild=guild, role_mentions=role_mentions,
+            channel=SimpleNamespace(id=channel_id, name=f"channel-{channel_id}", send=sink.send),
+            reply=sink.send, created_at=None))
+    return messages
+
+
+async def handle_message(cfg: CompiledConfig, cooldowns: CooldownScheduler, message, bot_user) -> bool:
+    """bot.on_message minus logging/latency bookkeeping: same CompiledConfig.decide(). True if a response was sent."""
+    match, acquired, _, _ = cfg.decide(message, cooldowns, message.author == bot_user)
+    if not acquired:
+        return False
+    if cfg.reply_to_message:
+        await message.reply(match.response)
+    else:
+        await message.channel.send(match.response)
+    return True
+
+
+def _percentile(sorted_samples: List[int], pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, int(round(pct / 100.0 * len(sorted_samples))) - 1))
+    return sorted_samples[index]
+
+
+async def run_matcher(cfg: CompiledConfig, messages, warmup: int) -> Dict[str, Any]:
+    bot_user = SimpleNamespace(id=0, name="benchmark-bot")
+    cooldowns = CooldownScheduler()
+    for message in messages[:warmup]:
+        await handle_message(cfg, cooldowns, message, bot_user)
+    cooldowns.clear()
+
+    samples = []
+    sent = 0
+    clock = time.perf_counter_ns
+    started = clock()
+    for message in messages:
+        before = clock()
+        if await handle_message(cfg, cooldowns, message, bot_user):
+            sent += 1
+        samples.append(clock() - before)
+    elapsed_ns = clock() - started
+
+    samples.sort()
+    return {
+        "messages": len(messages),
+        "responses": sent,
+        "p50_us": round(_percentile(samples, 50) / 1000, 2),
+        "p99_us": round(_percentile(samples, 99) / 1000, 2),
+        "max_us": round(samples[-1] / 1000, 2) if samples else 0.0,
+        "messages_per_sec": round(len(messages) / (elapsed_ns / 1e9), 1) if elapsed_ns else None,
+    }
+
+
+def check_agreement(configs: Dict[str, CompiledConfig], messages) -> List[str]:
+    """Every matcher has to pick the same trigger - a fast wrong matcher is no use"""
+    problems = []
+    names = list(configs)
+    for message in messages:
+        results = {name: configs[name].match_message(message) for name in names}
+        if len(set(results.values())) > 1:
+            problems.append(f"message {message.id}: " + ", ".join(f"{name}={result and result.name!r}"
+                                                                 for name, result in results.items()))
+            if len(problems) >= 5:
+                break
+    return problems
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark BoostBot's message handling path offline")
+    parser.add_argument("--messages", type=int, default=20000, help="messages to run through each matcher")
+    parser.add_argument("--keywords", type=int, default=200, help="configured keywords")
+    parser.add_argument("--channels", type=int, default=20, help="allowed channels (0 = listen everywhere)")
+    parser.add_argument("--roles", type=int, default=10, help="configured role mentions")
+    parser.add_argument("--rules", type=int, default=0, help="configured match rules")
+    parser.add_argument("--length", type=int, default=120, help="approximate message length in characters")
+    parser.add_argument("--hit-rate", type=float, default=0.05, help="fraction of messages containing a keyword")
+    parser.add_argument("--role-rate", type=float, default=0.01, help="fraction of messages mentioning a role")
+    parser.add_argument("--foreign-rate", type=float, default=0.1,
+                        help="fraction of messages from channels outside the allow-list")
+    parser.add_argument("--cooldown", type=int, default=0, help="message_delay_minutes for the synthetic config")
+    parser.add_argument("--matchers", default=",".join(MATCHERS),
+                        help=f"comma separated, any of: {', '.join(MATCHERS)}")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    matcher_names = [name.strip() for name in args.matchers.split(",") if name.strip()]
+    unknown = [name for name in matcher_names if name not in MATCHERS]
+    if unknown or not matcher_names:
+        print(f"Unknown matcher(s): {', '.join(unknown) or '(none given)'}", file=sys.stderr)
+        return 2
+
+    rng = random.Random(args.seed)
+    config = build_config(rng, args.keywords, args.channels, args.roles, args.rules, args.cooldown)
+    messages = build_messages(rng, config, args.messages, args.length, args.hit_rate, args.role_rate,
+                              args.foreign_rate)
+
+    base = CompiledConfig.from_config(config)
+    configs = {name: dataclasses.replace(base, keyword_matcher=MATCHERS[name](config["keywords"], base.case_sensitive))
+               for name in matcher_names}
+
+    problems = check_agreement(configs, messages) if len(configs) > 1 else []
+
+    warmup = min(1000, len(messages))
+    results = {name: asyncio.run(run_matcher(cfg, messages, warmup)) for name, cfg in configs.items()}
+
+    if args.json:
+        print(json.dumps({"settings": vars(args), "results": results, "disagreements": problems}, indent=2))
+    else:
+        print(f"{args.messages} messages, {args.keywords} keywords, {args.channels} channels, "
+              f"{args.roles} roles, {args.rules} rules, ~{args.length} chars")
+        print(f"{'matcher':<14}{'p50 us':>10}{'p99 us':>10}{'max us':>10}{'msg/s':>12}{'responses':>11}")
+        for name, result in results.items():
+            print(f"{name:<14}{result['p50_us']:>10}{result['p99_us']:>10}{result['max_us']:>10}"
+                  f"{result['messages_per_sec']:>12}{result['responses']:>11}")
+        for problem in problems:
+            print(f"MISMATCH {problem}")
+
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,68 +1,133 @@
-import discord
+"""BoostBot's Discord side.
+
+Run headless with a config picked on the command line:
+
+    python bot.py --config config.json --no-notify
+    python bot.py --config /srv/boostbot/main.json --log-format json
+
+Nothing happens at import time - discord.py, the config and every worker
+thread are set up in main(), so the module can be imported without a
+display, a token or discord.py itself.
+"""
+import argparse
 import asyncio
-import json
 import os
 import sys
 import platform
 import time
 import logging
-from discord.ext import commands
-import tkinter as tk
-from tkinter import messagebox
 from config_manager import ConfigManager
+from notifier import Notifier
+from latency import LatencyTracker
+from structured_log import LogPipeline, LOG_FORMATS, ENV_LOG_FORMAT
+import atexit
+import ipc
+import queue
+import threading
+from snapshot import compile_config, save_snapshot
+from memory import MEMORY_REPORT_MINUTES, memory_report
+from cooldowns import CooldownScheduler
+from replay import ENV_TRACE_FILE, TraceRecorder, trace_record
+from name_cache import NameCache
+from reports import REPORT_FORMATS, describe_rule, open_report, report_path, timestamp as report_timestamp
 
-# Completely disable Discord.py logging
-logging.getLogger('discord').disabled = True
-logging.getLogger('discord.client').disabled = True
-logging.getLogger('discord.gateway').disabled = True
-logging.getLogger('discord.http').disabled = True
-logging.getLogger('discord.voice_client').disabled = True
-logging.getLogger('discord.player').disabled = True
-logging.getLogger('discord.opus').disabled = True
-
-# Also disable root logger for discord modules
-logging.getLogger().setLevel(logging.CRITICAL)
-
-# Redirect Discord's logging to devnull
-import io
-discord_log_handler = logging.StreamHandler(io.StringIO())
-discord_log_handler.setLevel(logging.CRITICAL)
-for logger_name in ['discord', 'discord.client', 'discord.gateway', 'discord.http']:
-    logger = logging.getLogger(logger_name)
-    logger.addHandler(discord_log_handler)
-    logger.propagate = False
+# discord.py is imported by main(); handlers only touch it once the bot is running
+discord = None
+
+def silence_discord_logging():
+    """Completely disable Discord.py logging"""
+    for logger_name in ['discord', 'discord.client', 'discord.gateway', 'discord.http',
+                        'discord.voice_client', 'discord.player', 'discord.opus']:
+        logger = logging.getLogger(logger_name)
+        logger.disabled = True
+        logger.propagate = False
+    
+    # Also disable root logger for discord modules
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+# Log lines go through a queue + writer thread once main() starts it; until then they're written inline
+log_pipeline = LogPipeline(fmt=os.environ.get(ENV_LOG_FORMAT, "text"))
 
 # Custom logging function for bot messages
-def bot_log(message):
-    """Custom logging function with timestamp"""
-    from datetime import datetime
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    print(f"[{timestamp}] {message}")
-    # Force flush to ensure output appears immediately
-    sys.stdout.flush()
-
-def show_popup(title, message):
-    """Show Windows popup dialog"""
+def bot_log(message, level="INFO", event="log", **fields):
+    """Queue a log record - never blocks on stdout"""
+    log_pipeline.log(message, level=level, event=event, **fields)
+
+# Popups run on their own thread - a messagebox inside on_message would freeze the gateway loop.
+# None when started with --no-notify, so a headless bot never loads tkinter.
+notifier = None
+
+# Per-stage response timings, queryable from the GUI over IPC
+latency_tracker = LatencyTracker()
+
+# Anything that isn't the reply itself (log lines, popups) runs here, after the send
+post_send_queue = queue.SimpleQueue()
+
+def post_send_worker():
+    while True:
+        job, args = post_send_queue.get()
+        try:
+            job(*args)
+        except Exception as e:
+            bot_log(f"Error in post-send job: {e}")
+
+# Optional traffic capture for replay.py - off unless the env var names a file
+trace_recorder = None
+
+def start_trace_recorder():
+    global trace_recorder
+    if not os.environ.get(ENV_TRACE_FILE):
+        return
     try:
-        # Create a hidden root window
-        root = tk.Tk()
-        root.withdraw()  # Hide the main window
-        
-        # Show the message box
-        messagebox.showinfo(title, message)
-        
-        # Clean up
-        root.destroy()
-        
-    except Exception as e:
-        # Fallback if popup fails
-        bot_log(f"Popup failed: {e}")
+        trace_recorder = TraceRecorder(os.environ[ENV_TRACE_FILE])
+        atexit.register(trace_recorder.close)
+        bot_log(f"Recording message trace to {trace_recorder.path}")
+    except OSError as e:
+        bot_log(f"Could not open trace file: {e}", level="WARNING")
+
+# Set up by main(): the manager is kept around so the running bot can re-read the same file on reload
+config_manager = None
+config = None
+compiled_config = None
+loaded_config_signature = None
+# The watcher and the GUI can both ask for a reload; one at a time keeps them in order.
+# Made in setup_hook so it belongs to the bot's loop
+reload_lock = None
+
+def active_config_path():
+    config_name = config_manager.get_current_config_name() or config_manager.default_config_name
+    return os.path.join(config_manager.config_dir, config_name)
+
+def config_file_signature():
+    """(mtime, size) of the active config file, None if it's gone"""
+    try:
+        stat = os.stat(active_config_path())
+        return stat.st_mtime_ns, stat.st_size
+    except OSError:
+        return None
+
+def compile_active_config(new_config):
+    """Precompute everything on_message needs (channel set, role lookup, keyword automaton).
+    
+    The automata come from the snapshot next to the config when it was built
+    from the same keywords/rules, so startup and reload don't rebuild them.
+    """
+    started = time.perf_counter()
+    config_path = active_config_path()
+    compiled, from_snapshot = compile_config(new_config, config_path)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if from_snapshot:
+        bot_log(f"Matchers loaded from snapshot in {elapsed_ms:.0f}ms", event="config_compile")
+    else:
+        bot_log(f"Matchers built in {elapsed_ms:.0f}ms", event="config_compile")
+        # Pickling a big automaton takes a moment - keep it off the event loop
+        post_send_queue.put((save_snapshot, (config_path, compiled)))
+    return compiled
 
-def load_config():
+def load_config(config_name=None):
     """Load configuration using ConfigManager"""
     try:
-        config_manager = ConfigManager()
-        config, message = config_manager.load_config()
+        config, message = config_manager.load_config(config_name)
         
         if config is None:
             print(f"ERROR: {message}")
@@ -75,107 +140,186 @@ def load_config():
         print(f"ERROR loading config: {e}")
         return None
 
-# Load configuration
-config = load_config()
-if not config:
-    print("ERROR: Failed to load configuration")
-    exit(1)
-
-bot_log("=== Discord Self-Bot Starting ===")
-bot_log(f"Config loaded: {len(config.get('keywords', {}))} keywords, {len(config.get('role_mentions', {}))} role mentions")
-bot_log("Creating bot instance...")
-if config.get("allowed_channels"):
-    bot_log(f"Listening in {len(config['allowed_channels'])} channels")
-else:
-    bot_log("Listening in ALL channels (no channel restrictions)")
-
-# Create bot instance with logging disabled
-try:
-    bot_log("Initializing Discord bot...")
-    bot = commands.Bot(command_prefix='!', self_bot=True, chunk_guilds_at_startup=False)
-    bot_log("Bot instance created successfully")
-except Exception as e:
-    bot_log(f"ERROR creating bot instance: {e}")
-    print(f"ERROR creating bot instance: {e}")
-    exit(1)
-
-# Disable Discord client logging
-try:
-    bot._connection._logger.disabled = True
-    bot_log("Discord logging disabled")
-except Exception as e:
-    bot_log(f"Warning: Could not disable Discord logging: {e}")
-
-# Global timer for message delays
-last_message_time = 0
-
-# Background task for handling name resolution requests
-async def monitor_name_requests():
-    """Monitor for name resolution request files"""
-    bot_log("Name request monitor started - checking for requests every 0.5 seconds")
+async def reload_config(reason):
+    """Re-read the config file and swap it in if it's valid.
+    
+    Reading, validating and compiling run in a worker thread so a big config
+    doesn't stall message handling. The new CompiledConfig is fully built
+    before the single global assignment back on the loop, and on_message grabs
+    one reference up front - so a message being handled during a reload sees
+    either the old config or the new one, never a mix.
+    """
+    async with reload_lock:
+        return await _reload_config(reason)
+
+async def _reload_config(reason):
+    global config, compiled_config, loaded_config_signature
+    
+    signature = config_file_signature()
+    new_config, message = await asyncio.to_thread(config_manager.reload_current_config)
+    if new_config is None:
+        # Remember the broken file so the watcher doesn't retry it every tick
+        loaded_config_signature = signature
+        bot_log(f"Config reload ({reason}) rejected, keeping current config: {message}", level="WARNING", event="config_reload")
+        return False, message
+    
+    try:
+        new_compiled = await asyncio.to_thread(compile_active_config, new_config)
+    except Exception as e:
+        loaded_config_signature = signature
+        bot_log(f"Config reload ({reason}) failed to compile, keeping current config: {e}", level="ERROR", event="config_reload")
+        return False, str(e)
+    
+    token_changed = new_config.get("token") != config.get("token")
+    lean_changed = bool(new_config.get("lean_cache", False)) != bool(config.get("lean_cache", False))
+    compiled_config = new_compiled
+    config = new_config
+    loaded_config_signature = signature
+    
+    bot_log(f"Config reloaded ({reason}): {len(new_compiled.keyword_responses)} keywords, "
+            f"{len(new_compiled.rule_engine)} rules, {len(new_compiled.role_responses)} role mentions, {len(new_compiled.allowed_channels)} channels",
+            event="config_reload")
+    if token_changed:
+        bot_log("Token changed - restart the bot to log in with the new token", level="WARNING", event="config_reload")
+    if lean_changed:
+        bot_log("Lean memory mode changed - restart the bot to apply it", level="WARNING", event="config_reload")
+    return True, "Config reloaded"
+
+async def watch_config_file(interval_seconds=2.0):
+    """Reload when the config file changes on disk (a stat() every couple of seconds)"""
     while True:
+        await asyncio.sleep(interval_seconds)
         try:
-            # Check for role name request
-            if os.path.exists("get_role_names"):
-                bot_log("Role name request detected!")
-                os.remove("get_role_names")
-                await dump_role_info_with_names()
-            
-            # Check for channel name request
-            if os.path.exists("get_channel_names"):
-                bot_log("Channel name request detected!")
-                os.remove("get_channel_names")
-                await dump_channel_info_with_names()
-            
-            # Check for single channel name request
-            if os.path.exists("get_single_channel_name"):
-                bot_log("Single channel name request detected!")
-                with open("get_single_channel_name", "r") as f:
-                    channel_id = f.read().strip()
-                os.remove("get_single_channel_name")
-                await dump_single_channel_name(channel_id)
-            
-            # Check for documentation creation request
-            if os.path.exists("create_documentation"):
-                bot_log("Documentation creation request detected!")
-                os.remove("create_documentation")
-                channel_mapping = get_channel_name_mapping()
-                await create_channel_documentation(channel_mapping)
-            
-            # Check for test connection request (commented out - uncomment if needed for debugging)
-            # if os.path.exists("test_bot_connection"):
-            #     bot_log("Bot connection test detected!")
-            #     os.remove("test_bot_connection")
-            #     bot_log("Bot is running and monitoring files correctly!")
-            
-                
+            signature = config_file_signature()
+            if signature is None or signature == loaded_config_signature:
+                continue
+            # Give a non-atomic writer a moment to finish before we parse
+            await asyncio.sleep(0.25)
+            if config_file_signature() != signature:
+                continue  # still being written, catch it next tick
+            await reload_config("file changed")
         except Exception as e:
-            bot_log(f"Error in name request monitor: {e}")
-        
-        await asyncio.sleep(0.5)  # Check every half second
+            bot_log(f"Error in config watcher: {e}", level="ERROR")
 
-# Start the background task immediately when the module loads
-import asyncio
-import threading
+def log_startup_summary():
+    bot_log("=== Discord Self-Bot Starting ===")
+    bot_log(f"Config loaded: {len(config.get('keywords', {}))} keywords, {len(config.get('rules', []))} rules, "
+            f"{len(config.get('role_mentions', {}))} role mentions")
+    if config.get("allowed_channels"):
+        bot_log(f"Listening in {len(config['allowed_channels'])} channels")
+    else:
+        bot_log("Listening in ALL channels (no channel restrictions)")
+
+def log_memory(client=None):
+    text, fields = memory_report(client)
+    bot_log(text, event="memory", **fields)
 
-def start_background_task():
-    """Start the background task in a separate thread"""
+async def report_memory(interval_seconds=MEMORY_REPORT_MINUTES * 60):
+    """Log resident memory and cache sizes now and then - long sessions only ever grow"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            log_memory(bot)
+        except Exception as e:
+            bot_log(f"Error measuring memory: {e}", level="ERROR")
+
+def create_bot(lean=False):
+    """Build the discord.py client - the only place that needs discord.ext.
+    
+    Lean mode drops the caches on_message never reads: the message cache
+    (the event carries the message itself) and the member cache. Guild
+    subscriptions stay on, without them large guilds stop sending on_message.
+    """
+    from discord.ext import commands
+    
+    class BoostBot(commands.Bot):
+        """Bot that owns the GUI request service on its own event loop.
+        
+        Channel/role lookups in the IPC handlers read discord.py state, which is
+        only safe from the loop that owns it - so no side threads or side loops.
+        """
+        
+        background_tasks = ()
+        
+        async def setup_hook(self):
+            global reload_lock
+            reload_lock = asyncio.Lock()
+            if notifier is not None:
+                notifier.start()
+            self.background_tasks = (
+                asyncio.create_task(run_ipc_server(), name="boostbot-ipc"),
+                asyncio.create_task(watch_config_file(), name="boostbot-config-watcher"),
+                asyncio.create_task(report_memory(), name="boostbot-memory-report"),
+            )
+        
+        async def close(self):
+            for task in self.background_tasks:
+                task.cancel()
+            for task in self.background_tasks:
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+            self.background_tasks = ()
+            name_cache.save()
+            if notifier is not None:
+                notifier.stop()
+            await super().close()
+    
+    cache_options = {}
+    if lean:
+        cache_options = {"max_messages": None, "member_cache_flags": discord.MemberCacheFlags.none()}
+    
+    bot_log("Creating bot instance" + (" (lean: no message or member cache)..." if lean else "..."))
+    new_bot = BoostBot(command_prefix='!', self_bot=True, chunk_guilds_at_startup=False, **cache_options)
+    
+    # Disable Discord client logging
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(monitor_name_requests())
+        new_bot._connection._logger.disabled = True
     except Exception as e:
-        bot_log(f"Failed to start background task: {e}")
+        bot_log(f"Warning: Could not disable Discord logging: {e}")
+    
+    for handler in EVENT_HANDLERS:
+        new_bot.event(handler)
+    return new_bot
+
+bot = None
+
+# Response cooldowns per (channel, trigger) - survives config reloads
+cooldowns = CooldownScheduler()
+
+# Channel/role/guild names shared with the GUI through name_cache.json
+name_cache = NameCache()
 
-# Start the background task in a separate thread
-background_thread = threading.Thread(target=start_background_task, daemon=True)
-background_thread.start()
-bot_log("Background task started in separate thread")
+def remember_guild(guild):
+    name_cache.set("guilds", guild.id, guild.name)
+
+def remember_channel(channel):
+    """Put a channel (and its guild) in the name cache, returns its display label"""
+    guild = getattr(channel, "guild", None)
+    if guild is not None:
+        remember_guild(guild)
+    name_cache.set("channels", channel.id, getattr(channel, "name", None) or str(channel.id),
+                   guild.id if guild is not None else None)
+    return name_cache.channel_label(channel.id)
+
+def remember_role(role):
+    remember_guild(role.guild)
+    name_cache.set("roles", role.id, role.name, role.guild.id)
+
+def find_role(role_id):
+    """Look a role up in every guild we're in (roles aren't indexed globally)"""
+    for guild in bot.guilds:
+        role = guild.get_role(role_id)
+        if role is not None:
+            return role
+    return None
 
 async def dump_role_info_with_names():
-    """Dump role information with resolved names"""
+    """Dump role information with resolved names, returned to the GUI as a list"""
     bot_log("=== ROLE INFORMATION DUMP ===")
     role_mentions = config.get("role_mentions", {})
+    roles = []
     
     if not role_mentions:
         bot_log("No role mentions configured")
@@ -183,59 +327,68 @@ async def dump_role_info_with_names():
         bot_log(f"Found {len(role_mentions)} role mentions:")
         for role_id, response in role_mentions.items():
             try:
-                # Try to find role in bot's guild cache
-                role_found = False
-                for guild in bot.guilds:
-                    role = guild.get_role(int(role_id))
-                    if role:
-                        bot_log(f"Role: {role.name} in {guild.name} | Response: '{response}'")
-                        role_found = True
-                        break
-                
-                if not role_found:
+                role = find_role(int(role_id))
+                if role:
+                    remember_role(role)
+                    bot_log(f"Role: {role.name} in {role.guild.name} | Response: '{response}'")
+                    roles.append({"role_id": role_id, "name": role.name, "guild": role.guild.name, "response": response})
+                else:
                     bot_log(f"Role ID: {role_id} (not found in any guild) | Response: '{response}'")
+                    roles.append({"role_id": role_id, "name": None, "guild": None, "response": response})
             except AttributeError as e:
                 # Bot doesn't have guilds attribute yet
                 bot_log(f"Role ID: {role_id} (bot not ready - AttributeError: {e}) | Response: '{response}'")
+                roles.append({"role_id": role_id, "name": None, "guild": None, "response": response})
             except Exception as e:
                 bot_log(f"Role ID: {role_id} (error: {e}) | Response: '{response}'")
+                roles.append({"role_id": role_id, "name": None, "guild": None, "response": response})
+    name_cache.save()
     bot_log("=== END ROLE DUMP ===")
+    return roles
+
+def resolve_channel_label(channel_id):
+    """Readable name for a channel ID, refreshed from discord.py's cache when possible"""
+    try:
+        channel = bot.get_channel(int(channel_id))
+        if channel:
+            return remember_channel(channel)
+        # Deleted, or a server we left - an old name still beats a bare ID
+        cached = name_cache.channel_label(channel_id)
+        if cached:
+            return cached if name_cache.is_deleted("channels", channel_id) else f"{cached} (not found)"
+        return f"Channel ID: {channel_id} (not found)"
+    except AttributeError:
+        # Bot doesn't have get_channel method yet
+        return f"Channel ID: {channel_id} (bot not ready)"
+    except Exception as e:
+        return f"Channel ID: {channel_id} (error: {e})"
 
 def get_channel_name_mapping():
     """Get a mapping of channel IDs to their readable names with server info"""
-    import re
-    channel_mapping = {}
-    allowed_channels = config.get("allowed_channels", [])
-    
-    for channel_id in allowed_channels:
-        try:
-            # Use Discord.py's get_channel method
-            channel = bot.get_channel(int(channel_id))
-            if channel:
-                # Channel found - clean names to remove emojis and special characters
-                clean_channel_name = re.sub(r'[^\w\s-]', '', channel.name).strip()
-                clean_guild_name = re.sub(r'[^\w\s-]', '', channel.guild.name).strip()
-                
-                if clean_channel_name:
-                    readable_name = f"#{clean_channel_name} in {clean_guild_name}"
-                else:
-                    readable_name = f"#{channel_id} in {clean_guild_name} (emoji-only name)"
-                channel_mapping[channel_id] = readable_name
-            else:
-                # Channel not found in bot's cache
-                channel_mapping[channel_id] = f"Channel ID: {channel_id} (not found)"
-        except AttributeError:
-            # Bot doesn't have get_channel method yet
-            channel_mapping[channel_id] = f"Channel ID: {channel_id} (bot not ready)"
-        except Exception as e:
-            channel_mapping[channel_id] = f"Channel ID: {channel_id} (error: {e})"
-    
-    return channel_mapping
+    return {channel_id: resolve_channel_label(channel_id) for channel_id in config.get("allowed_channels", [])}
+
+def refresh_stale_names():
+    """Re-resolve configured channels/roles whose cache entries expired (no API calls, gateway cache only)"""
+    refreshed = 0
+    for channel_id in name_cache.stale_ids("channels", config.get("allowed_channels", [])):
+        channel = bot.get_channel(int(channel_id)) if channel_id.isdigit() else None
+        if channel is not None:
+            remember_channel(channel)
+            refreshed += 1
+    for role_id in name_cache.stale_ids("roles", config.get("role_mentions", {})):
+        role = find_role(int(role_id)) if role_id.isdigit() else None
+        if role is not None:
+            remember_role(role)
+            refreshed += 1
+    if refreshed:
+        name_cache.save()
+        bot_log(f"Refreshed {refreshed} cached channel/role names")
 
 async def dump_channel_info_with_names():
-    """Dump channel information with resolved names"""
+    """Dump channel information with resolved names, returned to the GUI as {id: name}"""
     bot_log("=== CHANNEL INFORMATION DUMP ===")
     allowed_channels = config.get("allowed_channels", [])
+    channel_mapping = {}
     
     if not allowed_channels:
         bot_log("No channel restrictions - listening in ALL channels")
@@ -251,144 +404,163 @@ async def dump_channel_info_with_names():
     
     bot_log("=== END CHANNEL DUMP ===")
     
-    # Write channel mapping to a file for GUI to read
-    await write_channel_mapping_to_file(channel_mapping)
+    # Only rewrites the file if a name actually got resolved
+    name_cache.save()
     
-    # Save to persistent cache
-    await save_channel_names_cache(channel_mapping)
+    return channel_mapping
 
-async def write_channel_mapping_to_file(channel_mapping):
-    """Write channel mapping to a file for GUI to read"""
-    try:
-        with open("channel_mapping.txt", "w", encoding="utf-8") as f:
-            for channel_id, readable_name in channel_mapping.items():
-                f.write(f"{channel_id}|{readable_name}\n")
-        bot_log("Channel mapping written to channel_mapping.txt")
-    except Exception as e:
-        bot_log(f"Error writing channel mapping: {e}")
+async def dump_single_channel_name(channel_id):
+    """Resolve a single channel name for the GUI"""
+    readable_name = resolve_channel_label(channel_id)
+    name_cache.save()
+    bot_log(f"Channel name resolved: {readable_name}")
+    return {"channel_id": channel_id, "name": readable_name}
 
-async def save_channel_names_cache(channel_mapping):
-    """Save channel names to persistent cache file"""
-    try:
-        import json
-        from datetime import datetime
-        
-        cache_data = {
-            "last_updated": datetime.now().isoformat(),
-            "channels": channel_mapping
-        }
-        
-        with open("channel_names_cache.json", "w", encoding="utf-8") as f:
-            json.dump(cache_data, f, indent=2)
-        
-        bot_log(f"Channel names cache saved with {len(channel_mapping)} channels")
-    except Exception as e:
-        bot_log(f"Error saving channel names cache: {e}")
 
-def load_channel_names_cache():
-    """Load channel names from persistent cache file"""
-    try:
-        import json
-        import os
-        
-        if not os.path.exists("channel_names_cache.json"):
-            return {}
-        
-        with open("channel_names_cache.json", "r", encoding="utf-8") as f:
-            cache_data = json.load(f)
-        
-        return cache_data.get("channels", {})
-    except Exception as e:
-        bot_log(f"Error loading channel names cache: {e}")
-        return {}
+# Rows written between yields to the event loop while a report is generated
+REPORT_ROWS_PER_YIELD = 200
 
-def is_cache_valid():
-    """Check if the cache is still valid"""
-    try:
-        import json
-        from datetime import datetime, timedelta
+async def create_channel_documentation(channel_mapping, fmt="markdown"):
+    """Write a report of monitored servers, channels, roles, keywords and rules.
+    
+    Rows are streamed to disk as they're produced, and the loop gets control
+    back every few hundred rows so the gateway keeps up on huge accounts.
+    """
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Unknown documentation format '{fmt}'")
+    cfg = compiled_config
+    source = cfg.source
+    path = report_path("channel_documentation", fmt)
+    rows_since_yield = 0
+    
+    async def emit(report, values):
+        nonlocal rows_since_yield
+        report.row(values)
+        rows_since_yield += 1
+        if rows_since_yield >= REPORT_ROWS_PER_YIELD:
+            rows_since_yield = 0
+            await asyncio.sleep(0)
+    
+    meta = {
+        "Generated": report_timestamp(),
+        "Account": str(bot.user) if bot.user else "not logged in",
+        "Config": config_manager.get_current_config_name() or config_manager.default_config_name,
+        "Servers": len(bot.guilds),
+        "Allowed channels": len(channel_mapping) if cfg.restrict_channels else "all",
+        "Keywords": len(cfg.keyword_responses),
+        "Rules": len(cfg.rule_engine),
+        "Role triggers": len(cfg.role_responses),
+        "Cooldown": f"{cfg.message_delay_minutes} min ({cfg.cooldown_scope})",
+    }
+    
+    with open_report(path, fmt, "BoostBot Channel Documentation", meta) as report:
+        # Servers that matter: the ones holding an allowed channel, or all of them when unrestricted
+        monitored_guild_ids = set()
+        for channel_id in cfg.allowed_channels:
+            channel = bot.get_channel(channel_id)
+            if channel is not None and getattr(channel, "guild", None) is not None:
+                monitored_guild_ids.add(channel.guild.id)
         
-        if not os.path.exists("channel_names_cache.json"):
-            return False
+        report.section("Servers", ("Server", "ID", "Members", "Monitored channels"))
+        for guild in bot.guilds:
+            if cfg.restrict_channels and guild.id not in monitored_guild_ids:
+                continue
+            if cfg.restrict_channels:
+                monitored = sum(1 for channel in guild.text_channels if channel.id in cfg.allowed_channels)
+            else:
+                monitored = len(guild.text_channels)
+            await emit(report, (guild.name, guild.id, guild.member_count, monitored))
         
-        with open("channel_names_cache.json", "r", encoding="utf-8") as f:
-            cache_data = json.load(f)
+        if cfg.restrict_channels:
+            report.section("Allowed Channels", ("Channel ID", "Channel", "Status"))
+            for channel_id, readable_name in channel_mapping.items():
+                found = channel_id.isdigit() and bot.get_channel(int(channel_id)) is not None
+                await emit(report, (channel_id, readable_name, "ok" if found else "not found"))
+        else:
+            report.section("Channels", ("Channel ID", "Channel", "Server"),
+                           note="No channel restrictions - the bot listens in every channel below")
+            for guild in bot.guilds:
+                for channel in guild.text_channels:
+                    await emit(report, (channel.id, f"#{channel.name}", guild.name))
         
-        last_updated = datetime.fromisoformat(cache_data.get("last_updated", ""))
-        cache_age = datetime.now() - last_updated
+        report.section("Role Triggers", ("Role ID", "Role", "Server", "Response"))
+        for role_id, response in source.get("role_mentions", {}).items():
+            role = find_role(int(role_id)) if str(role_id).isdigit() else None
+            await emit(report, (role_id, role.name if role else "not found",
+                                role.guild.name if role else None, response))
         
-        # Cache is valid for 7 days
-        return cache_age < timedelta(days=7)
-    except Exception as e:
-        bot_log(f"Error checking cache validity: {e}")
-        return False
-
-async def dump_single_channel_name(channel_id):
-    """Dump single channel name to a file for GUI to read"""
-    import re
-    try:
-        # Use Discord.py's get_channel method directly
-        channel = bot.get_channel(int(channel_id))
-        if channel:
-            # Channel found - clean names to remove emojis and special characters
-            clean_channel_name = re.sub(r'[^\w\s-]', '', channel.name).strip()
-            clean_guild_name = re.sub(r'[^\w\s-]', '', channel.guild.name).strip()
-            
-            if clean_channel_name:
-                readable_name = f"#{clean_channel_name} in {clean_guild_name}"
-            else:
-                readable_name = f"#{channel_id} in {clean_guild_name} (emoji-only name)"
-        else:
-            # Channel not found in bot's cache
-            readable_name = f"Channel ID: {channel_id} (not found)"
-    except AttributeError:
-        readable_name = f"Channel ID: {channel_id} (bot not ready)"
-    except Exception as e:
-        readable_name = f"Channel ID: {channel_id} (error: {e})"
+        report.section("Keywords", ("Keyword", "Response", "Cooldown (min)"))
+        for keyword, response in cfg.keyword_responses.items():
+            window = cfg.trigger_cooldowns.get(keyword)
+            await emit(report, (keyword, response, None if window is None else round(window / 60, 2)))
+        
+        report.section("Rules", ("Rule", "Matches", "Response"))
+        for index, rule in enumerate(source.get("rules", [])):
+            await emit(report, (rule.get("name") or f"rule {index + 1}", describe_rule(rule), rule["response"]))
     
-    # Write the readable name to a file for GUI to read
-    response_file = f"channel_name_{channel_id}.txt"
-    try:
-        with open(response_file, "w", encoding="utf-8") as f:
-            f.write(readable_name)
-        bot_log(f"Channel name written to {response_file}: {readable_name}")
-    except Exception as e:
-        bot_log(f"Error writing channel name file: {e}")
+    bot_log(f"Channel documentation written to {path} ({report.rows_written} rows)", event="documentation")
+    return path
 
 
-def can_send_message():
-    """Check if enough time has passed since last message"""
-    global last_message_time
-    delay_minutes = config.get("message_delay_minutes", 5)
-    
-    # If delay is 0, always allow sending messages
-    if delay_minutes == 0:
-        return True
-    
-    current_time = time.time()
-    delay_seconds = delay_minutes * 60
-    
-    if current_time - last_message_time >= delay_seconds:
-        last_message_time = current_time
-        return True
-    return False
+# IPC handlers - the GUI talks to us over a localhost socket instead of sentinel files
+async def ipc_ping(params):
+    return {"ready": bot.is_ready()}
 
-def get_remaining_delay():
-    """Get remaining delay time in seconds"""
-    global last_message_time
-    delay_minutes = config.get("message_delay_minutes", 5)
-    
-    # If delay is 0, no remaining delay
-    if delay_minutes == 0:
-        return 0
+async def ipc_reload_config(params):
+    ok, message = await reload_config("GUI request")
+    if not ok:
+        raise ValueError(message)
+    return message
+
+async def ipc_latency_stats(params):
+    if params.get("reset"):
+        latency_tracker.reset()
+    return latency_tracker.snapshot()
+
+async def ipc_dump_roles(params):
+    return await dump_role_info_with_names()
+
+async def ipc_dump_channels(params):
+    return await dump_channel_info_with_names()
+
+async def ipc_channel_name(params):
+    channel_id = str(params.get("channel_id", "")).strip()
+    if not channel_id:
+        raise ValueError("channel_id is required")
+    return await dump_single_channel_name(channel_id)
+
+async def ipc_create_documentation(params):
+    channel_mapping = get_channel_name_mapping()
+    return await create_channel_documentation(channel_mapping, params.get("format", "markdown"))
+
+IPC_HANDLERS = {
+    "ping": ipc_ping,
+    "latency_stats": ipc_latency_stats,
+    "reload_config": ipc_reload_config,
+    "dump_roles": ipc_dump_roles,
+    "dump_channels": ipc_dump_channels,
+    "channel_name": ipc_channel_name,
+    "create_documentation": ipc_create_documentation,
+}
+
+async def run_ipc_server():
+    """Serve GUI requests until cancelled by BoostBot.close()"""
+    port, token = ipc.settings_from_env()
+    if port is None:
+        bot_log("IPC disabled (not launched from the GUI)")
+        return
     
-    current_time = time.time()
-    delay_seconds = delay_minutes * 60
-    elapsed = current_time - last_message_time
-    remaining = delay_seconds - elapsed
-    return max(0, remaining)
+    server = ipc.IpcServer(IPC_HANDLERS, token=token, log=bot_log)
+    try:
+        await server.start(port)
+        bot_log(f"IPC server listening on {ipc.IPC_HOST}:{port}")
+        # Nothing to poll - the server only wakes up when the GUI connects
+        await asyncio.Event().wait()
+    except Exception as e:
+        bot_log(f"IPC server failed: {e}")
+    finally:
+        await server.close()
 
-@bot.event
 async def on_ready():
     try:
         bot_log(f'Logged in as {bot.user} (ID: {bot.user.id})')
@@ -404,208 +576,355 @@ async def on_ready():
         else:
             bot_log('Listening in all channels')
         
-        delay_minutes = config.get("message_delay_minutes", 5)
+        delay_minutes = compiled_config.message_delay_minutes
+        scope_text = {"global": "between any two responses", "channel": "per channel",
+                      "channel_trigger": "per channel and trigger"}[compiled_config.cooldown_scope]
         if delay_minutes == 0:
             bot_log('Message delay: No delay (instant responses)')
         else:
-            bot_log(f'Message delay: {delay_minutes} minutes between responses')
+            bot_log(f'Message delay: {delay_minutes} minutes {scope_text}')
+        overrides = len(compiled_config.channel_cooldowns) + len(compiled_config.trigger_cooldowns)
+        if overrides:
+            bot_log(f'Cooldown overrides: {overrides} channel/trigger specific windows')
         bot_log('Bot is ready!')
+        log_memory(bot)
         
-        # Background task is already running in separate thread
-        bot_log("Bot is fully ready and monitoring for name requests!")
+        # Names past their TTL get re-read from the gateway cache, the rest stay as they are
+        refresh_stale_names()
+        
+        # IPC server was started from setup_hook on this same loop
+        bot_log("Bot is fully ready and serving GUI requests!")
     except Exception as e:
         bot_log(f'ERROR in on_ready: {e}')
         print(f'ERROR in on_ready: {e}')
         import traceback
         traceback.print_exc()
 
-@bot.event
-async def on_message(message):
-    # Don't respond to our own messages unless configured to do so
-    if message.author == bot.user and not config.get("respond_to_self", False):
+def report_response(kind, trigger_name, replied, channel_id, channel_name, server_name, latency_ms):
+    """Log + popup for a sent response (runs on the post-send worker, not the event loop)"""
+    if kind == "ROLE MENTION":
+        title, shown_name = "BoostBot - Role Mention", trigger_name
+    elif kind == "RULE":
+        title, shown_name = "BoostBot - Rule", f"rule '{trigger_name}'"
+    else:
+        title, shown_name = "BoostBot - Keyword", f"'{trigger_name}'"
+    
+    fields = {"event": "response", "trigger_type": kind.lower().replace(" ", "_"), "trigger": trigger_name,
+              "channel_id": channel_id, "channel": channel_name, "server": server_name,
+              "latency_ms": round(latency_ms, 1)}
+    if replied:
+        bot_log(f'[{kind}] Replied to "{trigger_name}" in #{channel_name} | Server: {server_name} | {latency_ms:.0f}ms', **fields)
+        if notifier is not None:
+            notifier.notify(title, f"Replied to {shown_name} in #{channel_name} ({server_name})")
+    else:
+        bot_log(f'[{kind}] Sent message for "{trigger_name}" in #{channel_name} | Server: {server_name} | {latency_ms:.0f}ms', **fields)
+        if notifier is not None:
+            notifier.notify(title, f"Sent message for {shown_name} in #{channel_name} ({server_name})")
+
+# ---- name cache upkeep from gateway events ----
+# Only IDs we already care about (configured or previously resolved) are tracked,
+# and each change is pushed to the GUI as a "name_update" log record
+
+name_cache_save_handle = None
+
+def schedule_name_cache_save(delay_seconds=2.0):
+    """Coalesce a burst of rename events (e.g. a server reorganising) into one write"""
+    global name_cache_save_handle
+    if name_cache_save_handle is None:
+        def save():
+            global name_cache_save_handle
+            name_cache_save_handle = None
+            name_cache.save()
+        name_cache_save_handle = asyncio.get_running_loop().call_later(delay_seconds, save)
+
+def is_tracked(kind, object_id):
+    """object_id is the int discord.py hands us; configured IDs are looked up in the compiled config's sets"""
+    if name_cache.get(kind, object_id) is not None:
+        return True
+    if kind == "channels":
+        return object_id in compiled_config.allowed_channels
+    if kind == "roles":
+        return object_id in compiled_config.role_responses
+    return False
+
+def push_name_update(message, kind, object_id, name=None, guild_id=None, deleted=False):
+    bot_log(message, event="name_update", kind=kind, id=str(object_id), name=name,
+            guild_id=None if guild_id is None else str(guild_id), deleted=deleted)
+    schedule_name_cache_save()
+
+async def on_guild_channel_update(before, after):
+    if not is_tracked("channels", after.id):
         return
+    if before.name == after.name and name_cache.guild_of("channels", after.id) == str(after.guild.id):
+        return  # permissions/topic/position change - nothing we store
+    label = remember_channel(after)
+    push_name_update(f"Channel renamed: {label}", "channels", after.id, after.name, after.guild.id)
+
+async def on_guild_channel_delete(channel):
+    # Still configured, most likely - the last known name reads better than a bare ID
+    if name_cache.mark_deleted("channels", channel.id):
+        push_name_update(f"Channel deleted: #{channel.name} ({channel.id})", "channels", channel.id, deleted=True)
+
+async def on_guild_role_update(before, after):
+    if not is_tracked("roles", after.id) or (before.name == after.name and name_cache.get("roles", after.id)):
+        return
+    remember_role(after)
+    push_name_update(f"Role renamed: @{before.name} -> @{after.name} in {after.guild.name}", "roles",
+                     after.id, after.name, after.guild.id)
+
+async def on_guild_role_delete(role):
+    if name_cache.mark_deleted("roles", role.id):
+        push_name_update(f"Role deleted: @{role.name} ({role.id})", "roles", role.id, deleted=True)
+
+async def on_guild_update(before, after):
+    if before.name == after.name or not is_tracked("guilds", after.id):
+        return
+    remember_guild(after)
+    push_name_update(f"Server renamed: {before.name} -> {after.name}", "guilds", after.id, after.name)
+
+async def on_guild_join(guild):
+    remember_guild(guild)
+    push_name_update(f"Joined server: {guild.name}", "guilds", guild.id, guild.name)
+    # Configured channels/roles in this server can be named now
+    for channel in guild.channels:
+        if is_tracked("channels", channel.id):
+            remember_channel(channel)
+            push_name_update(f"Channel available: {name_cache.channel_label(channel.id)}", "channels",
+                             channel.id, channel.name, guild.id)
+    for role in guild.roles:
+        if is_tracked("roles", role.id):
+            remember_role(role)
+            push_name_update(f"Role available: @{role.name} in {guild.name}", "roles", role.id, role.name, guild.id)
+
+async def on_guild_remove(guild):
+    # Names are kept: the last known name still reads better than a bare ID
+    bot_log(f"Left server: {guild.name} - its channels keep their last known names", event="guild_remove",
+            guild_id=str(guild.id))
+
+async def on_message(message):
+    # Timestamps first - everything below counts towards response time
+    received = time.perf_counter()
+    received_wall = time.time()
+    cfg = compiled_config
     
-    # Check if we should respond in this channel
-    allowed_channels = config.get("allowed_channels", [])
-    if allowed_channels and str(message.channel.id) not in allowed_channels:
-        return  # Skip this message if channel is not in allowed list
-    
-    # Check if we have any triggers to respond to first
-    has_role_mention = False
-    has_keyword = False
-    
-    # Check for role mentions
-    if message.role_mentions and config.get("role_mentions"):
-        for role in message.role_mentions:
-            role_id = str(role.id)
-            if role_id in config["role_mentions"]:
-                has_role_mention = True
-                break
-    
-    # Check for keywords
-    if not has_role_mention and config.get("keywords"):
-        message_content = message.content if config.get("case_sensitive", False) else message.content.lower()
-        for keyword in config["keywords"].keys():
-            search_keyword = keyword if config.get("case_sensitive", False) else keyword.lower()
-            if search_keyword in message_content:
-                has_keyword = True
-                break
-    
-    # Only check timer if we actually have something to respond to
-    if not has_role_mention and not has_keyword:
-        return  # No triggers, exit early without checking timer
-    
-    # Now check global timer - only if we're about to respond
-    if not can_send_message():
-        remaining = get_remaining_delay()
+    if trace_recorder is not None:
+        # Cheap dict build here, the file write happens on the post-send worker
+        post_send_queue.put((trace_recorder.write, (trace_record(message, bot.user.id if bot.user else None),)))
+
+    # Own message / channel / trigger / cooldown checks, shared with benchmark.py and replay.py
+    match, acquired, remaining, _ = cfg.decide(message, cooldowns, message.author == bot.user)
+    if match is None:
+        return
+    kind, trigger_name, response = match.kind, match.name, match.response
+    if not acquired:
         minutes = int(remaining // 60)
         seconds = int(remaining % 60)
-        bot_log(f'[TIMER] Skipping response - {minutes}m {seconds}s remaining until next message allowed')
+        bot_log(f'[TIMER] Skipping "{trigger_name}" - {minutes}m {seconds}s cooldown remaining ({cfg.cooldown_scope})',
+                event="cooldown_skip", channel_id=message.channel.id, trigger=trigger_name,
+                remaining_s=int(remaining))
+        return
+    decided = time.perf_counter()
+    
+    # Fast path: send first, everything else waits until Discord has acked
+    try:
+        send_started = time.perf_counter()
+        if cfg.reply_to_message:
+            await message.reply(response)
+        else:
+            await message.channel.send(response)
+        acked = time.perf_counter()
+    except discord.HTTPException as e:
+        bot_log(f'Error sending {kind.lower()} response: {e}', level="ERROR", event="send_error",
+                channel_id=message.channel.id, trigger=trigger_name)
         return
+    except Exception as e:
+        bot_log(f'Unexpected error sending {kind.lower()} response: {e}', level="ERROR", event="send_error",
+                channel_id=message.channel.id, trigger=trigger_name)
+        return
+    
+    created_at = message.created_at.timestamp() if message.created_at else None
+    latency_tracker.record(created_at, received_wall, received, decided, send_started, acked)
     
-    # Handle role mentions (we already confirmed there's a trigger)
-    if has_role_mention:
-        for role in message.role_mentions:
-            role_id = str(role.id)
-            if role_id in config["role_mentions"]:
+    server_name = message.guild.name if message.guild else "DM"
+    channel_name = getattr(message.channel, "name", None) or "DM"
+    post_send_queue.put((report_response, (kind, trigger_name, cfg.reply_to_message, message.channel.id,
+                                           channel_name, server_name, (acked - received) * 1000)))
+
+# Registered on the client by create_bot() - discord.py dispatches by function name
+EVENT_HANDLERS = (
+    on_ready,
+    on_message,
+    on_guild_channel_update,
+    on_guild_channel_delete,
+    on_guild_role_update,
+    on_guild_role_delete,
+    on_guild_update,
+    on_guild_join,
+    on_guild_remove,
+)
+
+# Check for existing bot instance
+LOCK_FILE = "bot.lock"
+
+def check_lock():
+    """Check if another bot instance is running"""
+    if os.path.exists(LOCK_FILE):
+        try:
+            with open(LOCK_FILE, 'r') as f:
+                pid = f.read().strip()
+            # Check if the process is still running
+            if platform.system() == "Windows":
                 try:
-                    response = config["role_mentions"][role_id]
-                    if config.get("reply_to_message", True):
-                        await message.reply(response)
-                        server_name = message.guild.name if message.guild else "DM"
-                        bot_log(f'[ROLE MENTION] Replied to "{role.name}" in #{message.channel.name} | Server: {server_name}')
-                        show_popup("BoostBot - Role Mention", f"Replied to {role.name} in #{message.channel.name} ({server_name})")
-                    else:
-                        await message.channel.send(response)
-                        server_name = message.guild.name if message.guild else "DM"
-                        bot_log(f'[ROLE MENTION] Sent message for "{role.name}" in #{message.channel.name} | Server: {server_name}')
-                        show_popup("BoostBot - Role Mention", f"Sent message for {role.name} in #{message.channel.name} ({server_name})")
-                    return  # Exit after handling role mention
-                except discord.HTTPException as e:
-                    print(f'Error sending role mention response: {e}')
-                except Exception as e:
-                    print(f'Unexpected error with role mention: {e}')
-    
-    # Handle keywords (we already confirmed there's a trigger)
-    elif has_keyword:
-        message_content = message.content if config.get("case_sensitive", False) else message.content.lower()
-        for keyword, response in config["keywords"].items():
-            search_keyword = keyword if config.get("case_sensitive", False) else keyword.lower()
-            
-            if search_keyword in message_content:
+                    os.kill(int(pid), 0)  # Check if process exists
+                    return True  # Process is running
+                except (OSError, ValueError):
+                    # Process not running, remove stale lock file
+                    os.remove(LOCK_FILE)
+                    return False
+            else:
+                # Unix-like systems
                 try:
-                    if config.get("reply_to_message", True):
-                        await message.reply(response)
-                        server_name = message.guild.name if message.guild else "DM"
-                        bot_log(f'[KEYWORD] Replied to "{keyword}" in #{message.channel.name} | Server: {server_name}')
-                        show_popup("BoostBot - Keyword", f"Replied to '{keyword}' in #{message.channel.name} ({server_name})")
-                    else:
-                        await message.channel.send(response)
-                        server_name = message.guild.name if message.guild else "DM"
-                        bot_log(f'[KEYWORD] Sent message for "{keyword}" in #{message.channel.name} | Server: {server_name}')
-                        show_popup("BoostBot - Keyword", f"Sent message for '{keyword}' in #{message.channel.name} ({server_name})")
-                    break  # Only respond to the first matching keyword
-                except discord.HTTPException as e:
-                    print(f'Error sending response: {e}')
-                except Exception as e:
-                    print(f'Unexpected error: {e}')
-
-if __name__ == "__main__":
-    # Check for existing bot instance
-    lock_file = "bot.lock"
-    
-    def check_lock():
-        """Check if another bot instance is running"""
-        if os.path.exists(lock_file):
+                    os.kill(int(pid), 0)
+                    return True
+                except (OSError, ValueError):
+                    os.remove(LOCK_FILE)
+                    return False
+        except:
+            # Corrupted lock file, remove it
             try:
-                with open(lock_file, 'r') as f:
-                    pid = f.read().strip()
-                # Check if the process is still running
-                if platform.system() == "Windows":
-                    try:
-                        os.kill(int(pid), 0)  # Check if process exists
-                        return True  # Process is running
-                    except (OSError, ValueError):
-                        # Process not running, remove stale lock file
-                        os.remove(lock_file)
-                        return False
-                else:
-                    # Unix-like systems
-                    try:
-                        os.kill(int(pid), 0)
-                        return True
-                    except (OSError, ValueError):
-                        os.remove(lock_file)
-                        return False
+                os.remove(LOCK_FILE)
             except:
-                # Corrupted lock file, remove it
-                try:
-                    os.remove(lock_file)
-                except:
-                    pass
-                return False
+                pass
+            return False
+    return False
+
+def create_lock():
+    """Create a lock file"""
+    try:
+        with open(LOCK_FILE, 'w') as f:
+            f.write(str(os.getpid()))
+        return True
+    except:
         return False
+
+def remove_lock():
+    try:
+        os.remove(LOCK_FILE)
+        return True
+    except:
+        return False
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run BoostBot without the GUI")
+    parser.add_argument("--config", help="config file name, or a path to one (default: config.json)")
+    parser.add_argument("--config-dir",
+                        help="directory holding the configs (default: the --config path's directory, else .)")
+    parser.add_argument("--log-format", choices=LOG_FORMATS,
+                        help=f"log line format (default: ${ENV_LOG_FORMAT}, else text)")
+    parser.add_argument("--no-notify", action="store_true",
+                        help="no desktop popups - tkinter is never loaded, for servers without a display")
+    parser.add_argument("--lean", action="store_true",
+                        help="no message or member cache, whatever the config's lean_cache says")
+    return parser.parse_args(argv)
+
+def resolve_config_location(args):
+    """(config_dir, config_name) from --config / --config-dir"""
+    config_name = args.config or "config.json"
+    config_dir = args.config_dir
+    if os.path.dirname(config_name):
+        # A path: its directory becomes the config dir unless one was given explicitly
+        if config_dir is None:
+            config_dir = os.path.dirname(config_name)
+        config_name = os.path.basename(config_name)
+    return config_dir or ".", config_name
+
+def main(argv=None):
+    global discord, bot, config_manager, config, compiled_config, loaded_config_signature, log_pipeline, notifier
+    args = parse_args(argv)
     
-    def create_lock():
-        """Create a lock file"""
-        try:
-            with open(lock_file, 'w') as f:
-                f.write(str(os.getpid()))
-            return True
-        except:
-            return False
+    log_pipeline = LogPipeline(fmt=args.log_format or os.environ.get(ENV_LOG_FORMAT, "text"))
+    log_pipeline.start()
+    atexit.register(log_pipeline.close)
+    
+    # Load configuration
+    config_dir, config_name = resolve_config_location(args)
+    config_manager = ConfigManager(config_dir=config_dir, default_config_name=config_name)
+    config = load_config(config_name)
+    if not config:
+        print("ERROR: Failed to load configuration")
+        return 1
+    
+    if config["token"] == "YOUR_USER_TOKEN_HERE":
+        bot_log(f"ERROR: Please set your Discord user token in {config_name}")
+        print(f"ERROR: Please set your Discord user token in {config_name}")
+        print("Easy method to get your token:")
+        print("1. Open Discord in your browser")
+        print("2. Press F12 to open Developer Tools")
+        print("3. Press Ctrl + Shift + M to enable mobile device emulation")
+        print("4. Go to Application tab → Local Storage → https://discord.com/")
+        print("5. Find the 'token' key and copy its value")
+        print(f"6. Replace 'YOUR_USER_TOKEN_HERE' in {config_name}")
+        return 1
+    
+    compiled_config = compile_active_config(config)
+    loaded_config_signature = config_file_signature()
+    log_startup_summary()
+    
+    try:
+        import discord
+    except ImportError as e:
+        print(f"ERROR: discord.py is not installed ({e})")
+        return 1
+    silence_discord_logging()
     
     # Check if another instance is running
     if check_lock():
         print("ERROR: Another bot instance is already running!")
         print("Please stop the existing bot before starting a new one.")
         print("If you're using the GUI, click 'Stop Bot' first.")
-        exit(1)
+        return 1
     
     # Create lock file
     if not create_lock():
         print("ERROR: Could not create lock file. Check file permissions.")
-        exit(1)
+        return 1
     
     bot_log("Bot lock acquired - starting bot...")
     
-    if config["token"] == "YOUR_USER_TOKEN_HERE":
-        bot_log("ERROR: Please set your Discord user token in config.json")
-        print("ERROR: Please set your Discord user token in config.json")
-        print("Easy method to get your token:")
-        print("1. Open Discord in your browser")
-        print("2. Press F12 to open Developer Tools")
-        print("3. Press Ctrl + Shift + M to enable mobile device emulation")
-        print("4. Go to Application tab → Local Storage → https://discord.com/")
-        print("5. Find the 'token' key and copy its value")
-        print("6. Replace 'YOUR_USER_TOKEN_HERE' in config.json")
-        try:
-            os.remove(lock_file)
-        except:
-            pass
-        exit(1)
-    
     try:
+        if not args.no_notify:
+            notifier = Notifier(log=bot_log)
+        threading.Thread(target=post_send_worker, name="boostbot-post-send", daemon=True).start()
+        start_trace_recorder()
+        name_cache.load()
+        
+        bot = create_bot(lean=args.lean or bool(config.get("lean_cache", False)))
+        bot_log("Bot instance created successfully")
+        log_memory()
+        
         bot_log("Starting bot...")
         bot_log(f"Token length: {len(config['token'])} characters")
         bot_log("Attempting to connect to Discord...")
         bot.run(config["token"])
+        return 0
     except discord.LoginFailure:
-        print("ERROR: Invalid token. Please check your token in config.json")
-        bot_log("ERROR: Invalid token. Please check your token in config.json")
+        print(f"ERROR: Invalid token. Please check your token in {config_name}")
+        bot_log(f"ERROR: Invalid token. Please check your token in {config_name}")
+        return 1
     except Exception as e:
         print(f"ERROR: {e}")
         bot_log(f"ERROR: {e}")
         import traceback
         traceback.print_exc()
+        return 1
     except KeyboardInterrupt:
         bot_log("Bot shutdown requested...")
+        return 0
     finally:
         # Clean up lock file
-        try:
-            os.remove(lock_file)
+        if remove_lock():
             bot_log("Lock file removed")
-        except:
-            pass
-        
         bot_log("Bot shutdown complete")
+
+if __name__ == "__main__":
+    sys.exit(main())
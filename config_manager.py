@@ -1,91 +1,175 @@
+import csv
+import io
 import json
 import os
 import glob
-from typing import Dict, List, Optional, Any
+import re
+import shutil
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Any
 from datetime import datetime
 
+from atomic_file import atomic_write
+from config_validation import SNOWFLAKE_RE, ValidationReport, revalidate_entry, validate_config_report
+from snapshot import snapshot_path
+
+# Sections that can be bulk imported/exported, and the formats we understand
+BULK_KINDS = ("keywords", "role_mentions", "allowed_channels")
+BULK_FORMATS = ("auto", "lines", "csv", "json")
+
+# JSON files in the config dir that are known not to be configs
+NON_CONFIG_FILES = {
+    'package.json',
+    'channel_names_cache.json',
+    'name_cache.json',
+    'just_10.json',
+}
+
+@dataclass(frozen=True)
+class ConfigEntry:
+    """What the config index knows about one JSON file in the config directory"""
+    name: str
+    mtime_ns: int
+    size: int
+    is_config: bool          # a JSON object with a "keywords" section - anything else is hidden
+    valid: bool
+    message: str             # validation result, or why the file couldn't be read
+    keyword_count: int = 0
+    role_count: int = 0
+    channel_count: int = 0
+    rule_count: int = 0
+    
+    @property
+    def modified(self) -> datetime:
+        return datetime.fromtimestamp(self.mtime_ns / 1e9)
+
+class ConfigIndex:
+    """Cached view of the config directory.
+    
+    Nothing is re-read while the directory's mtime stays the same (creating,
+    deleting or atomically saving a config all bump it). When it does change,
+    only files whose (mtime, size) moved get parsed and validated again.
+    """
+    
+    def __init__(self, config_dir: str, validate: Callable[[Dict[str, Any]], tuple[bool, str]]):
+        self.config_dir = config_dir
+        self.validate = validate
+        self._entries: Dict[str, ConfigEntry] = {}
+        self._dir_mtime_ns = None
+        self._lock = threading.Lock()
+    
+    def entries(self, force: bool = False) -> List[ConfigEntry]:
+        """Every JSON file that looks like a config, sorted by name"""
+        self.refresh(force)
+        return sorted((entry for entry in self._entries.values() if entry.is_config), key=lambda entry: entry.name)
+    
+    def get(self, config_name: str) -> Optional[ConfigEntry]:
+        self.refresh()
+        return self._entries.get(config_name)
+    
+    def refresh(self, force: bool = False) -> bool:
+        """Bring the index up to date. force also catches in-place edits that leave the directory alone."""
+        with self._lock:
+            try:
+                dir_mtime_ns = os.stat(self.config_dir).st_mtime_ns
+            except OSError as e:
+                print(f"Error reading config directory: {e}")
+                return False
+            if not force and dir_mtime_ns == self._dir_mtime_ns:
+                return False
+            
+            entries = {}
+            try:
+                with os.scandir(self.config_dir) as scan:
+                    for dir_entry in scan:
+                        filename = dir_entry.name
+                        if (not filename.endswith('.json') or filename.startswith('.') or
+                                filename in NON_CONFIG_FILES or not dir_entry.is_file()):
+                            continue
+                        stat = dir_entry.stat()
+                        cached = self._entries.get(filename)
+                        if cached is not None and (cached.mtime_ns, cached.size) == (stat.st_mtime_ns, stat.st_size):
+                            entries[filename] = cached
+                        else:
+                            entries[filename] = self._read_entry(dir_entry.path, filename, stat)
+            except OSError as e:
+                print(f"Error scanning config directory: {e}")
+                return False
+            
+            self._entries = entries
+            self._dir_mtime_ns = dir_mtime_ns
+            return True
+    
+    def _read_entry(self, path: str, filename: str, stat) -> ConfigEntry:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            return ConfigEntry(filename, stat.st_mtime_ns, stat.st_size, True, False, f"Unreadable: {e}")
+        
+        if not isinstance(data, dict) or "keywords" not in data:
+            return ConfigEntry(filename, stat.st_mtime_ns, stat.st_size, False, False, "Not a config file")
+        
+        valid, message = self.validate(data)
+        
+        def count(key):
+            value = data.get(key)
+            return len(value) if isinstance(value, (dict, list)) else 0
+        
+        return ConfigEntry(filename, stat.st_mtime_ns, stat.st_size, True, valid, message,
+                           keyword_count=count("keywords"), role_count=count("role_mentions"),
+                           channel_count=count("allowed_channels"), rule_count=count("rules"))
+
 class ConfigManager:
     """Manages multiple configuration files for the Discord bot"""
     
-    def __init__(self, config_dir: str = ".", default_config_name: str = "config.json"):
+    def __init__(self, config_dir: str = ".", default_config_name: str = "config.json",
+                 max_backups: int = 5, debounce_seconds: float = 0.5):
         self.config_dir = config_dir
         self.default_config_name = default_config_name
         self.current_config = None
         self.current_config_name = None
+        self.max_backups = max_backups
+        self.debounce_seconds = debounce_seconds
+        
+        # Debounced saves: config name -> (serialized json, wants backup)
+        self._pending_writes: Dict[str, tuple[str, bool]] = {}
+        self._pending_lock = threading.Lock()
+        # Serializes actual file writes so a late timer can't land an older payload last
+        self._write_lock = threading.Lock()
+        self._pending_timer = None
+        self._save_listeners: List[Callable[[str], None]] = []
+        # Last validation result per config name, the base for incremental revalidation
+        self._validation_reports: Dict[str, ValidationReport] = {}
+        
+        # Directory listing + per-file validity, re-read only when something changes
+        self.index = ConfigIndex(config_dir, self.validate_config)
         
     def discover_config_files(self) -> List[str]:
         """Discover all JSON config files in the config directory"""
         try:
-            # Look for all .json files in the config directory
-            pattern = os.path.join(self.config_dir, "*.json")
-            config_files = glob.glob(pattern)
-            
-            # Filter out non-config files and sort by name
-            valid_configs = []
-            blacklisted_files = {
-                'package.json', 
-                'channel_names_cache.json',
-                'just_10.json'  # Add any other non-config files
-            }
-            
-            for file_path in config_files:
-                filename = os.path.basename(file_path)
-                # Skip files that don't look like configs
-                if (not filename.startswith('.') and 
-                    filename not in blacklisted_files and
-                    not filename.endswith('.backup.') and
-                    not filename.startswith('config_backup')):
-                    valid_configs.append(file_path)
-            
-            return sorted(valid_configs)
+            return [os.path.join(self.config_dir, entry.name) for entry in self.index.entries()]
         except Exception as e:
             print(f"Error discovering config files: {e}")
             return []
     
     def get_config_names(self) -> List[str]:
         """Get list of available config file names (without path)"""
-        config_files = self.discover_config_files()
-        return [os.path.basename(f) for f in config_files]
+        return [os.path.basename(f) for f in self.discover_config_files()]
+    
+    def get_config_entries(self, force_refresh: bool = False) -> List[ConfigEntry]:
+        """Config files with validity and key counts, from the directory index"""
+        return self.index.entries(force_refresh)
     
     def validate_config(self, config_data: Dict[str, Any]) -> tuple[bool, str]:
-        """Validate that a config has all required fields"""
-        required_fields = ["token", "keywords", "case_sensitive", "respond_to_self", 
-                          "reply_to_message", "role_mentions", "allowed_channels", 
-                          "message_delay_minutes"]
-        
-        missing_fields = []
-        for field in required_fields:
-            if field not in config_data:
-                missing_fields.append(field)
-        
-        if missing_fields:
-            return False, f"Missing required fields: {', '.join(missing_fields)}"
-        
-        # Validate token
-        if not config_data.get("token") or config_data["token"] == "YOUR_USER_TOKEN_HERE":
-            return False, "Invalid or missing Discord token"
-        
-        # Validate keywords is a dict
-        if not isinstance(config_data.get("keywords"), dict):
-            return False, "Keywords must be a dictionary"
-        
-        # Validate role_mentions is a dict
-        if not isinstance(config_data.get("role_mentions"), dict):
-            return False, "Role mentions must be a dictionary"
-        
-        # Validate allowed_channels is a list
-        if not isinstance(config_data.get("allowed_channels"), list):
-            return False, "Allowed channels must be a list"
-        
-        # Validate numeric fields
-        try:
-            delay = int(config_data.get("message_delay_minutes", 0))
-            if delay < 0:
-                return False, "Message delay must be non-negative"
-        except (ValueError, TypeError):
-            return False, "Message delay must be a valid number"
-        
-        return True, "Config is valid"
+        """Validate a config - (ok, the first few errors with their paths)"""
+        report = validate_config_report(config_data)
+        return report.ok, report.summary()
+    
+    def get_validation_report(self, config_name: str = None) -> Optional[ValidationReport]:
+        """Every issue (errors and warnings) found when the config was last loaded or saved"""
+        return self._validation_reports.get(config_name or self.current_config_name or self.default_config_name)
     
     def load_config(self, config_name: str = None) -> tuple[Optional[Dict[str, Any]], str]:
         """Load configuration from a specific file or default"""
@@ -102,10 +186,11 @@ class ConfigManager:
                 config_data = json.load(f)
             
             # Validate the config
-            is_valid, validation_msg = self.validate_config(config_data)
-            if not is_valid:
-                return None, f"Invalid config: {validation_msg}"
+            report = validate_config_report(config_data)
+            if not report.ok:
+                return None, f"Invalid config: {report.summary()}"
             
+            self._validation_reports[config_name] = report
             self.current_config = config_data
             self.current_config_name = config_name
             return config_data, "Config loaded successfully"
@@ -115,38 +200,130 @@ class ConfigManager:
         except Exception as e:
             return None, f"Error loading config: {e}"
     
-    def save_config(self, config_data: Dict[str, Any], config_name: str = None, create_backup: bool = True) -> tuple[bool, str]:
-        """Save configuration to a specific file or current file"""
+    def save_config(self, config_data: Dict[str, Any], config_name: str = None, create_backup: bool = True,
+                    debounce: bool = False, changed: Optional[tuple[str, Any]] = None) -> tuple[bool, str]:
+        """Save configuration to a specific file or current file.
+        
+        With debounce=True the write is deferred by debounce_seconds and
+        coalesced with any other saves of the same file in that window - the
+        GUI uses this for single keyword/role/channel edits.
+        
+        changed=(section, key) says only that keyword/role/channel differs from
+        the last load/save, so only it gets validated again instead of the
+        whole config.
+        """
         if config_name is None:
             config_name = self.current_config_name or self.default_config_name
         
-        config_path = os.path.join(self.config_dir, config_name)
-        
         try:
-            # Validate before saving
-            is_valid, validation_msg = self.validate_config(config_data)
-            if not is_valid:
-                return False, f"Cannot save invalid config: {validation_msg}"
-            
-            # Create backup if file exists and backup is requested
-            if os.path.exists(config_path) and create_backup:
-                backup_path = f"{config_path}.backup.{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                try:
-                    os.rename(config_path, backup_path)
-                except Exception as e:
-                    print(f"Warning: Could not create backup: {e}")
+            # Validate before saving. The stored report only describes config_data if the
+            # last save went through - a rejected one may have left bad entries behind.
+            previous = self._validation_reports.pop(config_name, None)
+            if changed is not None and previous is not None:
+                report = revalidate_entry(previous, config_data, *changed)
+            else:
+                report = validate_config_report(config_data)
+            if not report.ok:
+                return False, f"Cannot save invalid config: {report.summary()}"
             
-            # Save the config
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=4, ensure_ascii=False)
+            # Serialize now - the caller keeps mutating the same dict after we return
+            payload = json.dumps(config_data, indent=4, ensure_ascii=False)
             
             self.current_config = config_data
             self.current_config_name = config_name
+            
+            if debounce:
+                self._validation_reports[config_name] = report
+                self._schedule_write(config_name, payload, create_backup)
+                return True, "Config save scheduled"
+            
+            with self._write_lock:
+                with self._pending_lock:
+                    # An older pending write of this file would clobber what we're about to write
+                    pending = self._pending_writes.pop(config_name, None)
+                self._write_config_file(config_name, payload, create_backup or bool(pending and pending[1]))
+            self._validation_reports[config_name] = report
             return True, "Config saved successfully"
             
         except Exception as e:
             return False, f"Error saving config: {e}"
     
+    def add_save_listener(self, callback: Callable[[str], None]):
+        """Call callback(config_name) after a config file hits the disk (may be a worker thread)"""
+        self._save_listeners.append(callback)
+    
+    def _schedule_write(self, config_name: str, payload: str, create_backup: bool):
+        with self._pending_lock:
+            previous = self._pending_writes.get(config_name)
+            wants_backup = create_backup or bool(previous and previous[1])
+            self._pending_writes[config_name] = (payload, wants_backup)
+            
+            # Restart the window on every edit so a burst collapses into one write
+            if self._pending_timer is not None:
+                self._pending_timer.cancel()
+            self._pending_timer = threading.Timer(self.debounce_seconds, self.flush)
+            self._pending_timer.daemon = True
+            self._pending_timer.start()
+    
+    def flush(self) -> tuple[bool, str]:
+        """Write any debounced saves right now (call before exit / switching configs)"""
+        errors = []
+        with self._write_lock:
+            with self._pending_lock:
+                pending = self._pending_writes
+                self._pending_writes = {}
+                if self._pending_timer is not None:
+                    self._pending_timer.cancel()
+                    self._pending_timer = None
+            
+            for config_name, (payload, create_backup) in pending.items():
+                try:
+                    self._write_config_file(config_name, payload, create_backup)
+                except Exception as e:
+                    errors.append(f"{config_name}: {e}")
+                    print(f"Error saving config {config_name}: {e}")
+        
+        if errors:
+            return False, "Error saving config: " + "; ".join(errors)
+        return True, "Config saved successfully"
+    
+    def has_pending_writes(self) -> bool:
+        with self._pending_lock:
+            return bool(self._pending_writes)
+    
+    def _write_config_file(self, config_name: str, payload: str, create_backup: bool):
+        """Atomically and durably replace the config file"""
+        config_path = os.path.join(self.config_dir, config_name)
+        
+        if create_backup and os.path.exists(config_path):
+            self._backup_config_file(config_path)
+        
+        # Readers (the bot's reload) see either the old file or the new one, never half of it
+        atomic_write(config_path, payload)
+        
+        for listener in list(self._save_listeners):
+            try:
+                listener(config_name)
+            except Exception as e:
+                print(f"Warning: save listener failed: {e}")
+    
+    def _backup_config_file(self, config_path: str):
+        """Copy the current file to a timestamped backup and prune old ones"""
+        backup_path = f"{config_path}.backup.{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        try:
+            shutil.copy2(config_path, backup_path)
+        except Exception as e:
+            print(f"Warning: Could not create backup: {e}")
+            return
+        
+        # Timestamps sort lexically, so the oldest backups come first
+        backups = sorted(glob.glob(glob.escape(config_path) + ".backup.*"))
+        for old_backup in backups[:-self.max_backups] if self.max_backups > 0 else backups:
+            try:
+                os.remove(old_backup)
+            except OSError as e:
+                print(f"Warning: Could not remove old backup {old_backup}: {e}")
+    
     def create_config(self, config_name: str, template_data: Dict[str, Any] = None) -> tuple[bool, str]:
         """Create a new configuration file"""
         if not config_name.endswith('.json'):
@@ -177,7 +354,9 @@ class ConfigManager:
             "reply_to_message": True,
             "role_mentions": {},
             "allowed_channels": [],
-            "message_delay_minutes": 5
+            "message_delay_minutes": 5,
+            "cooldown_scope": "channel_trigger",
+            "lean_cache": False
         }
     
     def copy_config(self, source_name: str, target_name: str) -> tuple[bool, str]:
@@ -194,6 +373,9 @@ class ConfigManager:
         if os.path.exists(target_path):
             return False, f"Target config '{target_name}' already exists"
         
+        # Copy what the user sees, not what's on disk from before the last edits
+        self.flush()
+        
         try:
             # Load source config
             with open(source_path, 'r', encoding='utf-8') as f:
@@ -217,7 +399,15 @@ class ConfigManager:
             return False, "Cannot delete the default config file"
         
         try:
+            # A debounced save landing after this would bring the file back
+            with self._pending_lock:
+                self._pending_writes.pop(config_name, None)
             os.remove(config_path)
+            self._validation_reports.pop(config_name, None)
+            try:
+                os.remove(snapshot_path(config_path))
+            except OSError:
+                pass  # the bot never ran on this config
             
             # If we're deleting the current config, reset to default
             if self.current_config_name == config_name:
@@ -229,6 +419,183 @@ class ConfigManager:
         except Exception as e:
             return False, f"Error deleting config: {e}"
     
+    # ---- Bulk import / export -------------------------------------------
+    
+    def parse_bulk_entries(self, text: str, kind: str, fmt: str = "auto") -> tuple[List[tuple[str, Optional[str]]], List[str]]:
+        """Parse pasted/loaded text into (key, response) pairs for one config section.
+        
+        lines: "keyword | response" (or tab separated), one channel ID per line, # comments
+        csv:   key,response rows (channels: one ID per row), header row optional
+        json:  {"key": "response"} object, or a list of IDs for channels
+        
+        Returns (entries, errors). Bad rows are reported, not fatal, so one typo
+        in a list of 2000 channels doesn't throw the whole import away.
+        """
+        if kind not in BULK_KINDS:
+            return [], [f"Unknown section: {kind}"]
+        
+        if fmt == "auto":
+            stripped = text.lstrip()
+            fmt = "json" if stripped[:1] in ("{", "[") else "lines"
+        
+        wants_response = kind != "allowed_channels"
+        raw_rows: List[tuple[str, List[str]]] = []  # (location, fields)
+        errors: List[str] = []
+        
+        if fmt == "json":
+            try:
+                data = json.loads(text)
+            except json.JSONDecodeError as e:
+                return [], [f"Invalid JSON: {e}"]
+            if isinstance(data, dict):
+                # Whole config file pasted in? Take just the section we want
+                if kind in data and isinstance(data[kind], (dict, list)):
+                    data = data[kind]
+            if isinstance(data, dict):
+                raw_rows = [(f"key '{key}'", [str(key), value if isinstance(value, str) else json.dumps(value)])
+                            for key, value in data.items()]
+            elif isinstance(data, list):
+                for index, item in enumerate(data):
+                    if isinstance(item, (list, tuple)):
+                        raw_rows.append((f"item {index + 1}", [str(field) for field in item]))
+                    else:
+                        raw_rows.append((f"item {index + 1}", [str(item)]))
+            else:
+                return [], ["JSON must be an object or a list"]
+        elif fmt == "csv":
+            for line_no, row in enumerate(csv.reader(io.StringIO(text)), start=1):
+                if row and any(field.strip() for field in row):
+                    raw_rows.append((f"line {line_no}", row))
+            # Skip a header row like "keyword,response" / "channel_id"
+            if raw_rows and raw_rows[0][1][0].strip().lower() in ("keyword", "key", "role_id", "role", "channel_id", "channel", "id"):
+                raw_rows = raw_rows[1:]
+        elif fmt == "lines":
+            for line_no, line in enumerate(text.splitlines(), start=1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if not wants_response:
+                    # Allow "id, id, id" on one line as well
+                    for part in re.split(r"[\s,;]+", line):
+                        if part:
+                            raw_rows.append((f"line {line_no}", [part]))
+                    continue
+                separator = "|" if "|" in line else "\t"
+                raw_rows.append((f"line {line_no}", line.split(separator, 1)))
+        else:
+            return [], [f"Unknown format: {fmt}"]
+        
+        entries: List[tuple[str, Optional[str]]] = []
+        for location, fields in raw_rows:
+            key = fields[0] if fields else ""
+            # Padding around a keyword can be deliberate (" key " to dodge "monkey"),
+            # so only the lines format - where " | " is the separator - trims keywords
+            if kind != "keywords" or fmt == "lines":
+                key = key.strip()
+            response = fields[1].strip() if wants_response and len(fields) > 1 else None
+            
+            if not key:
+                errors.append(f"{location}: empty entry")
+                continue
+            if kind != "keywords" and not SNOWFLAKE_RE.match(key):
+                errors.append(f"{location}: '{key}' is not a valid Discord ID")
+                continue
+            if wants_response and not response:
+                errors.append(f"{location}: '{key}' has no response")
+                continue
+            entries.append((key, response))
+        
+        return entries, errors
+    
+    def merge_bulk_entries(self, config_data: Dict[str, Any], kind: str, entries: List[tuple[str, Optional[str]]],
+                           overwrite: bool = False) -> Dict[str, int]:
+        """Merge parsed entries into config_data in place. Does NOT save - callers save once."""
+        added = updated = skipped = 0
+        
+        if kind == "allowed_channels":
+            channels = config_data.setdefault("allowed_channels", [])
+            # Set for membership, list to keep the user's order
+            known = set(channels)
+            for channel_id, _ in entries:
+                if channel_id in known:
+                    skipped += 1
+                    continue
+                known.add(channel_id)
+                channels.append(channel_id)
+                added += 1
+        else:
+            section = config_data.setdefault(kind, {})
+            for key, response in entries:
+                if key not in section:
+                    section[key] = response
+                    added += 1
+                elif overwrite and section[key] != response:
+                    section[key] = response
+                    updated += 1
+                else:
+                    skipped += 1
+        
+        return {"added": added, "updated": updated, "skipped": skipped}
+    
+    @staticmethod
+    def _lines_problem(kind: str, key: str, response: Optional[str]) -> Optional[str]:
+        """Why key/response wouldn't survive a round trip through the lines format, None if it would"""
+        if kind == "allowed_channels":
+            return None if key and not re.search(r"[\s,;#]", key) else f"channel '{key}'"
+        if "|" in key or "\t" in key or "\n" in key or "\r" in key or key != key.strip() or key.startswith("#"):
+            return f"key {key!r}"
+        if "\n" in response or "\r" in response or response != response.strip():
+            return f"response of {key!r}"
+        return None
+    
+    def export_format(self, config_data: Dict[str, Any], kind: str, fmt: str = "auto") -> str:
+        """Resolve "auto": lines when every entry survives them, JSON otherwise"""
+        if fmt != "auto":
+            return fmt
+        if kind == "allowed_channels":
+            rows = [(str(channel_id), None) for channel_id in config_data.get(kind, [])]
+        else:
+            rows = list(config_data.get(kind, {}).items())
+        if any(self._lines_problem(kind, key, response) for key, response in rows):
+            return "json"
+        return "lines"
+    
+    def export_entries(self, config_data: Dict[str, Any], kind: str, fmt: str = "lines") -> str:
+        """Serialize one config section for sharing/backup; parse_bulk_entries reads it back.
+        
+        The lines format has no escaping, so entries it can't hold (a "|" or a
+        line break, padding, a leading "#") raise ValueError - "auto" picks JSON
+        for those sections instead.
+        """
+        if kind not in BULK_KINDS:
+            raise ValueError(f"Unknown section: {kind}")
+        fmt = self.export_format(config_data, kind, fmt)
+        
+        if kind == "allowed_channels":
+            channels = list(config_data.get("allowed_channels", []))
+            if fmt == "json":
+                return json.dumps(channels, indent=2)
+            self._check_lines(kind, [(str(channel_id), None) for channel_id in channels])
+            return "\n".join(str(channel_id) for channel_id in channels) + ("\n" if channels else "")
+        
+        section = config_data.get(kind, {})
+        if fmt == "json":
+            return json.dumps(section, indent=2, ensure_ascii=False)
+        if fmt == "csv":
+            out = io.StringIO()
+            writer = csv.writer(out, lineterminator="\n")
+            writer.writerow(["keyword" if kind == "keywords" else "role_id", "response"])
+            writer.writerows(section.items())
+            return out.getvalue()
+        self._check_lines(kind, section.items())
+        return "".join(f"{key} | {response}\n" for key, response in section.items())
+    
+    def _check_lines(self, kind: str, rows):
+        for key, response in rows:
+            problem = self._lines_problem(kind, key, response)
+            if problem:
+                raise ValueError(f"The lines format can't hold the {problem} - export as JSON or CSV instead")
+    
     def get_current_config(self) -> Optional[Dict[str, Any]]:
         """Get the currently loaded configuration"""
         return self.current_config
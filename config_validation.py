@@ -0,0 +1,289 @@
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from cooldowns import COOLDOWN_SCOPES
+from rules import rule_label, rule_problems
+from triggers import KeywordMatcher
+
+# Discord rejects messages longer than this
+MAX_RESPONSE_LENGTH = 2000
+
+REQUIRED_FIELDS = ("token", "keywords", "case_sensitive", "respond_to_self", "reply_to_message",
+                   "role_mentions", "allowed_channels", "message_delay_minutes")
+
+# Sections revalidate_entry() can recheck one entry of; anything else gets a full pass
+ENTRY_SECTIONS = ("keywords", "role_mentions", "allowed_channels")
+
+# Discord snowflakes are 17-20 digit integers: the oldest (2015) IDs have 17,
+# and a 64-bit ID can't have more than 20
+SNOWFLAKE_RE = re.compile(r"^\d{17,20}$")
+
+
+class ValidationIssue(NamedTuple):
+    """One problem, located by config section and the entry inside it.
+
+    key is the keyword, role ID, channel ID or rule position (None for the
+    section itself); related is another entry of the same section the issue
+    depends on, e.g. the keyword that shadows this one.
+    """
+    level: str  # "error" blocks loading/saving, "warning" doesn't
+    section: str
+    key: Any
+    message: str
+    related: Any = None
+
+    @property
+    def path(self) -> str:
+        if self.key is None:
+            return self.section
+        return f"{self.section}[{self.key!r}]"
+
+    def __str__(self):
+        return f"{self.path}: {self.message}"
+
+
+class ValidationReport:
+    """Every issue found in a config, in one pass"""
+
+    def __init__(self, issues: Iterable[ValidationIssue] = ()):
+        self.issues: List[ValidationIssue] = list(issues)
+
+    @property
+    def errors(self) -> List[ValidationIssue]:
+        return [issue for issue in self.issues if issue.level == "error"]
+
+    @property
+    def warnings(self) -> List[ValidationIssue]:
+        return [issue for issue in self.issues if issue.level == "warning"]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def for_entry(self, section: str, key: Any) -> List[ValidationIssue]:
+        return [issue for issue in self.issues if issue.section == section and issue.key == key]
+
+    def summary(self, limit: int = 3) -> str:
+        """One line for the (bool, message) callers: the first few errors, or a count of warnings"""
+        errors = self.errors
+        if errors:
+            text = "; ".join(str(issue) for issue in errors[:limit])
+            if len(errors) > limit:
+                text += f" (+{len(errors) - limit} more)"
+            return text
+        warnings = len(self.warnings)
+        if warnings:
+            return f"Config is valid ({warnings} warning{'s' if warnings != 1 else ''})"
+        return "Config is valid"
+
+
+def is_snowflake(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    return bool(SNOWFLAKE_RE.fullmatch(str(value).strip()))
+
+
+def _response_issues(section: str, key: Any, response: Any) -> List[ValidationIssue]:
+    if not isinstance(response, str) or not response.strip():
+        return [ValidationIssue("error", section, key, "response must be a non-empty string")]
+    if len(response) > MAX_RESPONSE_LENGTH:
+        return [ValidationIssue("error", section, key, f"response is {len(response)} characters, "
+                                                       f"Discord's limit is {MAX_RESPONSE_LENGTH}")]
+    return []
+
+
+# ---- settings: everything that isn't a keyword/role/channel entry -------
+# Cheap, so it's rerun on every save, incremental or not
+
+def _settings_issues(config: Dict[str, Any]) -> List[ValidationIssue]:
+    issues = [ValidationIssue("error", field, None, "missing required field")
+              for field in REQUIRED_FIELDS if field not in config]
+
+    if "token" in config and (not config["token"] or config["token"] == "YOUR_USER_TOKEN_HERE"):
+        issues.append(ValidationIssue("error", "token", None, "invalid or missing Discord token"))
+
+    for field, kind, label in (("keywords", dict, "a dictionary"), ("role_mentions", dict, "a dictionary"),
+                               ("allowed_channels", list, "a list")):
+        if field in config and not isinstance(config[field], kind):
+            issues.append(ValidationIssue("error", field, None, f"must be {label}"))
+
+    if "message_delay_minutes" in config:
+        try:
+            if int(config["message_delay_minutes"]) < 0:
+                issues.append(ValidationIssue("error", "message_delay_minutes", None, "must be non-negative"))
+        except (ValueError, TypeError):
+            issues.append(ValidationIssue("error", "message_delay_minutes", None, "must be a valid number"))
+
+    if not isinstance(config.get("lean_cache", False), bool):
+        issues.append(ValidationIssue("error", "lean_cache", None, "must be true or false"))
+
+    # Optional cooldown settings
+    if config.get("cooldown_scope", COOLDOWN_SCOPES[0]) not in COOLDOWN_SCOPES:
+        issues.append(ValidationIssue("error", "cooldown_scope", None,
+                                      f"must be one of: {', '.join(COOLDOWN_SCOPES)}"))
+
+    for field in ("channel_cooldowns", "trigger_cooldowns"):
+        overrides = config.get(field, {})
+        if not isinstance(overrides, dict):
+            issues.append(ValidationIssue("error", field, None, "must be a dictionary"))
+            continue
+        for key, minutes in overrides.items():
+            if isinstance(minutes, bool) or not isinstance(minutes, (int, float)) or minutes < 0:
+                issues.append(ValidationIssue("error", field, key, "must be a non-negative number of minutes"))
+            if field == "channel_cooldowns" and not is_snowflake(key):
+                issues.append(ValidationIssue("error", field, key, "is not a numeric channel ID"))
+    return issues
+
+
+# ---- entries --------------------------------------------------------------
+
+def _fold(case_sensitive: bool):
+    return (lambda text: text) if case_sensitive else str.lower
+
+
+def _shadowed(keyword: str, earlier: str, fold) -> ValidationIssue:
+    """The matcher answers with the first keyword in config order, so a message
+    containing "carry boost" never gets past an earlier "boost" - the longer
+    keyword can't fire at all."""
+    if fold(earlier) == fold(keyword):
+        message = f"duplicate of '{earlier}' - only the first one ever fires"
+    else:
+        message = f"never fires: any message containing it also contains '{earlier}', which comes first"
+    return ValidationIssue("warning", "keywords", keyword, message, related=earlier)
+
+
+def _shadow_issue(keyword: str, keys: List[str], position: int, fold) -> Optional[ValidationIssue]:
+    """Linear version of the shadow check, for a single keyword"""
+    folded = fold(keyword)
+    for earlier in keys[:position]:
+        folded_earlier = fold(earlier)
+        if folded_earlier and folded_earlier in folded:
+            return _shadowed(keyword, earlier, fold)
+    return None
+
+
+def _keyword_issues(keyword: str, response: Any) -> List[ValidationIssue]:
+    issues = []
+    if not keyword.strip():
+        issues.append(ValidationIssue("error", "keywords", keyword, "keyword is empty and would match every message"))
+    return issues + _response_issues("keywords", keyword, response)
+
+
+def _role_issues(role_id: str, response: Any) -> List[ValidationIssue]:
+    issues = []
+    if not is_snowflake(role_id):
+        issues.append(ValidationIssue("error", "role_mentions", role_id, "is not a numeric role ID"))
+    return issues + _response_issues("role_mentions", role_id, response)
+
+
+def _channel_issues(channel_id: Any, occurrences: int) -> List[ValidationIssue]:
+    issues = []
+    if not is_snowflake(channel_id):
+        issues.append(ValidationIssue("error", "allowed_channels", channel_id, "is not a numeric channel ID"))
+    if occurrences > 1:
+        issues.append(ValidationIssue("warning", "allowed_channels", channel_id,
+                                      f"listed {occurrences} times"))
+    return issues
+
+
+def _rules_issues(rules: Any) -> List[ValidationIssue]:
+    if not isinstance(rules, list):
+        return [ValidationIssue("error", "rules", None, "must be a list")]
+    issues = []
+    for index, rule in enumerate(rules):
+        label = rule_label(rule, index + 1)
+        for _, message in rule_problems(rule):
+            issues.append(ValidationIssue("error", "rules", index, f"{label}: {message}"))
+        if isinstance(rule, dict) and isinstance(rule.get("response"), str) and rule["response"]:
+            issues.extend(_response_issues("rules", index, rule["response"]))
+    return issues
+
+
+def validate_config_report(config: Any) -> ValidationReport:
+    """Check the whole config and report every problem with its path"""
+    if not isinstance(config, dict):
+        return ValidationReport([ValidationIssue("error", "config", None, "must be a JSON object")])
+
+    issues = _settings_issues(config)
+    case_sensitive = bool(config.get("case_sensitive", False))
+    fold = _fold(case_sensitive)
+
+    keywords = config.get("keywords")
+    if isinstance(keywords, dict):
+        # Running every keyword through the real matcher finds the earliest keyword
+        # inside it in one pass each, instead of comparing every pair
+        matcher = KeywordMatcher([keyword for keyword in keywords if fold(keyword)], case_sensitive)
+        for keyword, response in keywords.items():
+            issues.extend(_keyword_issues(keyword, response))
+            first = matcher.first_match(keyword)
+            if first is not None and first != keyword:
+                issues.append(_shadowed(keyword, first, fold))
+
+    role_mentions = config.get("role_mentions")
+    if isinstance(role_mentions, dict):
+        for role_id, response in role_mentions.items():
+            issues.extend(_role_issues(role_id, response))
+
+    channels = config.get("allowed_channels")
+    if isinstance(channels, list):
+        counts = Counter(str(channel_id) for channel_id in channels)
+        for channel_id in dict.fromkeys(channels):
+            issues.extend(_channel_issues(channel_id, counts[str(channel_id)]))
+
+    # Rules are optional - older configs simply don't have them
+    if "rules" in config:
+        issues.extend(_rules_issues(config["rules"]))
+
+    return ValidationReport(issues)
+
+
+def revalidate_entry(previous: ValidationReport, config: Dict[str, Any], section: str, key: Any) -> ValidationReport:
+    """Update a report after one keyword/role/channel was added, changed or removed.
+
+    Only that entry (and, for keywords, the ones it can shadow) is checked
+    again; every other entry keeps its previous result. The caller vouches
+    that nothing else in those sections changed since `previous` was made.
+    """
+    collection = config.get(section) if isinstance(config, dict) else None
+    expected = list if section == "allowed_channels" else dict
+    if section not in ENTRY_SECTIONS or not isinstance(collection, expected):
+        return validate_config_report(config)
+
+    recheck = {key}
+    kept = []
+    for issue in previous.issues:
+        if issue.section == section and issue.key is not None:
+            if issue.related == key:
+                recheck.add(issue.key)  # was shadowed by the changed keyword, maybe by another one too
+            elif issue.key != key:
+                kept.append(issue)
+        elif issue.section == "rules" or (issue.section in ENTRY_SECTIONS and issue.key is not None):
+            kept.append(issue)  # entries of other sections didn't change
+        # anything else came from the settings pass, which is redone below
+
+    if section == "keywords":
+        fold = _fold(bool(config.get("case_sensitive", False)))
+        keys = list(collection)
+        positions = {keyword: position for position, keyword in enumerate(keys)}
+        if key in collection:
+            # A changed keyword can also start shadowing later ones
+            folded = fold(key)
+            recheck.update(later for later in keys[positions[key] + 1:] if folded and folded in fold(later))
+            kept = [issue for issue in kept if not (issue.key in recheck and issue.related is not None)]
+        fresh = []
+        for keyword in recheck:
+            if keyword not in positions:
+                continue
+            if keyword == key:
+                fresh.extend(_keyword_issues(keyword, collection[keyword]))
+            shadow = _shadow_issue(keyword, keys, positions[keyword], fold)
+            if shadow is not None:
+                fresh.append(shadow)
+    elif section == "role_mentions":
+        fresh = _role_issues(key, collection[key]) if key in collection else []
+    else:
+        occurrences = sum(1 for channel_id in collection if str(channel_id) == str(key))
+        fresh = _channel_issues(key, occurrences) if occurrences else []
+
+    return ValidationReport(_settings_issues(config) + kept + fresh)
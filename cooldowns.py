@@ -0,0 +1,67 @@
+import heapq
+import time
+from typing import Callable, Dict, Hashable, List, Tuple
+
+# How far apart responses have to be:
+#   global          - one response per window, anywhere (the old single timer)
+#   channel         - one response per window in each channel
+#   channel_trigger - one response per window for each (channel, keyword/role/rule)
+COOLDOWN_SCOPES = ("global", "channel", "channel_trigger")
+DEFAULT_COOLDOWN_SCOPE = "channel_trigger"
+
+
+class CooldownScheduler:
+    """Cooldown expiries per key on a monotonic clock.
+
+    Only keys that are actually cooling down are stored: expiries sit in a dict
+    for O(1) lookups plus a min-heap ordered by expiry, and every call first
+    pops whatever has expired. Memory tracks active cooldowns, not how many
+    channels the bot has ever seen.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._expiries: Dict[Hashable, float] = {}
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        # Tie-breaker so the heap never has to compare two keys
+        self._counter = 0
+
+    def __len__(self):
+        self._purge(self.clock())
+        return len(self._expiries)
+
+    def _purge(self, now: float):
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expiry, _, key = heapq.heappop(heap)
+            # A key re-armed with a later expiry has a newer heap entry; leave it be
+            if self._expiries.get(key) == expiry:
+                del self._expiries[key]
+
+    def remaining(self, key: Hashable) -> float:
+        """Seconds until key may fire again (0 when it's free)"""
+        now = self.clock()
+        self._purge(now)
+        expiry = self._expiries.get(key)
+        return 0.0 if expiry is None else expiry - now
+
+    def try_acquire(self, key: Hashable, window_seconds: float) -> Tuple[bool, float]:
+        """Start key's cooldown if it isn't cooling down already.
+
+        Returns (acquired, remaining_seconds) - remaining is 0 when acquired.
+        """
+        now = self.clock()
+        self._purge(now)
+        expiry = self._expiries.get(key)
+        if expiry is not None:
+            return False, expiry - now
+        if window_seconds > 0:
+            expiry = now + window_seconds
+            self._expiries[key] = expiry
+            self._counter += 1
+            heapq.heappush(self._heap, (expiry, self._counter, key))
+        return True, 0.0
+
+    def clear(self):
+        self._expiries.clear()
+        self._heap.clear()
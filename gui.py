@@ -1,17 +1,43 @@
 import customtkinter as ctk
+import copy
 import json
 import threading
 import subprocess
 import sys
 import os
-from tkinter import messagebox
-from config_manager import ConfigManager
+from tkinter import messagebox, filedialog
+from config_manager import ConfigManager, BULK_FORMATS
+import ipc
+import logging
+import queue
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from list_view import VirtualListView, SearchIndex
+from name_cache import NameCache
+from structured_log import parse_line, render_record
 
 # Set appearance mode and color theme
 ctk.set_appearance_mode("dark")  # Modes: "System" (standard), "Dark", "Light"
 ctk.set_default_color_theme("blue")  # Themes: "blue" (standard), "green", "dark-blue"
 
+# Log view limits: lines kept on screen (and for re-filtering), and how often queued lines get drawn
+LOG_MAX_LINES = 5000
+LOG_DRAIN_MS = 100
+LOG_MAX_BATCH = 2000
+
+# Optional copy of everything the bot prints, rotated so it can't fill the disk
+LOG_SPILL_FILE = "boostbot.log"
+LOG_SPILL_MAX_BYTES = 2 * 1024 * 1024
+LOG_SPILL_BACKUPS = 3
+
 class DiscordBotGUI:
+    # Log filter name -> predicate over a parsed log record
+    LOG_FILTERS = {
+        "All": lambda record: True,
+        "Responses": lambda record: record.get("event") in ("response", "cooldown_skip", "send_error"),
+        "Warnings & Errors": lambda record: record.get("level") in ("WARNING", "ERROR"),
+    }
+    
     def __init__(self):
         self.root = ctk.CTk()
         self.root.title("Discord Self-Bot Configuration")
@@ -21,18 +47,31 @@ class DiscordBotGUI:
         # Bot process
         self.bot_process = None
         self.bot_running = False
+        self.ipc_client = None
+        
+        # Per-tab search over keys, responses and resolved names
+        self.search_indices = {kind: SearchIndex() for kind in ("keywords", "role_mentions", "allowed_channels")}
+        self.search_entries = {}
+        
+        # Recent log records so the filter can be changed after the fact
+        self.log_records = deque(maxlen=LOG_MAX_LINES)
+        # Lines from the bot's stdout (and GUI-side messages), drawn in batches by _drain_logs
+        self.log_queue = queue.SimpleQueue()
+        self.log_view_lines = 0
+        self.log_spill = None
         
         # Config manager
         self.config_manager = ConfigManager()
+        self.config_manager.add_save_listener(self._on_config_written)
         
-        # Channel name cache
-        self.channel_name_cache = {}
+        # Channel/role/guild names - the bot writes this file, we only read it
+        self.name_cache = NameCache()
         
         # Load configuration
         self.config = self.load_config()
         
-        # Load cached channel names on startup
-        self.load_cached_channel_names()
+        # Load cached names on startup
+        self.name_cache.load()
         
         # Create GUI
         self.create_widgets()
@@ -40,6 +79,8 @@ class DiscordBotGUI:
         # Set up window close handler
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
+        self.root.after(LOG_DRAIN_MS, self._drain_logs)
+        
     def load_config(self):
         """Load configuration using ConfigManager"""
         try:
@@ -61,10 +102,13 @@ class DiscordBotGUI:
             print(f"ERROR loading config: {e}")
             return self.config_manager.get_default_config()
     
-    def save_config(self, create_backup=True):
-        """Save configuration using ConfigManager"""
+    def save_config(self, create_backup=True, debounce=False, changed=None, config=None):
+        """Save configuration using ConfigManager (changed=(section, key) for single-entry edits,
+        config for a candidate that only replaces self.config once it's saved)"""
         try:
-            success, message = self.config_manager.save_config(self.config, create_backup=create_backup)
+            success, message = self.config_manager.save_config(self.config if config is None else config,
+                                                               create_backup=create_backup,
+                                                               debounce=debounce, changed=changed)
             if not success:
                 messagebox.showerror("Error", f"Failed to save configuration: {message}")
             return success
@@ -72,31 +116,15 @@ class DiscordBotGUI:
             messagebox.showerror("Error", f"Failed to save configuration: {e}")
             return False
     
-    def load_cached_channel_names(self):
-        """Load channel names from persistent cache"""
-        try:
-            import json
-            from datetime import datetime, timedelta
-            
-            if not os.path.exists("channel_names_cache.json"):
-                print("No channel names cache found")
-                return
-            
-            with open("channel_names_cache.json", "r", encoding="utf-8") as f:
-                cache_data = json.load(f)
-            
-            # Check if cache is still valid (7 days)
-            last_updated = datetime.fromisoformat(cache_data.get("last_updated", ""))
-            cache_age = datetime.now() - last_updated
-            
-            if cache_age < timedelta(days=7):
-                self.channel_name_cache = cache_data.get("channels", {})
-                print(f"Loaded {len(self.channel_name_cache)} cached channel names")
-            else:
-                print("Channel names cache is stale (older than 7 days)")
-                
-        except Exception as e:
-            print(f"Error loading cached channel names: {e}")
+    def _on_config_written(self, config_name):
+        """Save listener - runs on whichever thread did the write"""
+        self.root.after(0, self._tell_bot_config_changed, config_name)
+    
+    def _tell_bot_config_changed(self, config_name):
+        if self.is_bot_alive():
+            # Running bot swaps the new config in without reconnecting
+            self.bot_request("reload_config", None,
+                             lambda result: self.status_text.configure(text="Bot picked up the new configuration"))
     
     def create_widgets(self):
         """Create all GUI widgets"""
@@ -110,7 +138,7 @@ class DiscordBotGUI:
         title_label.pack(pady=(20, 30))
         
         # Create notebook for tabs
-        self.notebook = ctk.CTkTabview(main_frame)
+        self.notebook = ctk.CTkTabview(main_frame, command=self.on_tab_changed)
         self.notebook.pack(fill="both", expand=True, padx=10, pady=10)
         
         # Configuration tab
@@ -184,18 +212,32 @@ class DiscordBotGUI:
                                     variable=self.reply_message_var)
         reply_check.pack(pady=5, anchor="w")
         
+        # Lean memory mode (read when the bot starts)
+        self.lean_cache_var = ctk.BooleanVar(value=self.config.get("lean_cache", False))
+        lean_check = ctk.CTkCheckBox(settings_frame, text="Lean memory mode - no message/member cache (restart bot to apply)",
+                                   variable=self.lean_cache_var)
+        lean_check.pack(pady=5, anchor="w")
+        
         # Message delay timer
         delay_frame = ctk.CTkFrame(settings_frame)
         delay_frame.pack(fill="x", pady=10)
         
-        delay_label = ctk.CTkLabel(delay_frame, text="Message Delay Timer", 
+        delay_label = ctk.CTkLabel(delay_frame, text="Response Cooldown", 
                                  font=ctk.CTkFont(size=14, weight="bold"))
         delay_label.pack(pady=(10, 5))
         
-        delay_info = ctk.CTkLabel(delay_frame, 
-                                text="Global delay between messages (prevents rate limiting)",
-                                font=ctk.CTkFont(size=12))
-        delay_info.pack(pady=2)
+        self.delay_info = ctk.CTkLabel(delay_frame, text="", font=ctk.CTkFont(size=12))
+        self.delay_info.pack(pady=2)
+        
+        # What the cooldown applies to
+        self.cooldown_scope_var = ctk.StringVar(
+            value=self.COOLDOWN_SCOPE_LABELS.get(self.config.get("cooldown_scope", "channel_trigger"),
+                                                 self.COOLDOWN_SCOPE_LABELS["channel_trigger"]))
+        scope_menu = ctk.CTkOptionMenu(delay_frame, values=list(self.COOLDOWN_SCOPE_LABELS.values()),
+                                       variable=self.cooldown_scope_var,
+                                       command=lambda choice: self.update_delay_info())
+        scope_menu.pack(pady=5)
+        self.update_delay_info()
         
         # Timer slider
         self.delay_var = ctk.IntVar(value=self.config.get("message_delay_minutes", 5))
@@ -252,6 +294,11 @@ class DiscordBotGUI:
                                  command=self.add_keyword)
         add_button.pack(pady=10)
         
+        bulk_button = ctk.CTkButton(add_frame, text="Bulk Import / Export...", 
+                                  command=lambda: self.open_bulk_dialog("keywords"),
+                                  fg_color="gray30")
+        bulk_button.pack(pady=(0, 10))
+        
         # Keywords list
         list_frame = ctk.CTkFrame(keywords_tab)
         list_frame.pack(fill="both", expand=True, padx=20, pady=20)
@@ -260,8 +307,11 @@ class DiscordBotGUI:
                                 font=ctk.CTkFont(size=16, weight="bold"))
         list_label.pack(pady=(20, 10))
         
+        self._create_search_box(list_frame, "keywords", "Search keywords and responses...")
+        
         # Keywords listbox with scrollbar
-        self.keywords_listbox = ctk.CTkScrollableFrame(list_frame, height=300)
+        self.keywords_listbox = VirtualListView(list_frame, on_action=self.remove_keyword,
+                                                empty_text="No keywords yet", height=300)
         self.keywords_listbox.pack(fill="both", expand=True, padx=10, pady=10)
         
         self.refresh_keywords_list()
@@ -312,6 +362,11 @@ class DiscordBotGUI:
                                       command=self.add_role_mention)
         add_role_button.pack(pady=10)
         
+        bulk_role_button = ctk.CTkButton(add_frame, text="Bulk Import / Export...", 
+                                       command=lambda: self.open_bulk_dialog("role_mentions"),
+                                       fg_color="gray30")
+        bulk_role_button.pack(pady=(0, 10))
+        
         # Role mentions list
         role_list_frame = ctk.CTkFrame(role_tab)
         role_list_frame.pack(fill="both", expand=True, padx=20, pady=20)
@@ -320,8 +375,11 @@ class DiscordBotGUI:
                                      font=ctk.CTkFont(size=16, weight="bold"))
         role_list_label.pack(pady=(20, 10))
         
+        self._create_search_box(role_list_frame, "role_mentions", "Search role IDs and responses...")
+        
         # Role mentions listbox with scrollbar
-        self.role_mentions_listbox = ctk.CTkScrollableFrame(role_list_frame, height=300)
+        self.role_mentions_listbox = VirtualListView(role_list_frame, on_action=self.remove_role_mention,
+                                                     empty_text="No role mentions yet", height=300)
         self.role_mentions_listbox.pack(fill="both", expand=True, padx=10, pady=10)
         
         self.refresh_role_mentions_list()
@@ -364,6 +422,11 @@ class DiscordBotGUI:
                                          command=self.add_channel)
         add_channel_button.pack(pady=10)
         
+        bulk_channel_button = ctk.CTkButton(add_frame, text="Bulk Import / Export...", 
+                                          command=lambda: self.open_bulk_dialog("allowed_channels"),
+                                          fg_color="gray30")
+        bulk_channel_button.pack(pady=(0, 10))
+        
         # Channels list
         channels_list_frame = ctk.CTkFrame(channels_tab)
         channels_list_frame.pack(fill="both", expand=True, padx=20, pady=20)
@@ -398,12 +461,51 @@ class DiscordBotGUI:
                                          width=90, height=30)
         create_docs_button.pack(side="left", padx=5)
         
+        self.docs_format_var = ctk.StringVar(value="Markdown")
+        docs_format_menu = ctk.CTkOptionMenu(button_frame, values=list(self.DOCS_FORMATS),
+                                             variable=self.docs_format_var, width=100, height=30)
+        docs_format_menu.pack(side="left", padx=5)
+        
+        self._create_search_box(channels_list_frame, "allowed_channels", "Search channel IDs, names and servers...")
+        
         # Channels listbox with scrollbar
-        self.channels_listbox = ctk.CTkScrollableFrame(channels_list_frame, height=300)
+        self.channels_listbox = VirtualListView(channels_list_frame, on_action=self.remove_channel,
+                                                empty_text="No channels specified - bot will listen in ALL channels",
+                                                height=300)
         self.channels_listbox.pack(fill="both", expand=True, padx=10, pady=10)
         
         self.refresh_channels_list()
     
+    def _create_search_box(self, parent, kind, placeholder):
+        """Incremental search entry that filters the tab's list on every keystroke"""
+        search_entry = ctk.CTkEntry(parent, placeholder_text=placeholder)
+        search_entry.pack(fill="x", padx=10, pady=(0, 5))
+        search_entry.bind("<KeyRelease>", lambda event: self.apply_search(kind))
+        self.search_entries[kind] = search_entry
+    
+    def _list_view(self, kind):
+        return {
+            "keywords": self.keywords_listbox,
+            "role_mentions": self.role_mentions_listbox,
+            "allowed_channels": self.channels_listbox,
+        }[kind]
+    
+    def apply_search(self, kind, reset_scroll=True):
+        """Filter a list from its search box - data only, no widgets rebuilt"""
+        query = self.search_entries[kind].get()
+        hits = self.search_indices[kind].search(query)
+        view = self._list_view(kind)
+        view.set_filter(hits, reset_scroll=reset_scroll)
+        if hits is None:
+            self.status_text.configure(text=f"Showing all {len(view.source)} entries")
+        else:
+            self.status_text.configure(text=f"{len(hits)} of {len(view.source)} entries match '{query.strip()}'")
+    
+    def _search_changed(self, kind):
+        """Re-run an active search after the underlying entries changed"""
+        if self.search_entries.get(kind) is not None and self.search_entries[kind].get().strip():
+            self.apply_search(kind, reset_scroll=False)
+    
     def create_control_tab(self):
         """Create bot control tab"""
         control_tab = self.notebook.add("Bot Control")
@@ -456,6 +558,11 @@ class DiscordBotGUI:
                                                 height=40, font=ctk.CTkFont(size=14, weight="bold"))
         self.dump_channels_button.pack(side="left", padx=10, pady=10)
         
+        self.latency_button = ctk.CTkButton(dump_buttons_frame, text="Latency Stats", 
+                                          command=self.show_latency_stats,
+                                          height=40, font=ctk.CTkFont(size=14, weight="bold"))
+        self.latency_button.pack(side="left", padx=10, pady=10)
+        
         # Test button to check if bot is monitoring files (commented out - uncomment if needed for debugging)
         # self.test_bot_button = ctk.CTkButton(dump_buttons_frame, text="Test Bot", 
         #                                    command=self.test_bot_connection,
@@ -466,9 +573,27 @@ class DiscordBotGUI:
         logs_frame = ctk.CTkFrame(control_tab)
         logs_frame.pack(fill="both", expand=True, padx=20, pady=20)
         
-        logs_label = ctk.CTkLabel(logs_frame, text="Bot Logs", 
+        logs_header = ctk.CTkFrame(logs_frame)
+        logs_header.pack(fill="x", padx=10, pady=(20, 10))
+        
+        logs_label = ctk.CTkLabel(logs_header, text="Bot Logs", 
                                 font=ctk.CTkFont(size=16, weight="bold"))
-        logs_label.pack(pady=(20, 10))
+        logs_label.pack(side="left", padx=10)
+        
+        # Filter works on the structured records the bot emits
+        self.log_filter_var = ctk.StringVar(value="All")
+        log_filter_menu = ctk.CTkOptionMenu(logs_header, values=list(self.LOG_FILTERS.keys()),
+                                          variable=self.log_filter_var,
+                                          command=self.on_log_filter_changed,
+                                          width=170)
+        log_filter_menu.pack(side="right", padx=10)
+        ctk.CTkLabel(logs_header, text="Show:").pack(side="right")
+        
+        self.log_spill_var = ctk.BooleanVar(value=False)
+        log_spill_check = ctk.CTkCheckBox(logs_header, text=f"Save to {LOG_SPILL_FILE}",
+                                          variable=self.log_spill_var,
+                                          command=self.on_log_spill_toggled)
+        log_spill_check.pack(side="right", padx=10)
         
         self.logs_text = ctk.CTkTextbox(logs_frame, height=200)
         self.logs_text.pack(fill="both", expand=True, padx=10, pady=10)
@@ -558,9 +683,18 @@ class DiscordBotGUI:
         list_frame = ctk.CTkFrame(config_mgmt_tab)
         list_frame.pack(fill="both", expand=True, padx=20, pady=20)
         
-        list_label = ctk.CTkLabel(list_frame, text="Available Configurations", 
+        list_header = ctk.CTkFrame(list_frame, fg_color="transparent")
+        list_header.pack(fill="x", padx=10, pady=(20, 10))
+        
+        list_label = ctk.CTkLabel(list_header, text="Available Configurations", 
                                 font=ctk.CTkFont(size=16, weight="bold"))
-        list_label.pack(pady=(20, 10))
+        list_label.pack(side="left", expand=True)
+        
+        # Files edited in place (outside the GUI) don't touch the directory mtime the index watches
+        refresh_configs_button = ctk.CTkButton(list_header, text="Refresh", 
+                                             command=lambda: self.refresh_config_list(force=True),
+                                             width=80, height=30)
+        refresh_configs_button.pack(side="right")
         
         # Config list with scrollbar
         self.config_listbox = ctk.CTkScrollableFrame(list_frame, height=200)
@@ -583,6 +717,29 @@ class DiscordBotGUI:
         else:
             self.token_entry.configure(show="*")
     
+    # Cooldown scope as shown in the settings tab
+    COOLDOWN_SCOPE_LABELS = {
+        "channel_trigger": "Per channel + trigger",
+        "channel": "Per channel",
+        "global": "Global (any response)",
+    }
+    COOLDOWN_SCOPE_INFO = {
+        "channel_trigger": "Each keyword/role/rule waits this long before firing again in the same channel",
+        "channel": "Each channel waits this long between responses",
+        "global": "One response at a time across every channel (prevents rate limiting)",
+    }
+    
+    def _selected_cooldown_scope(self):
+        label = self.cooldown_scope_var.get()
+        for scope, scope_label in self.COOLDOWN_SCOPE_LABELS.items():
+            if scope_label == label:
+                return scope
+        return "channel_trigger"
+    
+    def update_delay_info(self):
+        """Explain what the cooldown slider applies to for the selected scope"""
+        self.delay_info.configure(text=self.COOLDOWN_SCOPE_INFO[self._selected_cooldown_scope()])
+    
     def update_delay_label(self, value):
         """Update the delay label when slider changes"""
         minutes = int(float(value))
@@ -599,6 +756,8 @@ class DiscordBotGUI:
         self.config["respond_to_self"] = self.respond_self_var.get()
         self.config["reply_to_message"] = self.reply_message_var.get()
         self.config["message_delay_minutes"] = self.delay_var.get()
+        self.config["cooldown_scope"] = self._selected_cooldown_scope()
+        self.config["lean_cache"] = self.lean_cache_var.get()
         
         if self.save_config():
             self.status_text.configure(text="Configuration saved successfully!")
@@ -620,40 +779,171 @@ class DiscordBotGUI:
             return
         
         self.config["keywords"][keyword] = response
-        if self.save_config(create_backup=False):  # Don't create backup for keyword operations
+        if self.save_config(create_backup=False, debounce=True,
+                            changed=("keywords", keyword)):  # Don't create backup for keyword operations
             self.new_keyword_entry.delete(0, "end")
             self.new_response_entry.delete(0, "end")
-            self.refresh_keywords_list()
-            self.status_text.configure(text=f"Added keyword: {keyword}")
+            self.search_indices["keywords"].set(keyword, response)
+            self.keywords_listbox.upsert_item(keyword, self._keyword_row_text(keyword, response))
+            self._search_changed("keywords")
+            self.status_text.configure(text=self._with_warnings(f"Added keyword: {keyword}", "keywords", keyword))
+        else:
+            del self.config["keywords"][keyword]  # rejected - don't let it block the next save
     
     def remove_keyword(self, keyword):
         """Remove keyword"""
         if keyword in self.config["keywords"]:
             del self.config["keywords"][keyword]
-            if self.save_config(create_backup=False):  # Don't create backup for keyword operations
-                self.refresh_keywords_list()
+            if self.save_config(create_backup=False, debounce=True,
+                                changed=("keywords", keyword)):  # Don't create backup for keyword operations
+                self.search_indices["keywords"].remove(keyword)
+                self.keywords_listbox.remove_item(keyword)
                 self.status_text.configure(text=f"Removed keyword: {keyword}")
     
+    def _with_warnings(self, text, section, key):
+        """Status text plus any validation warning the save found for this entry"""
+        report = self.config_manager.get_validation_report()
+        issues = report.for_entry(section, key) if report else []
+        if issues:
+            return f"{text} - warning: {issues[0].message}"
+        return text
+    
+    def _keyword_row_text(self, keyword, response):
+        return f"'{keyword}' → '{response}'"
+    
     def refresh_keywords_list(self):
         """Refresh keywords list display"""
-        # Clear existing widgets
-        for widget in self.keywords_listbox.winfo_children():
-            widget.destroy()
-        
-        # Add keywords
-        for keyword, response in self.config["keywords"].items():
-            keyword_frame = ctk.CTkFrame(self.keywords_listbox)
-            keyword_frame.pack(fill="x", padx=5, pady=5)
-            
-            # Keyword and response
-            ctk.CTkLabel(keyword_frame, text=f"'{keyword}' → '{response}'", 
-                        font=ctk.CTkFont(size=12)).pack(side="left", padx=10, pady=5)
+        keywords = self.config["keywords"]
+        self.search_indices["keywords"].rebuild(keywords.items())
+        self.keywords_listbox.set_items(
+            (keyword, self._keyword_row_text(keyword, response))
+            for keyword, response in keywords.items())
+        self._search_changed("keywords")
+    
+    # Display names for the bulk dialog
+    BULK_SECTIONS = {
+        "keywords": "Keywords",
+        "role_mentions": "Role Mentions",
+        "allowed_channels": "Channels",
+    }
+    
+    def open_bulk_dialog(self, kind):
+        """Paste/load/export hundreds of entries for one section in one go"""
+        dialog = ctk.CTkToplevel(self.root)
+        dialog.title(f"Bulk Import / Export - {self.BULK_SECTIONS[kind]}")
+        dialog.geometry("700x560")
+        dialog.transient(self.root)
+        
+        if kind == "allowed_channels":
+            hint = "One channel ID per line (commas also work), CSV with one ID per row, or a JSON list."
+        else:
+            key_name = "keyword" if kind == "keywords" else "role ID"
+            hint = (f"Lines: '{key_name} | response' (or tab separated), CSV: {key_name},response, "
+                    f"or a JSON object. Lines starting with # are ignored.")
+        ctk.CTkLabel(dialog, text=hint, font=ctk.CTkFont(size=12), wraplength=660).pack(padx=15, pady=(15, 5))
+        
+        options_frame = ctk.CTkFrame(dialog)
+        options_frame.pack(fill="x", padx=15, pady=5)
+        
+        ctk.CTkLabel(options_frame, text="Format:").pack(side="left", padx=(10, 5))
+        format_var = ctk.StringVar(value="auto")
+        ctk.CTkOptionMenu(options_frame, values=list(BULK_FORMATS), variable=format_var,
+                          width=100).pack(side="left", padx=5)
+        
+        overwrite_var = ctk.BooleanVar(value=False)
+        if kind != "allowed_channels":
+            ctk.CTkCheckBox(options_frame, text="Overwrite existing responses",
+                            variable=overwrite_var).pack(side="left", padx=15)
+        
+        text_box = ctk.CTkTextbox(dialog)
+        text_box.pack(fill="both", expand=True, padx=15, pady=10)
+        
+        def load_file():
+            path = filedialog.askopenfilename(parent=dialog, filetypes=[
+                ("Supported files", "*.txt *.csv *.json"), ("All files", "*.*")])
+            if not path:
+                return
+            try:
+                with open(path, "r", encoding="utf-8-sig") as f:
+                    content = f.read()
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to read file: {e}", parent=dialog)
+                return
+            extension = os.path.splitext(path)[1].lower().lstrip(".")
+            if extension in ("csv", "json"):
+                format_var.set(extension)
+            text_box.delete("1.0", "end")
+            text_box.insert("1.0", content)
+        
+        def do_import():
+            content = text_box.get("1.0", "end")
+            entries, errors = self.config_manager.parse_bulk_entries(content, kind, format_var.get())
+            if not entries:
+                details = "\n".join(errors[:15]) if errors else "Nothing to import."
+                messagebox.showerror("Import", f"No valid entries found.\n\n{details}", parent=dialog)
+                return
+            if errors:
+                shown = "\n".join(errors[:15])
+                more = f"\n...and {len(errors) - 15} more" if len(errors) > 15 else ""
+                if not messagebox.askyesno("Import", f"{len(errors)} rows have problems and will be skipped:\n\n"
+                                           f"{shown}{more}\n\nImport the {len(entries)} valid rows?", parent=dialog):
+                    return
             
-            # Remove button
-            remove_button = ctk.CTkButton(keyword_frame, text="Remove", 
-                                        command=lambda k=keyword: self.remove_keyword(k),
-                                        width=80, height=30)
-            remove_button.pack(side="right", padx=10, pady=5)
+            # Merged into a copy: a rejected import must leave self.config as it was
+            merged = copy.deepcopy(self.config)
+            summary = self.config_manager.merge_bulk_entries(merged, kind, entries, overwrite_var.get())
+            # One save and one refresh, no matter how many rows
+            if self.save_config(create_backup=True, config=merged):
+                self.config = merged
+                self._refresh_section(kind)
+                message = (f"Added {summary['added']}, updated {summary['updated']}, "
+                           f"skipped {summary['skipped']} existing")
+                self.status_text.configure(text=f"Bulk import ({self.BULK_SECTIONS[kind]}): {message}")
+                messagebox.showinfo("Import", message, parent=dialog)
+        
+        def export_to_box():
+            try:
+                content = self.config_manager.export_entries(self.config, kind, format_var.get())
+            except ValueError as e:
+                messagebox.showerror("Export", str(e), parent=dialog)
+                return
+            text_box.delete("1.0", "end")
+            text_box.insert("1.0", content)
+        
+        def export_to_file():
+            # "auto" means lines unless some entry can't be written that way
+            fmt = self.config_manager.export_format(self.config, kind, format_var.get())
+            try:
+                content = self.config_manager.export_entries(self.config, kind, fmt)
+            except ValueError as e:
+                messagebox.showerror("Export", str(e), parent=dialog)
+                return
+            extension = ".txt" if fmt == "lines" else f".{fmt}"
+            path = filedialog.asksaveasfilename(parent=dialog, defaultextension=extension,
+                                                initialfile=f"{kind}{extension}")
+            if not path:
+                return
+            try:
+                with open(path, "w", encoding="utf-8", newline="") as f:
+                    f.write(content)
+                self.status_text.configure(text=f"Exported {self.BULK_SECTIONS[kind]} to {path}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to export: {e}", parent=dialog)
+        
+        button_frame = ctk.CTkFrame(dialog)
+        button_frame.pack(fill="x", padx=15, pady=(0, 15))
+        ctk.CTkButton(button_frame, text="Load File...", command=load_file, width=110).pack(side="left", padx=5, pady=8)
+        ctk.CTkButton(button_frame, text="Import", command=do_import, width=110).pack(side="left", padx=5, pady=8)
+        ctk.CTkButton(button_frame, text="Save to File...", command=export_to_file, width=120).pack(side="right", padx=5, pady=8)
+        ctk.CTkButton(button_frame, text="Show Current", command=export_to_box, width=120).pack(side="right", padx=5, pady=8)
+    
+    def _refresh_section(self, kind):
+        if kind == "keywords":
+            self.refresh_keywords_list()
+        elif kind == "role_mentions":
+            self.refresh_role_mentions_list()
+        else:
+            self.refresh_channels_list()
     
     def add_role_mention(self):
         """Add new role mention"""
@@ -673,41 +963,42 @@ class DiscordBotGUI:
             self.config["role_mentions"] = {}
         
         self.config["role_mentions"][role_id] = response
-        if self.save_config(create_backup=False):  # Don't create backup for role operations
+        if self.save_config(create_backup=False, debounce=True,
+                            changed=("role_mentions", role_id)):  # Don't create backup for role operations
             self.new_role_id_entry.delete(0, "end")
             self.new_role_response_entry.delete(0, "end")
-            self.refresh_role_mentions_list()
+            self.search_indices["role_mentions"].set(role_id, response, self.name_cache.role_label(role_id))
+            self.role_mentions_listbox.upsert_item(role_id, self._role_row_text(role_id, response))
+            self._search_changed("role_mentions")
             self.status_text.configure(text=f"Added role mention: {role_id}")
+        else:
+            del self.config["role_mentions"][role_id]
     
     def remove_role_mention(self, role_id):
         """Remove role mention"""
         if "role_mentions" in self.config and role_id in self.config["role_mentions"]:
             del self.config["role_mentions"][role_id]
-            if self.save_config(create_backup=False):  # Don't create backup for role operations
-                self.refresh_role_mentions_list()
+            if self.save_config(create_backup=False, debounce=True,
+                                changed=("role_mentions", role_id)):  # Don't create backup for role operations
+                self.search_indices["role_mentions"].remove(role_id)
+                self.role_mentions_listbox.remove_item(role_id)
                 self.status_text.configure(text=f"Removed role mention: {role_id}")
     
+    def _role_row_text(self, role_id, response):
+        label = self.name_cache.role_label(role_id)
+        if label:
+            return f"{label} ({role_id}) → '{response}'"
+        return f"Role ID: {role_id} → '{response}'"
+    
     def refresh_role_mentions_list(self):
         """Refresh role mentions list display"""
-        # Clear existing widgets
-        for widget in self.role_mentions_listbox.winfo_children():
-            widget.destroy()
-        
-        # Add role mentions
         role_mentions = self.config.get("role_mentions", {})
-        for role_id, response in role_mentions.items():
-            role_frame = ctk.CTkFrame(self.role_mentions_listbox)
-            role_frame.pack(fill="x", padx=5, pady=5)
-            
-            # Role ID and response
-            ctk.CTkLabel(role_frame, text=f"Role ID: {role_id} → '{response}'", 
-                        font=ctk.CTkFont(size=12)).pack(side="left", padx=10, pady=5)
-            
-            # Remove button
-            remove_button = ctk.CTkButton(role_frame, text="Remove", 
-                                        command=lambda r=role_id: self.remove_role_mention(r),
-                                        width=80, height=30)
-            remove_button.pack(side="right", padx=10, pady=5)
+        self.search_indices["role_mentions"].rebuild(
+            (role_id, response, self.name_cache.role_label(role_id)) for role_id, response in role_mentions.items())
+        self.role_mentions_listbox.set_items(
+            (role_id, self._role_row_text(role_id, response))
+            for role_id, response in role_mentions.items())
+        self._search_changed("role_mentions")
     
     def add_channel(self):
         """Add new channel"""
@@ -726,25 +1017,47 @@ class DiscordBotGUI:
             return
         
         self.config["allowed_channels"].append(channel_id)
-        if self.save_config(create_backup=False):  # Don't create backup for channel operations
+        if self.save_config(create_backup=False, debounce=True,
+                            changed=("allowed_channels", channel_id)):  # Don't create backup for channel operations
             self.new_channel_id_entry.delete(0, "end")
-            self.refresh_channels_list()
+            readable_name = self.get_channel_readable_name(channel_id)
+            self.search_indices["allowed_channels"].set(channel_id, readable_name)
+            self.channels_listbox.upsert_item(channel_id, readable_name)
+            self._search_changed("allowed_channels")
             self.status_text.configure(text=f"Added channel: {channel_id}")
+            
+            # Resolve the new channel's name while we're at it (no-op if the bot is down)
+            if self.is_bot_alive() and self.name_cache.get("channels", channel_id) is None:
+                self.bot_request("channel_name", {"channel_id": channel_id},
+                                 self._on_single_channel_name)
+        else:
+            self.config["allowed_channels"].pop()
+    
+    def _on_single_channel_name(self, result):
+        """Show a single resolved channel name (the bot already stored it in the cache)"""
+        self.name_cache.reload()
+        if result["channel_id"] in self.config.get("allowed_channels", []):
+            self.search_indices["allowed_channels"].set(result["channel_id"], result["name"])
+            self.channels_listbox.upsert_item(result["channel_id"], result["name"])
+            self._search_changed("allowed_channels")
     
     def remove_channel(self, channel_id):
         """Remove channel"""
         if "allowed_channels" in self.config and channel_id in self.config["allowed_channels"]:
             self.config["allowed_channels"].remove(channel_id)
-            if self.save_config(create_backup=False):  # Don't create backup for channel operations
-                self.refresh_channels_list()
+            if self.save_config(create_backup=False, debounce=True,
+                                changed=("allowed_channels", channel_id)):  # Don't create backup for channel operations
+                self.search_indices["allowed_channels"].remove(channel_id)
+                self.channels_listbox.remove_item(channel_id)
                 self.status_text.configure(text=f"Removed channel: {channel_id}")
     
     def get_channel_readable_name(self, channel_id):
         """Get readable name for a channel ID"""
         try:
             # Check cache first
-            if channel_id in self.channel_name_cache:
-                return self.channel_name_cache[channel_id]
+            label = self.name_cache.channel_label(channel_id)
+            if label:
+                return label
 
             # If not in cache, show ID with note
             fallback_name = f"Channel ID: {channel_id} (not cached - use 'Get All Names')"
@@ -757,187 +1070,123 @@ class DiscordBotGUI:
     def refresh_channels_list(self):
         """Refresh channels list display"""
         try:
-            # Clear existing widgets
-            for widget in self.channels_listbox.winfo_children():
-                widget.destroy()
-            
-            # DON'T clear cache - use cached names if available
-            # self.channel_name_cache.clear()  # REMOVED THIS LINE
-            
-            # Add channels
-            allowed_channels = self.config.get("allowed_channels", [])
-            if not allowed_channels:
-                # Show message when no channels are specified
-                no_channels_label = ctk.CTkLabel(self.channels_listbox, 
-                                               text="No channels specified - bot will listen in ALL channels",
-                                               font=ctk.CTkFont(size=12),
-                                               text_color="gray")
-                no_channels_label.pack(pady=20)
-            else:
-                # Show normal list
-                self._show_channels_list(allowed_channels)
-                    
+            # Empty list shows the "listening in ALL channels" note
+            rows = [(channel_id, self.get_channel_readable_name(channel_id))
+                    for channel_id in self.config.get("allowed_channels", [])]
+            self.search_indices["allowed_channels"].rebuild(rows)
+            self.channels_listbox.set_items(rows)
+            self._search_changed("allowed_channels")
         except Exception as e:
             print(f"Error refreshing channels list: {e}")
-            # Show error message
-            error_label = ctk.CTkLabel(self.channels_listbox, 
-                                      text=f"Error refreshing channels: {e}",
-                                      font=ctk.CTkFont(size=12),
-                                      text_color="red")
-            error_label.pack(pady=20)
-    
-    def _show_channels_list(self, allowed_channels):
-        """Show the channels list"""
-        try:
-            for channel_id in allowed_channels:
-                channel_frame = ctk.CTkFrame(self.channels_listbox)
-                channel_frame.pack(fill="x", padx=5, pady=5)
-                
-                # Get readable name for the channel
-                readable_name = self.get_channel_readable_name(channel_id)
-                
-                # Channel info with readable name
-                channel_label = ctk.CTkLabel(channel_frame, text=readable_name, 
-                                           font=ctk.CTkFont(size=12))
-                channel_label.pack(side="left", padx=10, pady=5)
-                
-                # Remove button
-                remove_button = ctk.CTkButton(channel_frame, text="Remove", 
-                                            command=lambda c=channel_id: self.remove_channel(c),
-                                            width=80, height=30)
-                remove_button.pack(side="right", padx=10, pady=5)
-        except Exception as e:
-            print(f"Error showing channels list: {e}")
+            self.channels_listbox.set_message(f"Error refreshing channels: {e}", color="red")
     
     def get_all_channel_names(self):
-        """Get all channel names using the safer bulk dump approach"""
+        """Ask the running bot for every allowed channel's name"""
         try:
-            if not (hasattr(self, 'bot_process') and self.bot_process and self.bot_process.poll() is None):
+            if not self.is_bot_alive():
                 messagebox.showwarning("Warning", "Bot is not running. Start the bot first to get channel names.")
                 return
             
-            # Use the existing bulk dump functionality which is safer
-            try:
-                with open("get_channel_names", "w") as f:
-                    f.write("dump_channels")
-                
-                # Show message that we're getting names
-                for widget in self.channels_listbox.winfo_children():
-                    widget.destroy()
-                
-                loading_label = ctk.CTkLabel(self.channels_listbox, 
-                                           text="Getting all channel names from bot...\nCheck the bot console for results.",
-                                           font=ctk.CTkFont(size=12),
-                                           text_color="orange")
-                loading_label.pack(pady=20)
-                
-                self.status_text.configure(text="Requesting all channel names from bot...")
-                
-                # Schedule a refresh after a delay
-                self.root.after(3000, self._refresh_after_bulk_dump)
-                
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to request channel names: {e}")
+            # Show message that we're getting names
+            self.channels_listbox.set_message("Getting all channel names from bot...", color="orange")
+            
+            self.status_text.configure(text="Requesting all channel names from bot...")
+            self.bot_request("dump_channels", None, self._on_channel_names_received,
+                             on_error=self._on_channel_names_failed)
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to get channel names: {e}")
     
-    def _refresh_after_bulk_dump(self):
-        """Refresh the channels list after bulk dump"""
+    def _on_channel_names_received(self, channel_mapping):
+        """Merge the bot's channel names into the cache and redraw the list"""
         try:
-            # Clear the loading message
-            for widget in self.channels_listbox.winfo_children():
-                widget.destroy()
-            
-            # Try to parse channel names from bot logs and update cache
-            self._parse_channel_names_from_logs()
-            
-            # Show normal list (names will be cached from bulk dump)
-            allowed_channels = self.config.get("allowed_channels", [])
-            self._show_channels_list(allowed_channels)
-            
-            self.status_text.configure(text="Channel names updated")
-            
+            # The bot saved what it resolved; pick that up (roles may have come along too)
+            self.name_cache.reload()
+            self.refresh_channels_list()
+            self.refresh_role_mentions_list()
+            self.status_text.configure(text=f"Channel names updated ({len(channel_mapping or {})} channels)")
         except Exception as e:
             print(f"Error refreshing after bulk dump: {e}")
     
-    def _parse_channel_names_from_logs(self):
-        """Parse channel names from bot logs and update cache"""
-        try:
-            # Read the channel mapping file that the bot created
-            if os.path.exists("channel_mapping.txt"):
-                with open("channel_mapping.txt", "r", encoding="utf-8") as f:
-                    lines = f.readlines()
-                
-                # Parse the mapping file
-                for line in lines:
-                    if '|' in line:
-                        channel_id, readable_name = line.strip().split('|', 1)
-                        self.channel_name_cache[channel_id] = readable_name
-                
-                # Clean up the mapping file
-                os.remove("channel_mapping.txt")
-                print(f"Loaded {len(self.channel_name_cache)} channel names from mapping file")
-                
-                # Save updated cache to persistent storage
-                self.save_channel_names_cache()
-                        
-        except Exception as e:
-            print(f"Error parsing channel names from mapping file: {e}")
+    def _on_channel_names_failed(self, error):
+        self.refresh_channels_list()
+        self.status_text.configure(text=f"Failed to get channel names: {error}")
     
-    def save_channel_names_cache(self):
-        """Save channel names cache to persistent storage"""
-        try:
-            import json
-            from datetime import datetime
-            
-            cache_data = {
-                "last_updated": datetime.now().isoformat(),
-                "channels": self.channel_name_cache
-            }
-            
-            with open("channel_names_cache.json", "w", encoding="utf-8") as f:
-                json.dump(cache_data, f, indent=2)
-            
-            print(f"Saved {len(self.channel_name_cache)} channel names to cache")
-        except Exception as e:
-            print(f"Error saving channel names cache: {e}")
+    # Documentation format as shown in the channels tab -> report format
+    DOCS_FORMATS = {"Markdown": "markdown", "HTML": "html", "JSON": "json"}
     
     def create_channel_documentation(self):
-        """Create channel documentation file"""
+        """Ask the bot to write the channel documentation file"""
         try:
-            if not (hasattr(self, 'bot_process') and self.bot_process and self.bot_process.poll() is None):
+            if not self.is_bot_alive():
                 messagebox.showwarning("Warning", "Bot is not running. Start the bot first to create documentation.")
                 return
             
-            # Request documentation creation from bot
-            try:
-                with open("create_documentation", "w") as f:
-                    f.write("create_docs")
-                
-                self.status_text.configure(text="Creating channel documentation...")
-                messagebox.showinfo("Success", "Channel documentation will be created.\nCheck for 'channel_names.md' file.")
-                
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to request documentation creation: {e}")
+            self.status_text.configure(text="Creating channel documentation...")
+            self.bot_request("create_documentation", {"format": self.DOCS_FORMATS[self.docs_format_var.get()]},
+                             lambda result: self.status_text.configure(text=f"Channel documentation created: {result}"),
+                             on_error=lambda error: messagebox.showerror("Error", f"Failed to create documentation: {error}"))
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to create documentation: {e}")
     
+    def is_bot_alive(self):
+        """True while the bot subprocess is up"""
+        return bool(self.bot_process and self.bot_process.poll() is None and self.ipc_client)
+    
+    def bot_request(self, command, params, on_result, on_error=None):
+        """Send an IPC request to the bot without blocking the Tk loop.
+        
+        Callbacks are run back on the main thread.
+        """
+        client = self.ipc_client
+        if client is None:
+            if on_error:
+                on_error("Bot is not running")
+            return
+        
+        def worker():
+            try:
+                result = client.request(command, params)
+            except Exception as e:
+                if on_error:
+                    self.root.after(0, on_error, str(e))
+                else:
+                    self.root.after(0, self.update_logs, f"Bot request '{command}' failed: {e}\n")
+                return
+            self.root.after(0, on_result, result)
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
     def start_bot(self):
         """Start the bot"""
         if not self.config.get("token"):
             messagebox.showerror("Error", "Please enter a Discord token first")
             return
         
+        # Bot reads the config from disk, so pending edits have to land first
+        self.config_manager.flush()
+        
         try:
-            # Start bot in separate process
-            self.bot_process = subprocess.Popen([sys.executable, "bot.py"], 
+            # Private localhost channel for name lookups etc. - the bot reads these from its env
+            ipc_port = ipc.pick_free_port()
+            ipc_token = ipc.new_token()
+            bot_env = dict(os.environ)
+            bot_env[ipc.ENV_PORT] = str(ipc_port)
+            bot_env[ipc.ENV_TOKEN] = ipc_token
+            
+            # Start bot in separate process, on the config that's loaded here rather than plain config.json
+            config_name = self.config_manager.get_current_config_name() or self.config_manager.default_config_name
+            bot_command = [sys.executable, "bot.py", "--config", config_name,
+                           "--config-dir", self.config_manager.config_dir, "--log-format", "json"]
+            self.bot_process = subprocess.Popen(bot_command, 
                                               stdout=subprocess.PIPE, 
                                               stderr=subprocess.STDOUT,
                                               text=True,
                                               bufsize=1,
-                                              universal_newlines=True)
+                                              universal_newlines=True,
+                                              env=bot_env)
+            self.ipc_client = ipc.IpcClient(ipc_port, ipc_token)
             
             self.bot_running = True
             self.status_label.configure(text="Running", text_color="green")
@@ -958,6 +1207,7 @@ class DiscordBotGUI:
     def stop_bot(self):
         """Stop the bot"""
         self.bot_running = False
+        self.ipc_client = None
         
         if self.bot_process:
             try:
@@ -1000,6 +1250,9 @@ class DiscordBotGUI:
     
     def on_closing(self):
         """Handle window closing - ensure bot is stopped"""
+        # Debounced edits still in flight must hit the disk before we go
+        self.config_manager.flush()
+        
         if self.bot_running and self.bot_process:
             print("GUI closing - stopping bot...")
             self.stop_bot()
@@ -1009,115 +1262,234 @@ class DiscordBotGUI:
     
     def monitor_bot_output_thread(self):
         """Monitor bot output in a separate thread"""
-        while self.bot_running and self.bot_process:
-            try:
-                # Read output line by line
-                output = self.bot_process.stdout.readline()
-                if output:
-                    # Schedule GUI update on main thread
-                    self.root.after(0, self.update_logs, output)
-                
-                # Check if process is still running
-                if self.bot_process and self.bot_process.poll() is not None:
-                    self.root.after(0, self.stop_bot)
-                    break
-                
-                # Small delay to prevent excessive CPU usage
-                import time
-                time.sleep(0.1)
-                
-            except Exception as e:
-                self.root.after(0, self.update_logs, f"Error monitoring bot: {e}\n")
-                break
+        process = self.bot_process
+        try:
+            # readline blocks until there's a line, so no polling sleep needed;
+            # lines only get queued here and are drawn in batches by _drain_logs
+            for output in iter(process.stdout.readline, ""):
+                self.log_queue.put(output)
+        except Exception as e:
+            self.log_queue.put(f"Error monitoring bot: {e}\n")
+        
+        # stdout closed: the bot exited (or stop_bot already ran)
+        if self.bot_running and self.bot_process is process:
+            self.root.after(0, self.stop_bot)
     
     def update_logs(self, output):
-        """Update logs display (called from main thread)"""
+        """Queue text for the log view - shown on the next drain, in order with bot output"""
         if output:
-            # Add debug info to see what we're receiving
-            self.logs_text.insert("end", output)
+            self.log_queue.put(output)
+    
+    def _drain_logs(self):
+        """Draw everything queued since the last tick with one insert and one scroll"""
+        try:
+            chunks = []
+            while len(chunks) < LOG_MAX_BATCH:
+                try:
+                    chunks.append(self.log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if chunks:
+                self._show_log_lines("".join(chunks).splitlines())
+        except Exception as e:
+            print(f"Error updating logs: {e}")
+        finally:
+            # A full batch means more is waiting - come straight back
+            delay = 1 if len(chunks) >= LOG_MAX_BATCH else LOG_DRAIN_MS
+            self.root.after(delay, self._drain_logs)
+    
+    def _show_log_lines(self, lines):
+        wanted = self.LOG_FILTERS[self.log_filter_var.get()]
+        shown = []
+        spilled = [] if self.log_spill is not None else None
+        for line in lines:
+            record = parse_line(line)
+            if record is None:
+                # Plain print()s, tracebacks and GUI-side messages - only "All" shows these
+                record = {"level": "INFO", "event": "raw", "text": line}
+            self.log_records.append(record)
+            if record.get("event") == "name_update":
+                self._apply_name_update(record)
+            if wanted(record):
+                shown.append(self._log_record_text(record))
+            if spilled is not None:
+                spilled.append(self._log_record_text(record))
+        
+        if spilled:
+            # The file gets every line whatever the filter says
+            self.log_spill.info("\n".join(spilled))
+        
+        if not shown:
+            return
+        # Only follow the tail if the user hasn't scrolled up to read something
+        at_bottom = self.logs_text.yview()[1] >= 0.999
+        self.logs_text.insert("end", "\n".join(shown[-LOG_MAX_LINES:]) + "\n")
+        self.log_view_lines += min(len(shown), LOG_MAX_LINES)
+        self._trim_log_view()
+        if at_bottom:
             self.logs_text.see("end")
-            # Also print to console for debugging
-            print(f"GUI received: {repr(output)}")
+    
+    def _apply_name_update(self, record):
+        """A channel/role/server was renamed or deleted - update just that row"""
+        kind, object_id = record.get("kind"), record.get("id")
+        if kind not in ("channels", "roles", "guilds") or not object_id:
+            return
+        if record.get("deleted"):
+            self.name_cache.mark_deleted(kind, object_id)
+        elif record.get("name") is None:
+            self.name_cache.remove(kind, object_id)
+        else:
+            self.name_cache.set(kind, object_id, record["name"], record.get("guild_id"))
+        
+        if kind == "channels" and object_id in self.config.get("allowed_channels", []):
+            label = self.get_channel_readable_name(object_id)
+            self.search_indices["allowed_channels"].set(object_id, label)
+            self.channels_listbox.upsert_item(object_id, label)
+            self._search_changed("allowed_channels")
+        elif kind == "roles" and object_id in self.config.get("role_mentions", {}):
+            response = self.config["role_mentions"][object_id]
+            self.search_indices["role_mentions"].set(object_id, response, self.name_cache.role_label(object_id))
+            self.role_mentions_listbox.upsert_item(object_id, self._role_row_text(object_id, response))
+            self._search_changed("role_mentions")
+        elif kind == "guilds":
+            # Server name is part of every channel/role label in it
+            self.refresh_channels_list()
+            self.refresh_role_mentions_list()
+    
+    def _trim_log_view(self):
+        """Ring buffer: drop the oldest lines once the view holds more than LOG_MAX_LINES"""
+        excess = self.log_view_lines - LOG_MAX_LINES
+        if excess > 0:
+            self.logs_text.delete("1.0", f"{excess + 1}.0")
+            self.log_view_lines = LOG_MAX_LINES
+    
+    def on_log_spill_toggled(self):
+        """Start/stop copying log lines into a rotating file next to the configs"""
+        if self.log_spill_var.get():
+            try:
+                handler = RotatingFileHandler(LOG_SPILL_FILE, maxBytes=LOG_SPILL_MAX_BYTES,
+                                              backupCount=LOG_SPILL_BACKUPS, encoding="utf-8")
+            except OSError as e:
+                self.log_spill_var.set(False)
+                messagebox.showerror("Error", f"Could not open {LOG_SPILL_FILE}: {e}")
+                return
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self.log_spill = logging.getLogger("boostbot.gui.spill")
+            self.log_spill.propagate = False
+            self.log_spill.setLevel(logging.INFO)
+            self.log_spill.addHandler(handler)
+            self.status_text.configure(text=f"Saving logs to {LOG_SPILL_FILE}")
+        elif self.log_spill is not None:
+            for handler in list(self.log_spill.handlers):
+                self.log_spill.removeHandler(handler)
+                handler.close()
+            self.log_spill = None
+            self.status_text.configure(text="Stopped saving logs to file")
+    
+    def _log_record_text(self, record):
+        return record["text"] if record.get("event") == "raw" else render_record(record)
+    
+    def on_log_filter_changed(self, choice):
+        """Re-render the log view from the stored records"""
+        wanted = self.LOG_FILTERS[choice]
+        self.logs_text.delete("1.0", "end")
+        lines = [self._log_record_text(record) for record in self.log_records if wanted(record)]
+        if lines:
+            self.logs_text.insert("end", "\n".join(lines) + "\n")
+        self.log_view_lines = len(lines)
+        self.logs_text.see("end")
     
     def dump_roles(self):
         """Dump role information to console"""
         try:
-            self.update_logs("=== ROLE INFORMATION DUMP ===\n")
-            
             role_mentions = self.config.get("role_mentions", {})
-            if not role_mentions:
-                self.update_logs("No role mentions configured\n")
-            else:
-                # Try to get formatted info from bot if it's running
-                if hasattr(self, 'bot_process') and self.bot_process:
-                    try:
-                        with open("get_role_names", "w") as f:
-                            f.write("dump_roles")
-                        self.update_logs("Requesting role names from bot...\n")
-                        # Verify file was created
-                        if os.path.exists("get_role_names"):
-                            self.update_logs("Role request file created successfully\n")
-                        else:
-                            self.update_logs("ERROR: Role request file was not created\n")
-                        self.status_text.configure(text="Requesting role information from bot...")
-                    except Exception as e:
-                        self.update_logs(f"Failed to request from bot: {e}\n")
-                        # Fallback to basic info
-                        self.update_logs(f"Found {len(role_mentions)} role mentions in config:\n")
-                        for role_id, response in role_mentions.items():
-                            self.update_logs(f"Role ID: {role_id} | Response: '{response}'\n")
-                else:
-                    # Fallback to basic info if bot not running
-                    self.update_logs(f"Found {len(role_mentions)} role mentions in config:\n")
-                    for role_id, response in role_mentions.items():
-                        self.update_logs(f"Role ID: {role_id} | Response: '{response}'\n")
             
-            self.update_logs("=== END ROLE DUMP ===\n")
-            self.status_text.configure(text="Role information dumped to console")
+            # Try to get resolved names from bot if it's running
+            if role_mentions and self.is_bot_alive():
+                self.update_logs("Requesting role names from bot...\n")
+                self.status_text.configure(text="Requesting role information from bot...")
+                self.bot_request("dump_roles", None, self._on_roles_dumped,
+                                 on_error=self._dump_roles_from_config)
+                return
+            
+            self._dump_roles_from_config()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to dump roles: {e}")
     
+    def _on_roles_dumped(self, roles):
+        # The bot already logged the full dump, which shows up in the log view
+        self.name_cache.reload()
+        self.refresh_role_mentions_list()
+        self.status_text.configure(text=f"Role information received ({len(roles)} roles)")
+    
+    def _dump_roles_from_config(self, error=None):
+        """Fallback: list role IDs straight from the config"""
+        role_mentions = self.config.get("role_mentions", {})
+        self.update_logs("=== ROLE INFORMATION DUMP ===\n")
+        if error:
+            self.update_logs(f"Failed to request from bot: {error}\n")
+        if not role_mentions:
+            self.update_logs("No role mentions configured\n")
+        else:
+            self.update_logs(f"Found {len(role_mentions)} role mentions in config:\n")
+            for role_id, response in role_mentions.items():
+                self.update_logs(f"Role ID: {role_id} | Response: '{response}'\n")
+        self.update_logs("=== END ROLE DUMP ===\n")
+        self.status_text.configure(text="Role information dumped to console")
+    
     def dump_channels(self):
         """Dump channel information to console"""
         try:
-            self.update_logs("=== CHANNEL INFORMATION DUMP ===\n")
-            
             allowed_channels = self.config.get("allowed_channels", [])
-            if not allowed_channels:
-                self.update_logs("No channel restrictions - listening in ALL channels\n")
-            else:
-                # Try to get formatted info from bot if it's running
-                if hasattr(self, 'bot_process') and self.bot_process:
-                    try:
-                        with open("get_channel_names", "w") as f:
-                            f.write("dump_channels")
-                        self.update_logs("Requesting channel names from bot...\n")
-                        # Verify file was created
-                        if os.path.exists("get_channel_names"):
-                            self.update_logs("Channel request file created successfully\n")
-                            self.update_logs("Bot will resolve channel names and display them in the console.\n")
-                            self.update_logs("Check the bot console output for detailed channel information.\n")
-                        else:
-                            self.update_logs("ERROR: Channel request file was not created\n")
-                        self.status_text.configure(text="Requesting channel information from bot...")
-                    except Exception as e:
-                        self.update_logs(f"Failed to request from bot: {e}\n")
-                        # Fallback to basic info
-                        self.update_logs(f"Found {len(allowed_channels)} allowed channels in config:\n")
-                        for channel_id in allowed_channels:
-                            readable_name = self.get_channel_readable_name(channel_id)
-                            self.update_logs(f"  {readable_name}\n")
-                else:
-                    # Fallback to basic info if bot not running
-                    self.update_logs(f"Found {len(allowed_channels)} allowed channels in config:\n")
-                    for channel_id in allowed_channels:
-                        self.update_logs(f"Channel ID: {channel_id}\n")
             
-            self.update_logs("=== END CHANNEL DUMP ===\n")
-            self.status_text.configure(text="Channel information dumped to console")
+            # Try to get resolved names from bot if it's running
+            if allowed_channels and self.is_bot_alive():
+                self.update_logs("Requesting channel names from bot...\n")
+                self.status_text.configure(text="Requesting channel information from bot...")
+                self.bot_request("dump_channels", None, self._on_channel_names_received,
+                                 on_error=self._dump_channels_from_config)
+                return
+            
+            self._dump_channels_from_config()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to dump channels: {e}")
     
+    def _dump_channels_from_config(self, error=None):
+        """Fallback: list channels from the config and whatever names we have cached"""
+        allowed_channels = self.config.get("allowed_channels", [])
+        self.update_logs("=== CHANNEL INFORMATION DUMP ===\n")
+        if error:
+            self.update_logs(f"Failed to request from bot: {error}\n")
+        if not allowed_channels:
+            self.update_logs("No channel restrictions - listening in ALL channels\n")
+        else:
+            self.update_logs(f"Found {len(allowed_channels)} allowed channels in config:\n")
+            for channel_id in allowed_channels:
+                readable_name = self.get_channel_readable_name(channel_id)
+                self.update_logs(f"  {readable_name}\n")
+        self.update_logs("=== END CHANNEL DUMP ===\n")
+        self.status_text.configure(text="Channel information dumped to console")
+    
+    def show_latency_stats(self):
+        """Print the bot's response-time histogram summary to the log view"""
+        if not self.is_bot_alive():
+            messagebox.showwarning("Warning", "Bot is not running. Start the bot first to see latency stats.")
+            return
+        self.bot_request("latency_stats", None, self._on_latency_stats)
+    
+    def _on_latency_stats(self, stats):
+        self.update_logs("=== RESPONSE LATENCY (ms) ===\n")
+        if not stats or not stats.get("send", {}).get("count"):
+            self.update_logs("No responses sent yet\n")
+        else:
+            self.update_logs(f"{'stage':<10}{'count':>7}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}\n")
+            for stage, summary in stats.items():
+                cells = [f"{summary[key]:.1f}" if summary[key] is not None else "-"
+                         for key in ("p50", "p90", "p99", "max")]
+                self.update_logs(f"{stage:<10}{summary['count']:>7}" + "".join(f"{cell:>10}" for cell in cells) + "\n")
+        self.update_logs("=== END LATENCY ===\n")
+        self.status_text.configure(text="Latency stats received")
+    
     # Test bot connection function (commented out - uncomment if needed for debugging)
     # def test_bot_connection(self):
     #     """Test if bot is monitoring files"""
@@ -1153,6 +1525,8 @@ class DiscordBotGUI:
             return
         
         try:
+            self.config_manager.flush()
+            
             # Load the new config
             new_config, message = self.config_manager.load_config(selected_config)
             if new_config is None:
@@ -1245,16 +1619,28 @@ class DiscordBotGUI:
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to delete configuration: {e}")
     
-    def refresh_config_list(self):
+    def on_tab_changed(self):
+        """Re-stat every config when the Config Management tab is opened"""
+        if self.notebook.get() == "Config Management":
+            self.refresh_config_list(force=True)
+    
+    def refresh_config_list(self, force=False):
         """Refresh the configuration list display"""
+        entries = self.config_manager.get_config_entries(force_refresh=force)
+        current_name = self.config_manager.get_current_config_name()
+        
+        # Same files, same current config - the widgets on screen are already right
+        # (force only rescans the files; entries carry mtime/size, so edits still redraw)
+        state = (tuple(entries), current_name)
+        if state == getattr(self, "_config_list_state", None):
+            return
+        self._config_list_state = state
+        
         # Clear existing widgets
         for widget in self.config_listbox.winfo_children():
             widget.destroy()
         
-        # Get available configs
-        configs = self.get_available_configs()
-        
-        if not configs:
+        if not entries:
             no_configs_label = ctk.CTkLabel(self.config_listbox, 
                                           text="No configuration files found",
                                           font=ctk.CTkFont(size=12),
@@ -1263,18 +1649,32 @@ class DiscordBotGUI:
             return
         
         # Add each config
-        for config_name in configs:
+        for entry in entries:
+            config_name = entry.name
             config_frame = ctk.CTkFrame(self.config_listbox)
             config_frame.pack(fill="x", padx=5, pady=5)
             
             # Config name and status
-            is_current = config_name == self.config_manager.get_current_config_name()
+            is_current = config_name == current_name
             status_text = " (Current)" if is_current else ""
             config_label = ctk.CTkLabel(config_frame, 
                                       text=f"{config_name}{status_text}", 
-                                      font=ctk.CTkFont(size=12))
+                                      font=ctk.CTkFont(size=12, weight="bold" if is_current else "normal"))
             config_label.pack(side="left", padx=10, pady=5)
             
+            if entry.valid:
+                details = (f"{entry.keyword_count} keywords, {entry.role_count} roles, "
+                           f"{entry.channel_count} channels")
+                if entry.rule_count:
+                    details += f", {entry.rule_count} rules"
+                details_color = "gray"
+            else:
+                details, details_color = entry.message, "orange"
+            details += f" · modified {entry.modified.strftime('%Y-%m-%d %H:%M')}"
+            details_label = ctk.CTkLabel(config_frame, text=details, font=ctk.CTkFont(size=11),
+                                         text_color=details_color)
+            details_label.pack(side="left", padx=10, pady=5)
+            
             # Delete button (if not current and not default)
             if not is_current and config_name != "config.json":
                 delete_button = ctk.CTkButton(config_frame, text="Delete", 
@@ -1298,11 +1698,15 @@ class DiscordBotGUI:
         self.case_sensitive_var.set(self.config.get("case_sensitive", False))
         self.respond_self_var.set(self.config.get("respond_to_self", False))
         self.reply_message_var.set(self.config.get("reply_to_message", True))
+        self.lean_cache_var.set(self.config.get("lean_cache", False))
         
         # Update delay slider
         delay = self.config.get("message_delay_minutes", 5)
         self.delay_var.set(delay)
         self.update_delay_label(delay)
+        scope = self.config.get("cooldown_scope", "channel_trigger")
+        self.cooldown_scope_var.set(self.COOLDOWN_SCOPE_LABELS.get(scope, self.COOLDOWN_SCOPE_LABELS["channel_trigger"]))
+        self.update_delay_info()
         
         # Refresh other lists
         self.refresh_keywords_list()
@@ -0,0 +1,159 @@
+import asyncio
+import json
+import os
+import secrets
+import socket
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# The GUI picks the port/secret and hands them to bot.py through the environment
+IPC_HOST = "127.0.0.1"
+ENV_PORT = "BOOSTBOT_IPC_PORT"
+ENV_TOKEN = "BOOSTBOT_IPC_TOKEN"
+
+# One JSON object per line in both directions. json.dumps never emits a raw
+# newline, so the line is the frame - no length prefixes needed.
+MAX_FRAME_BYTES = 1024 * 1024
+
+
+class IpcError(Exception):
+    """Raised on the client side when a request fails or the bot can't be reached"""
+
+
+def encode_frame(payload: Dict[str, Any]) -> bytes:
+    return (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def decode_frame(line: bytes) -> Dict[str, Any]:
+    payload = json.loads(line.decode("utf-8"))
+    if not isinstance(payload, dict):
+        raise ValueError("IPC frame must be a JSON object")
+    return payload
+
+
+def pick_free_port() -> int:
+    """Ask the OS for an unused localhost port (tiny race window, good enough here)"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((IPC_HOST, 0))
+        return sock.getsockname()[1]
+
+
+def new_token() -> str:
+    return secrets.token_hex(16)
+
+
+def settings_from_env() -> tuple[Optional[int], Optional[str]]:
+    """Port/token the GUI passed to us, or (None, None) when running standalone"""
+    port = os.environ.get(ENV_PORT)
+    if not port:
+        return None, None
+    try:
+        return int(port), os.environ.get(ENV_TOKEN) or None
+    except ValueError:
+        return None, None
+
+
+Handler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+class IpcServer:
+    """Request/response server living inside the bot process.
+
+    Handlers are coroutines taking the request params and returning anything
+    JSON serializable. Nothing runs until a client actually connects.
+    """
+
+    def __init__(self, handlers: Dict[str, Handler], token: Optional[str] = None, log=print):
+        self.handlers = handlers
+        self.token = token
+        self.log = log
+        self._server = None
+
+    async def start(self, port: int, host: str = IPC_HOST):
+        self._server = await asyncio.start_server(self._handle_client, host, port,
+                                                  limit=MAX_FRAME_BYTES)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await self._dispatch(line)
+                writer.write(encode_frame(response))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # GUI went away mid-request, nothing to clean up
+        except Exception as e:
+            self.log(f"IPC client error: {e}")
+        finally:
+            writer.close()
+
+    async def _dispatch(self, line: bytes) -> Dict[str, Any]:
+        request_id = None
+        try:
+            request = decode_frame(line)
+            request_id = request.get("id")
+
+            if self.token and request.get("token") != self.token:
+                return {"id": request_id, "ok": False, "error": "unauthorized"}
+
+            command = request.get("command")
+            handler = self.handlers.get(command)
+            if handler is None:
+                return {"id": request_id, "ok": False, "error": f"unknown command: {command}"}
+
+            result = await handler(request.get("params") or {})
+            return {"id": request_id, "ok": True, "result": result}
+        except Exception as e:
+            return {"id": request_id, "ok": False, "error": str(e)}
+
+
+class IpcClient:
+    """Blocking client used by the GUI (call it from a worker thread, not the Tk loop)"""
+
+    def __init__(self, port: int, token: Optional[str] = None, timeout: float = 10.0):
+        self.port = port
+        self.token = token
+        self.timeout = timeout
+        self._next_id = 0
+
+    def _connect(self, connect_wait: float) -> socket.socket:
+        # The bot needs a moment after launch before the server is listening
+        deadline = time.monotonic() + connect_wait
+        while True:
+            try:
+                return socket.create_connection((IPC_HOST, self.port), timeout=self.timeout)
+            except OSError as e:
+                if time.monotonic() >= deadline:
+                    raise IpcError(f"Bot is not reachable: {e}") from e
+                time.sleep(0.1)
+
+    def request(self, command: str, params: Optional[Dict[str, Any]] = None, connect_wait: float = 3.0) -> Any:
+        self._next_id += 1
+        request = {"id": self._next_id, "command": command, "params": params or {}}
+        if self.token:
+            request["token"] = self.token
+
+        with self._connect(connect_wait) as sock:
+            sock.sendall(encode_frame(request))
+            with sock.makefile("rb") as stream:
+                try:
+                    line = stream.readline(MAX_FRAME_BYTES)
+                except socket.timeout as e:
+                    raise IpcError(f"Bot did not answer '{command}' in time") from e
+
+        if not line:
+            raise IpcError("Bot closed the connection without answering")
+
+        response = decode_frame(line)
+        if not response.get("ok"):
+            raise IpcError(response.get("error") or "request failed")
+        return response.get("result")
@@ -0,0 +1,111 @@
+import math
+import threading
+from typing import Dict, Optional
+
+# Pipeline stages we time for every response we send:
+#   gateway  - message created_at (Discord's clock) -> event received by us
+#   decide   - event received -> trigger/cooldown decision made
+#   dispatch - decision made -> HTTP send started
+#   send     - HTTP send started -> reply acknowledged
+#   total    - message created_at -> reply acknowledged
+STAGES = ("gateway", "decide", "dispatch", "send", "total")
+
+
+class LatencyHistogram:
+    """Fixed-size log-scale histogram of millisecond samples.
+
+    Buckets grow by ~19% each (4 per doubling) from 0.05ms up to ~14 minutes.
+    Percentiles interpolate inside a bucket, which is plenty for "is p99 under
+    300ms", and memory never grows no matter how long the bot runs.
+    """
+
+    MIN_MS = 0.05
+    BUCKETS_PER_DOUBLING = 4
+    BUCKET_COUNT = 4 * 24  # 0.05ms * 2**24 ~= 14 minutes
+
+    def __init__(self):
+        self.counts = [0] * (self.BUCKET_COUNT + 1)  # last bucket = overflow
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = None
+
+    def _bucket(self, ms: float) -> int:
+        if ms <= self.MIN_MS:
+            return 0
+        index = int(math.log2(ms / self.MIN_MS) * self.BUCKETS_PER_DOUBLING) + 1
+        return min(index, self.BUCKET_COUNT)
+
+    def _bucket_upper_ms(self, index: int) -> float:
+        return self.MIN_MS * 2 ** (index / self.BUCKETS_PER_DOUBLING)
+
+    def record(self, ms: float):
+        # Discord's clock vs ours can be skewed a bit; a negative gateway time is just noise
+        ms = max(0.0, ms)
+        self.counts[self._bucket(ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = ms if self.min_ms is None else min(self.min_ms, ms)
+        self.max_ms = ms if self.max_ms is None else max(self.max_ms, ms)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * pct / 100.0))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank:
+                # Interpolate inside the bucket, clamped to what we actually saw
+                lower = self._bucket_upper_ms(index - 1) if index else 0.0
+                upper = self._bucket_upper_ms(index)
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(max(estimate, self.min_ms), self.max_ms)
+            seen += bucket_count
+        return self.max_ms
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        def rounded(value):
+            return None if value is None else round(value, 2)
+
+        return {
+            "count": self.count,
+            "mean": rounded(self.total_ms / self.count) if self.count else None,
+            "min": rounded(self.min_ms),
+            "p50": rounded(self.percentile(50)),
+            "p90": rounded(self.percentile(90)),
+            "p99": rounded(self.percentile(99)),
+            "max": rounded(self.max_ms),
+        }
+
+
+class LatencyTracker:
+    """Per-stage histograms for every response the bot sends.
+
+    Written from the event loop, read from IPC handlers - a lock keeps the
+    snapshot consistent if that ever stops being the same thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+
+    def record(self, created_at: Optional[float], received_wall: float, received: float,
+               decided: float, send_started: float, acked: float):
+        """created_at/received_wall are epoch seconds, the rest perf_counter() seconds"""
+        after_receive = acked - received
+        with self._lock:
+            if created_at is not None:
+                gateway_ms = (received_wall - created_at) * 1000
+                self.histograms["gateway"].record(gateway_ms)
+                self.histograms["total"].record(gateway_ms + after_receive * 1000)
+            self.histograms["decide"].record((decided - received) * 1000)
+            self.histograms["dispatch"].record((send_started - decided) * 1000)
+            self.histograms["send"].record((acked - send_started) * 1000)
+
+    def snapshot(self) -> Dict[str, Dict[str, Optional[float]]]:
+        with self._lock:
+            return {stage: histogram.summary() for stage, histogram in self.histograms.items()}
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {stage: LatencyHistogram() for stage in STAGES}
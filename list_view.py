@@ -0,0 +1,262 @@
+import customtkinter as ctk
+
+
+class _Row:
+    """One recycled row: frame + label + remove button"""
+
+    def __init__(self, view, height):
+        self.frame = ctk.CTkFrame(view.body, height=height - 6)
+        self.label = ctk.CTkLabel(self.frame, text="", anchor="w", font=ctk.CTkFont(size=12))
+        self.label.pack(side="left", fill="x", expand=True, padx=10, pady=5)
+        self.button = ctk.CTkButton(self.frame, text=view.button_text, width=80, height=30,
+                                    command=self.on_click)
+        self.button.pack(side="right", padx=10, pady=5)
+        self.view = view
+        self.key = None
+        self.text = None
+        self.slot = None
+        self.visible = False
+
+        for widget in (self.frame, self.label):
+            view.bind_scroll(widget)
+
+    def on_click(self):
+        if self.key is not None and self.view.on_action:
+            self.view.on_action(self.key)
+
+    def show(self, slot, key, text):
+        self.key = key
+        # configure() on a CTk widget redraws it - skip when nothing changed
+        if text != self.text:
+            self.label.configure(text=text)
+            self.text = text
+        if not self.visible or slot != self.slot:
+            self.frame.place(x=0, y=slot * self.view.row_height, relwidth=1.0)
+            self.slot = slot
+            self.visible = True
+
+    def hide(self):
+        if self.visible:
+            self.frame.place_forget()
+            self.visible = False
+        self.key = None
+
+
+class VirtualListView(ctk.CTkFrame):
+    """Scrollable list that only ever builds enough rows to fill the viewport.
+
+    CTkScrollableFrame with one frame/label/button per entry falls over at a
+    few hundred entries. Here the data is a plain list of (key, text) pairs,
+    a handful of row widgets get recycled as you scroll, and add/remove/update
+    only touch the visible rows.
+    """
+
+    def __init__(self, master, on_action=None, button_text="Remove", row_height=44,
+                 empty_text="Nothing here yet", height=300, **kwargs):
+        super().__init__(master, height=height, **kwargs)
+        self.on_action = on_action
+        self.button_text = button_text
+        self.row_height = row_height
+        self.empty_text = empty_text
+
+        self.source = []       # every (key, text), in config order
+        self._positions = {}   # key -> index in self.source
+        self.items = self.source  # what's displayed - a filtered copy while searching
+        self._filter_keys = None
+        self.first_index = 0
+        self._rows = []
+        self._visible_count = 0
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y", padx=(0, 4), pady=4)
+
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.pack(side="left", fill="both", expand=True, padx=4, pady=4)
+        self.body.bind("<Configure>", self._on_resize)
+        self.bind_scroll(self.body)
+
+        self.message_label = ctk.CTkLabel(self.body, text="", font=ctk.CTkFont(size=12),
+                                          text_color="gray")
+
+    # ---- data -----------------------------------------------------------
+
+    def set_items(self, items, message=None):
+        """Replace the whole list. Cheap - it's just data until _render"""
+        self.source = list(items)
+        self._reindex()
+        self._apply_filter()
+        self._render(message)
+
+    def set_message(self, text, color="gray"):
+        """Replace the rows with a single status line (loading, errors...)"""
+        self.message_label.configure(text_color=color)
+        self._render(text, force_message=True)
+
+    def set_filter(self, keys=None, reset_scroll=True):
+        """Only show entries whose key is in keys (None shows everything)"""
+        self._filter_keys = keys
+        if reset_scroll:
+            self.first_index = 0
+        self._apply_filter()
+        self._render()
+
+    def upsert_item(self, key, text):
+        index = self._positions.get(key)
+        if index is None:
+            self._positions[key] = len(self.source)
+            self.source.append((key, text))
+        else:
+            self.source[index] = (key, text)
+        self._apply_filter()
+        self._render()
+
+    def remove_item(self, key):
+        index = self._positions.pop(key, None)
+        if index is None:
+            return
+        del self.source[index]
+        # Only entries after the removed one move
+        for position in range(index, len(self.source)):
+            self._positions[self.source[position][0]] = position
+        self._apply_filter()
+        self._render()
+
+    def _reindex(self):
+        self._positions = {key: index for index, (key, _) in enumerate(self.source)}
+
+    def _apply_filter(self):
+        if self._filter_keys is None:
+            self.items = self.source
+        else:
+            keys = self._filter_keys
+            self.items = [item for item in self.source if item[0] in keys]
+
+    # ---- scrolling ------------------------------------------------------
+
+    def bind_scroll(self, widget):
+        widget.bind("<MouseWheel>", self._on_mousewheel)
+        # X11 sends wheel events as buttons 4/5
+        widget.bind("<Button-4>", lambda event: self.scroll_by(-3))
+        widget.bind("<Button-5>", lambda event: self.scroll_by(3))
+
+    def _on_mousewheel(self, event):
+        # Windows reports multiples of 120 per notch, macOS small raw deltas
+        if abs(event.delta) >= 120:
+            self.scroll_by(-3 * int(event.delta / 120))
+        elif event.delta:
+            self.scroll_by(-3 if event.delta > 0 else 3)
+
+    def scroll_by(self, rows):
+        self._scroll_to(self.first_index + rows)
+
+    def _max_first_index(self):
+        return max(0, len(self.items) - max(1, self._visible_count - 1))
+
+    def _scroll_to(self, index):
+        index = max(0, min(int(index), self._max_first_index()))
+        if index != self.first_index:
+            self.first_index = index
+            self._render()
+
+    def _on_scrollbar(self, *args):
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._scroll_to(float(args[1]) * len(self.items))
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if len(args) > 2 and args[2] == "pages":
+                amount *= max(1, self._visible_count - 1)
+            self.scroll_by(amount)
+
+    def _on_resize(self, event):
+        visible_count = max(1, event.height // self.row_height + 1)
+        if visible_count != self._visible_count:
+            self._visible_count = visible_count
+            self._render()
+
+    # ---- drawing --------------------------------------------------------
+
+    def _render(self, message=None, force_message=False):
+        if force_message or not self.items:
+            for row in self._rows:
+                row.hide()
+            if not force_message:
+                self.message_label.configure(text_color="gray")
+                if self.source and message is None:
+                    message = "No matches"
+            self.message_label.configure(text=message or self.empty_text)
+            self.message_label.place(relx=0.5, y=20, anchor="n")
+            self.scrollbar.set(0.0, 1.0)
+            return
+        self.message_label.place_forget()
+
+        # Pool only grows to what the viewport can show
+        while len(self._rows) < self._visible_count:
+            self._rows.append(_Row(self, self.row_height))
+
+        self.first_index = max(0, min(self.first_index, self._max_first_index()))
+        for slot, row in enumerate(self._rows):
+            index = self.first_index + slot
+            if slot < self._visible_count and index < len(self.items):
+                key, text = self.items[index]
+                row.show(slot, key, text)
+            else:
+                row.hide()
+
+        total = len(self.items)
+        last = min(total, self.first_index + self._visible_count)
+        self.scrollbar.set(self.first_index / total, last / total)
+
+
+class SearchIndex:
+    """Substring search over list entries, kept in sync with the config.
+
+    Each key maps to one pre-lowercased haystack (key, response, resolved
+    name...). Typing another character only has to re-check the previous
+    hits, since a longer query can't match anything the shorter one didn't.
+    """
+
+    # Keeps a match from spanning two fields
+    FIELD_SEPARATOR = "\x00"
+
+    def __init__(self):
+        self._haystacks = {}
+        self._last_query = None
+        self._last_hits = None
+
+    def rebuild(self, entries):
+        """entries: iterable of (key, fields...) tuples"""
+        self._haystacks = {entry[0]: self._haystack(entry) for entry in entries}
+        self._forget_last()
+
+    def set(self, key, *fields):
+        self._haystacks[key] = self._haystack((key,) + fields)
+        self._forget_last()
+
+    def remove(self, key):
+        if self._haystacks.pop(key, None) is not None:
+            self._forget_last()
+
+    def search(self, query):
+        """Set of matching keys, or None for an empty query (= show everything)"""
+        query = query.strip().lower()
+        if not query:
+            return None
+
+        if self._last_query and query.startswith(self._last_query):
+            candidates = self._last_hits
+        else:
+            candidates = self._haystacks.keys()
+
+        haystacks = self._haystacks
+        hits = {key for key in candidates if query in haystacks[key]}
+        self._last_query, self._last_hits = query, hits
+        return hits
+
+    def _haystack(self, entry):
+        return self.FIELD_SEPARATOR.join(str(field) for field in entry if field is not None).lower()
+
+    def _forget_last(self):
+        self._last_query = None
+        self._last_hits = None
@@ -0,0 +1,65 @@
+import os
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+# How often the running bot logs its memory use
+MEMORY_REPORT_MINUTES = 30
+
+
+def resident_memory() -> Optional[Tuple[int, str]]:
+    """(bytes, what was measured) for this process, None if nothing can tell us.
+
+    psutil when it's installed, /proc on Linux, and getrusage as a last
+    resort - which only knows the peak, hence the label.
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss, "rss"
+    except Exception:
+        pass  # not installed, or refusing (sandboxed /proc etc.) - try the rest
+
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE"), "rss"
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows without psutil
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return (peak if sys.platform == "darwin" else peak * 1024), "peak rss"
+
+
+def client_cache_sizes(client) -> Dict[str, int]:
+    """How much discord.py is holding on to - the numbers lean mode is meant to keep down"""
+    guilds = client.guilds
+    return {
+        "guilds": len(guilds),
+        "channels": sum(len(guild.channels) for guild in guilds),
+        "members": sum(len(guild.members) for guild in guilds),
+        "users": len(client.users),
+        "messages": len(client.cached_messages),
+    }
+
+
+def memory_report(client=None) -> Tuple[str, Dict[str, Any]]:
+    """(log line, structured fields) describing current memory use"""
+    fields: Dict[str, Any] = {}
+    measured = resident_memory()
+    if measured is None:
+        text = "Memory: unknown (install psutil to measure it here)"
+    else:
+        size, label = measured
+        fields["rss_mb"] = round(size / (1024 * 1024), 1)
+        fields["measure"] = label
+        text = f"Memory: {fields['rss_mb']} MB {label}"
+
+    if client is not None:
+        caches = client_cache_sizes(client)
+        fields.update(caches)
+        text += " | cached " + ", ".join(f"{count} {name}" for name, count in caches.items())
+    return text, fields
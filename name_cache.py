@@ -0,0 +1,215 @@
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from atomic_file import atomic_write
+
+NAME_CACHE_FILE = "name_cache.json"
+LEGACY_CHANNEL_CACHE_FILE = "channel_names_cache.json"
+NAME_CACHE_VERSION = 1
+
+# How long a resolved name is trusted before the bot looks it up again.
+# Guild names hardly ever change; channel/role renames are caught by gateway events anyway.
+NAME_KINDS = ("channels", "roles", "guilds")
+DEFAULT_TTLS = {
+    "channels": 7 * 24 * 3600,
+    "roles": 7 * 24 * 3600,
+    "guilds": 30 * 24 * 3600,
+}
+
+_UNPRINTABLE_NAME_CHARS = re.compile(r"[^\w\s-]")
+
+
+def clean_name(name: str) -> str:
+    """Emoji and decorations stripped, same as the labels the GUI always showed"""
+    return " ".join(_UNPRINTABLE_NAME_CHARS.sub("", name or "").split())
+
+
+class NameCache:
+    """Channel, role and guild names resolved by the bot, in one file.
+
+    Entries are [name, guild_id, resolved_at] per ID, each with its own age,
+    so refreshing one channel never touches the rest. A fourth element marks
+    an object Discord deleted; its last known name is kept for display. The bot is the only
+    writer (atomic replace, only when something changed); the GUI just loads
+    it and calls reload() when the bot says names changed.
+    """
+
+    def __init__(self, path: str = NAME_CACHE_FILE, ttls: Optional[Dict[str, float]] = None,
+                 legacy_path: Optional[str] = LEGACY_CHANNEL_CACHE_FILE):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self._entries: Dict[str, Dict[str, list]] = {kind: {} for kind in NAME_KINDS}
+        self._lock = threading.Lock()
+        self._loaded_signature = None
+        self.dirty = False
+
+    # ---- persistence ----------------------------------------------------
+
+    def _signature(self):
+        try:
+            stat = os.stat(self.path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def load(self) -> bool:
+        """Read the cache file (or migrate the old channel cache). False if there was nothing to read."""
+        signature = self._signature()
+        if signature is None:
+            return self._migrate_legacy()
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading name cache: {e}")
+            return False
+
+        entries = {kind: {} for kind in NAME_KINDS}
+        for kind in NAME_KINDS:
+            for object_id, entry in (data.get(kind) or {}).items():
+                if isinstance(entry, list) and len(entry) in (3, 4):
+                    entries[kind][str(object_id)] = entry
+        with self._lock:
+            self._entries = entries
+            self._loaded_signature = signature
+            self.dirty = False
+        return True
+
+    def reload(self) -> bool:
+        """Re-read the file only if another process rewrote it since we loaded it"""
+        signature = self._signature()
+        if signature is None or signature == self._loaded_signature:
+            return False
+        return self.load()
+
+    def _migrate_legacy(self) -> bool:
+        """One-off import of channel_names_cache.json ({id: "#name in Guild"} plus one timestamp)"""
+        if not self.legacy_path or not os.path.exists(self.legacy_path):
+            return False
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            resolved_at = datetime.fromisoformat(data.get("last_updated", "")).timestamp()
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Could not migrate {self.legacy_path}: {e}")
+            return False
+
+        with self._lock:
+            for channel_id, label in (data.get("channels") or {}).items():
+                # Old entries only kept the finished label - store it whole, no guild
+                # link, and keep the old timestamp so it ages out on the old schedule
+                self._entries["channels"][str(channel_id)] = [label, None, resolved_at]
+            self.dirty = True
+        self.save()
+        return True
+
+    def save(self) -> bool:
+        """Atomically write the cache if anything changed since the last save"""
+        with self._lock:
+            if not self.dirty:
+                return False
+            payload = json.dumps({"version": NAME_CACHE_VERSION, **self._entries},
+                                 ensure_ascii=False, separators=(",", ":"))
+            self.dirty = False
+
+        try:
+            # Saved from the event loop, and a lost cache only means re-resolving names - no fsync
+            atomic_write(self.path, payload, durable=False)
+        except Exception as e:
+            with self._lock:
+                self.dirty = True  # try again next time
+            print(f"Error saving name cache: {e}")
+            return False
+        self._loaded_signature = self._signature()
+        return True
+
+    # ---- entries --------------------------------------------------------
+
+    def set(self, kind: str, object_id, name: str, guild_id=None) -> bool:
+        """Record a resolved name. Returns True if the name (or guild) actually changed."""
+        object_id = str(object_id)
+        guild_id = None if guild_id is None else str(guild_id)
+        with self._lock:
+            current = self._entries[kind].get(object_id)
+            changed = current is None or current[0] != name or current[1] != guild_id
+            self._entries[kind][object_id] = [name, guild_id, round(time.time())]
+            # A refresh with the same name still moves the timestamp, which has to be persisted
+            self.dirty = True
+        return changed
+
+    def remove(self, kind: str, object_id) -> bool:
+        with self._lock:
+            removed = self._entries[kind].pop(str(object_id), None) is not None
+            if removed:
+                self.dirty = True
+        return removed
+
+    def mark_deleted(self, kind: str, object_id) -> bool:
+        """Keep the name of a deleted channel/role, labelled as deleted. True if it wasn't already."""
+        with self._lock:
+            entry = self._entries[kind].get(str(object_id))
+            if entry is None or len(entry) > 3:
+                return False
+            self._entries[kind][str(object_id)] = entry + [True]
+            self.dirty = True
+        return True
+
+    def is_deleted(self, kind: str, object_id) -> bool:
+        entry = self._entries[kind].get(str(object_id))
+        return entry is not None and len(entry) > 3
+
+    def get(self, kind: str, object_id) -> Optional[str]:
+        entry = self._entries[kind].get(str(object_id))
+        return entry[0] if entry else None
+
+    def guild_of(self, kind: str, object_id) -> Optional[str]:
+        entry = self._entries[kind].get(str(object_id))
+        return entry[1] if entry else None
+
+    def is_fresh(self, kind: str, object_id, now: Optional[float] = None) -> bool:
+        entry = self._entries[kind].get(str(object_id))
+        if entry is None:
+            return False
+        return (now or time.time()) - entry[2] < self.ttls[kind]
+
+    def stale_ids(self, kind: str, object_ids: Iterable) -> List[str]:
+        """The IDs among object_ids that are missing or past their TTL"""
+        now = time.time()
+        return [str(object_id) for object_id in object_ids if not self.is_fresh(kind, object_id, now)]
+
+    def ids(self, kind: str) -> List[str]:
+        return list(self._entries[kind])
+
+    # ---- labels ---------------------------------------------------------
+
+    def channel_label(self, channel_id) -> Optional[str]:
+        """'#channel in Guild' for display, None if the channel was never resolved"""
+        entry = self._entries["channels"].get(str(channel_id))
+        if entry is None:
+            return None
+        name, guild_id = entry[:2]
+        suffix = " (deleted)" if len(entry) > 3 else ""
+        if guild_id is None:
+            return name + suffix  # migrated entries are already full labels
+
+        channel_name = clean_name(name)
+        guild_name = clean_name(self.get("guilds", guild_id) or f"server {guild_id}")
+        if channel_name:
+            return f"#{channel_name} in {guild_name}{suffix}"
+        return f"#{channel_id} in {guild_name} (emoji-only name){suffix}"
+
+    def role_label(self, role_id) -> Optional[str]:
+        entry = self._entries["roles"].get(str(role_id))
+        if entry is None:
+            return None
+        name, guild_id = entry[:2]
+        suffix = " (deleted)" if len(entry) > 3 else ""
+        guild_name = self.get("guilds", guild_id) if guild_id else None
+        return (f"@{name} in {guild_name}" if guild_name else f"@{name}") + suffix
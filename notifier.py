@@ -0,0 +1,96 @@
+import queue
+import threading
+import time
+
+
+class Notifier:
+    """Desktop alerts shown from a dedicated thread.
+
+    on_message just drops a (title, message) pair on the queue and moves on.
+    The worker waits a short window for more alerts and folds a burst into a
+    single summary box, so ten keys posted at once don't mean ten dialogs.
+    tkinter is imported lazily in the worker, so a headless bot never loads it.
+    """
+
+    # How many lines of a burst we show before "...and N more"
+    MAX_SUMMARY_LINES = 8
+
+    def __init__(self, coalesce_seconds: float = 1.5, log=print):
+        self.coalesce_seconds = coalesce_seconds
+        self.log = log
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._stopping = False
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="boostbot-notifier", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopping = True
+        self._queue.put(None)  # wake the worker up
+
+    def notify(self, title: str, message: str):
+        """Queue an alert. Never blocks."""
+        if not self._stopping:
+            self._queue.put((title, message))
+
+    def _collect_burst(self, first):
+        burst = [first]
+        deadline = time.monotonic() + self.coalesce_seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._stopping = True
+                break
+            burst.append(item)
+        return burst
+
+    def _summarize(self, burst):
+        if len(burst) == 1:
+            return burst[0]
+
+        lines = [message for _, message in burst[:self.MAX_SUMMARY_LINES]]
+        hidden = len(burst) - len(lines)
+        if hidden:
+            lines.append(f"...and {hidden} more")
+        return f"BoostBot - {len(burst)} responses sent", "\n".join(lines)
+
+    def _run(self):
+        root = None
+        messagebox = None
+        try:
+            import tkinter as tk
+            from tkinter import messagebox
+            # One hidden root owned by this thread for the whole session
+            root = tk.Tk()
+            root.withdraw()
+        except Exception as e:
+            self.log(f"Popups disabled: {e}")
+
+        while not self._stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            title, message = self._summarize(self._collect_burst(item))
+
+            if root is None:
+                continue  # no display - the log line is all the user gets
+            try:
+                # Alerts that arrive while this box is open get folded into the next one
+                messagebox.showinfo(title, message)
+            except Exception as e:
+                self.log(f"Popup failed: {e}")
+
+        if root is not None:
+            try:
+                root.destroy()
+            except Exception:
+                pass
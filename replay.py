@@ -0,0 +1,281 @@
+"""Record message traffic and replay it through the trigger logic offline.
+
+Recording: start bot.py with BOOSTBOT_TRACE_FILE=trace.jsonl.gz and every
+message the bot sees is appended as one compact JSON line.
+
+Replay: run the trace against a config (the current one by default) at full
+speed or at the recorded pace, with responses going to a local sink:
+
+    python replay.py trace.jsonl.gz
+    python replay.py trace.jsonl.gz --config other.json --delay 2 --scope channel
+    python replay.py trace.jsonl.gz --speed 1 --sink responses.jsonl
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, Optional
+
+from cooldowns import COOLDOWN_SCOPES, CooldownScheduler
+from triggers import CompiledConfig
+
+ENV_TRACE_FILE = "BOOSTBOT_TRACE_FILE"
+TRACE_VERSION = 1
+# Records between flushes - the bot is usually stopped with SIGTERM, which skips
+# atexit, so whatever hasn't been flushed by then is lost
+TRACE_FLUSH_EVERY = 100
+
+# Trace line keys, kept to one letter - a busy server produces a lot of lines:
+#   t  created_at, epoch seconds      c  channel ID      g  guild ID (absent in DMs)
+#   a  author ID                      s  1 if we sent it
+#   m  content                        r  mentioned role IDs (absent when none)
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def trace_record(message, own_user_id: Optional[int]) -> Dict[str, Any]:
+    """Compact trace line for a discord.Message"""
+    created_at = message.created_at.timestamp() if message.created_at else time.time()
+    record = {"t": round(created_at, 3), "c": message.channel.id, "a": message.author.id, "m": message.content}
+    if message.guild is not None:
+        record["g"] = message.guild.id
+    if own_user_id is not None and message.author.id == own_user_id:
+        record["s"] = 1
+    if message.role_mentions:
+        record["r"] = [role.id for role in message.role_mentions]
+    return record
+
+
+class TraceRecorder:
+    """Appends trace lines to a (optionally gzipped) JSONL file.
+
+    write() is called from the bot's post-send worker, close() from atexit,
+    so a lock keeps the two from interleaving. close() doesn't run when the
+    process is killed, so the file is flushed every TRACE_FLUSH_EVERY records
+    and stays readable up to that point.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = _open(path, "a")
+        self.count = 0
+        if new_file:
+            self._write_line({"trace": TRACE_VERSION, "started": round(time.time(), 3)})
+
+    def _write_line(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def write(self, record: Dict[str, Any]):
+        with self._lock:
+            if self._file is None:
+                return
+            self._write_line(record)
+            self.count += 1
+            if self.count % TRACE_FLUSH_EVERY == 0:
+                # For gzip this also does a Z_SYNC_FLUSH, so everything written so
+                # far decompresses even if the gzip trailer never gets written
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def read_trace(path: str) -> Iterator[Dict[str, Any]]:
+    """Message records from a trace file, skipping the header and damaged lines.
+
+    A trace whose recorder was killed ends mid-stream (a gzip one without its
+    trailer); everything up to that point is still returned.
+    """
+    with _open(path, "r") as trace_file:
+        lines = iter(trace_file)
+        while True:
+            try:
+                line = next(lines)
+            except StopIteration:
+                return
+            except (EOFError, OSError) as e:
+                print(f"WARNING: trace {path} ends early ({e}) - replaying what was recorded", file=sys.stderr)
+                return
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by a crash
+            if isinstance(record, dict) and "c" in record and "m" in record:
+                yield record
+
+
+class LocalSink:
+    """Collects the responses replay would have sent, optionally as JSON lines"""
+
+    def __init__(self, path: Optional[str] = None):
+        self._file = _open(path, "w") if path else None
+        self.sent = 0
+        self.by_trigger = Counter()
+
+    def send(self, record: Dict[str, Any], match):
+        self.sent += 1
+        self.by_trigger[f"{match.kind.lower()}: {match.name}"] += 1
+        if self._file is not None:
+            self._file.write(json.dumps({"t": record["t"], "c": record["c"], "kind": match.kind,
+                                         "trigger": match.name, "response": match.response},
+                                        ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def _message_from_record(record: Dict[str, Any]) -> SimpleNamespace:
+    """Just enough of a discord.Message for CompiledConfig.decide"""
+    return SimpleNamespace(
+        content=record["m"],
+        channel=SimpleNamespace(id=record["c"]),
+        role_mentions=[SimpleNamespace(id=role_id, name=str(role_id)) for role_id in record.get("r", ())],
+    )
+
+
+async def replay(records, cfg: CompiledConfig, sink: LocalSink, speed: float = 0.0) -> Dict[str, Any]:
+    """Run records through the same decisions as bot.on_message.
+
+    speed 0 = as fast as possible, 1 = recorded pace, 10 = ten times faster.
+    Cooldowns always run on the trace's own clock, so full speed and real
+    time give the same responses.
+    """
+    trace_now = [0.0]
+    cooldowns = CooldownScheduler(clock=lambda: trace_now[0])
+    skipped = Counter()
+    decide_ns = []
+
+    messages = 0
+    first_t = None
+    wall_started = time.perf_counter()
+    for record in records:
+        messages += 1
+        if first_t is None:
+            first_t = record["t"]
+        trace_now[0] = record["t"]
+
+        if speed > 0:
+            delay = (record["t"] - first_t) / speed - (time.perf_counter() - wall_started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        message = _message_from_record(record)
+        started = time.perf_counter_ns()
+        match, acquired, _, reason = cfg.decide(message, cooldowns, bool(record.get("s")))
+        if reason not in ("own message", "channel not allowed"):
+            # Only messages that got as far as matching count towards decide time
+            decide_ns.append(time.perf_counter_ns() - started)
+        if not acquired:
+            skipped[reason] += 1
+            continue
+        sink.send(record, match)
+
+    elapsed = time.perf_counter() - wall_started
+    decide_ns.sort()
+
+    def percentile_us(pct):
+        if not decide_ns:
+            return None
+        return round(decide_ns[min(len(decide_ns) - 1, int(len(decide_ns) * pct / 100))] / 1000, 2)
+
+    return {
+        "messages": messages,
+        "responses": sink.sent,
+        "skipped": dict(skipped),
+        "trace_seconds": round(trace_now[0] - first_t, 1) if first_t is not None else 0.0,
+        "wall_seconds": round(elapsed, 3),
+        "messages_per_sec": round(messages / elapsed, 1) if elapsed > 0 else None,
+        "decide_p50_us": percentile_us(50),
+        "decide_p99_us": percentile_us(99),
+        "top_triggers": sink.by_trigger.most_common(10),
+    }
+
+
+def load_replay_config(args) -> Optional[Dict[str, Any]]:
+    from config_manager import ConfigManager
+
+    config_dir = os.path.dirname(args.config) if args.config else "."
+    config_manager = ConfigManager(config_dir=config_dir or ".")
+    config, message = config_manager.load_config(os.path.basename(args.config) if args.config else None)
+    if config is None:
+        print(f"ERROR: {message}", file=sys.stderr)
+        return None
+
+    # What-if overrides, so cooldowns can be tuned without editing the config
+    if args.delay is not None:
+        config["message_delay_minutes"] = args.delay
+    if args.scope is not None:
+        config["cooldown_scope"] = args.scope
+    if args.all_channels:
+        config["allowed_channels"] = []
+    return config
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded message trace through BoostBot's triggers")
+    parser.add_argument("trace", help="trace file recorded with BOOSTBOT_TRACE_FILE (.jsonl or .jsonl.gz)")
+    parser.add_argument("--config", help="config file to replay against (default: the active config.json)")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="0 = full speed (default), 1 = recorded pace, 2 = twice as fast...")
+    parser.add_argument("--sink", help="write the responses that would have been sent to this JSONL file")
+    parser.add_argument("--delay", type=int, help="override message_delay_minutes")
+    parser.add_argument("--scope", choices=COOLDOWN_SCOPES, help="override cooldown_scope")
+    parser.add_argument("--all-channels", action="store_true", help="ignore the channel allow-list")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if not os.path.exists(args.trace):
+        print(f"ERROR: trace file '{args.trace}' not found", file=sys.stderr)
+        return 1
+
+    config = load_replay_config(args)
+    if config is None:
+        return 1
+
+    sink = LocalSink(args.sink)
+    try:
+        summary = asyncio.run(replay(read_trace(args.trace), CompiledConfig.from_config(config), sink, args.speed))
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        sink.close()
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return 0
+
+    print(f"Replayed {summary['messages']} messages ({summary['trace_seconds']}s of traffic) "
+          f"in {summary['wall_seconds']}s - {summary['messages_per_sec']} msg/s")
+    print(f"Responses: {summary['responses']}")
+    for reason, count in sorted(summary["skipped"].items()):
+        print(f"Skipped ({reason}): {count}")
+    print(f"Decision time: p50 {summary['decide_p50_us']}us, p99 {summary['decide_p99_us']}us")
+    for trigger, count in summary["top_triggers"]:
+        print(f"  {count:>6}  {trigger}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+import html
+import json
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from atomic_file import atomic_open
+
+REPORT_FORMATS = ("markdown", "html", "json")
+REPORT_EXTENSIONS = {"markdown": ".md", "html": ".html", "json": ".json"}
+
+
+class ReportWriter:
+    """Streams a document of titled tables straight to a file.
+
+    The caller drives it section by section and row by row, so a report over
+    hundreds of guilds never exists in memory as a whole - each row is
+    formatted and written as it comes. Output goes to a temp file that only
+    replaces the target once the report is complete.
+    """
+
+    def __init__(self, path: str, title: str, meta: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.title = title
+        self.meta = meta or {}
+        self.rows_written = 0
+        self._file = None
+        self._target = None
+        self._in_section = False
+        self._columns: Sequence[str] = ()
+
+    # ---- lifecycle ------------------------------------------------------
+
+    def __enter__(self):
+        self._target = atomic_open(self.path, "w", encoding="utf-8", newline="\n")
+        self._file = self._target.__enter__()
+        try:
+            self._begin()
+        except BaseException:
+            self._target.__exit__(*sys.exc_info())
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            try:
+                if self._in_section:
+                    self._end_section()
+                    self._in_section = False
+                self._end()
+            except BaseException:
+                self._target.__exit__(*sys.exc_info())
+                raise
+        # Replaces the report only on success, otherwise drops the temp file
+        self._target.__exit__(exc_type, exc, tb)
+        return False
+
+    def section(self, title: str, columns: Sequence[str], note: Optional[str] = None):
+        if self._in_section:
+            self._end_section()
+        self._columns = columns
+        self._in_section = True
+        self._begin_section(title, columns, note)
+
+    def row(self, values: Sequence[Any]):
+        self.rows_written += 1
+        self._row(["" if value is None else value for value in values])
+
+    def write(self, text: str):
+        self._file.write(text)
+
+    # ---- format hooks ---------------------------------------------------
+
+    def _begin(self):
+        raise NotImplementedError
+
+    def _begin_section(self, title, columns, note):
+        raise NotImplementedError
+
+    def _row(self, values):
+        raise NotImplementedError
+
+    def _end_section(self):
+        pass
+
+    def _end(self):
+        pass
+
+
+class MarkdownReportWriter(ReportWriter):
+    def _begin(self):
+        self.write(f"# {self.title}\n\n")
+        for key, value in self.meta.items():
+            self.write(f"- **{key}:** {value}\n")
+        self.write("\n")
+
+    def _begin_section(self, title, columns, note):
+        self.write(f"## {title}\n\n")
+        if note:
+            self.write(f"{note}\n\n")
+        self.write("| " + " | ".join(columns) + " |\n")
+        self.write("|" + "---|" * len(columns) + "\n")
+
+    def _row(self, values):
+        # Pipes and newlines would break the table
+        cells = [str(value).replace("|", "\\|").replace("\n", " ") for value in values]
+        self.write("| " + " | ".join(cells) + " |\n")
+
+    def _end_section(self):
+        self.write("\n")
+
+
+class HtmlReportWriter(ReportWriter):
+    def _begin(self):
+        title = html.escape(self.title)
+        self.write("<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+                   f"<title>{title}</title>\n<style>"
+                   "body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin-bottom:2em}"
+                   "th,td{border:1px solid #999;padding:4px 8px;text-align:left}th{background:#eee}"
+                   "</style></head><body>\n")
+        self.write(f"<h1>{title}</h1>\n<ul>\n")
+        for key, value in self.meta.items():
+            self.write(f"<li><b>{html.escape(str(key))}:</b> {html.escape(str(value))}</li>\n")
+        self.write("</ul>\n")
+
+    def _begin_section(self, title, columns, note):
+        self.write(f"<h2>{html.escape(title)}</h2>\n")
+        if note:
+            self.write(f"<p>{html.escape(note)}</p>\n")
+        self.write("<table><tr>" + "".join(f"<th>{html.escape(column)}</th>" for column in columns) + "</tr>\n")
+
+    def _row(self, values):
+        self.write("<tr>" + "".join(f"<td>{html.escape(str(value))}</td>" for value in values) + "</tr>\n")
+
+    def _end_section(self):
+        self.write("</table>\n")
+
+    def _end(self):
+        self.write("</body></html>\n")
+
+
+class JsonReportWriter(ReportWriter):
+    """One JSON document, written piecewise: rows become objects keyed by column"""
+
+    def _begin(self):
+        self.write("{" + json.dumps("title") + ":" + json.dumps(self.title, ensure_ascii=False) + ","
+                   + json.dumps("meta") + ":" + json.dumps(self.meta, ensure_ascii=False, default=str)
+                   + ',"sections":[')
+        self._first_section = True
+
+    def _begin_section(self, title, columns, note):
+        self.write(("" if self._first_section else ",") + "\n{\"title\":" + json.dumps(title, ensure_ascii=False))
+        if note:
+            self.write(",\"note\":" + json.dumps(note, ensure_ascii=False))
+        self.write(",\"rows\":[")
+        self._first_section = False
+        self._first_row = True
+
+    def _row(self, values):
+        record = dict(zip(self._columns, values))
+        self.write(("" if self._first_row else ",") + "\n" + json.dumps(record, ensure_ascii=False, default=str))
+        self._first_row = False
+
+    def _end_section(self):
+        self.write("]}")
+
+    def _end(self):
+        self.write("\n]}\n")
+
+
+_WRITERS = {
+    "markdown": MarkdownReportWriter,
+    "html": HtmlReportWriter,
+    "json": JsonReportWriter,
+}
+
+
+def open_report(path: str, fmt: str, title: str, meta: Optional[Dict[str, Any]] = None) -> ReportWriter:
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unknown report format '{fmt}' (use one of: {', '.join(REPORT_FORMATS)})")
+    return _WRITERS[fmt](path, title, meta)
+
+
+def report_path(base_name: str, fmt: str) -> str:
+    return base_name + REPORT_EXTENSIONS[fmt]
+
+
+def describe_rule(rule: Dict[str, Any]) -> str:
+    """One-line summary of a match rule for the report"""
+    parts: List[str] = []
+    for field, label in (("all_of", "all of"), ("any_of", "any of"), ("none_of", "none of")):
+        if rule.get(field):
+            parts.append(f"{label} " + ", ".join(f"'{term}'" for term in rule[field]))
+    if rule.get("regex"):
+        parts.append(f"regex /{rule['regex']}/")
+    flags = [flag.replace("_", " ") for flag in ("word_boundary", "normalize") if rule.get(flag)]
+    if flags:
+        parts.append(f"({', '.join(flags)})")
+    return "; ".join(parts)
+
+
+def timestamp() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
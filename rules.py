@@ -0,0 +1,397 @@
+import re
+import unicodedata
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# A rule in the config's "rules" list looks like:
+#   {
+#       "name": "+15 key",
+#       "all_of": ["+15", "key"],      # every term must appear
+#       "any_of": ["need", "lf"],      # at least one must appear
+#       "none_of": ["no boost"],       # none may appear
+#       "regex": "\\+1[5-9]",          # optional, searched in the message
+#       "word_boundary": true,         # "key" doesn't fire on "monkey"
+#       "normalize": true,             # casefold, fold accents/emoji variants
+#       "response": "I can do this key! DM me"
+#   }
+# A rule needs a response and at least one of all_of / any_of / regex.
+
+RULE_TERM_FIELDS = ("all_of", "any_of", "none_of")
+RULE_FLAG_FIELDS = ("word_boundary", "normalize")
+RULE_FIELDS = ("name", "regex", "response") + RULE_TERM_FIELDS + RULE_FLAG_FIELDS
+
+# Zero-width joiner/non-joiner/space and the emoji/text variation selectors.
+# "❤️" and "❤" differ only by U+FE0F, which people type inconsistently.
+_IGNORABLE = dict.fromkeys(map(ord, "\u200b\u200c\u200d\u2060\ufe0e\ufe0f"))
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Loose form of text for "normalize" rules: compatibility forms folded
+    (fullwidth/fancy letters), accents and emoji variation selectors dropped,
+    case folded and whitespace runs collapsed."""
+    text = unicodedata.normalize("NFKD", text).translate(_IGNORABLE)
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    text = unicodedata.normalize("NFC", text).casefold()
+    return _WHITESPACE_RUN.sub(" ", text)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def rule_label(rule: Any, position: int) -> str:
+    """How messages refer to a rule: its name if it has one, else its 1-based position"""
+    if isinstance(rule, dict) and isinstance(rule.get("name"), str) and rule["name"]:
+        return f"Rule '{rule['name']}'"
+    return f"Rule {position}"
+
+
+def rule_problems(rule: Any) -> List[Tuple[Optional[str], str]]:
+    """Every problem with one rule, as (field or None, message) pairs - messages name the field"""
+    if not isinstance(rule, dict):
+        return [(None, "must be an object")]
+
+    problems: List[Tuple[Optional[str], str]] = []
+    unknown = sorted(set(rule) - set(RULE_FIELDS))
+    if unknown:
+        problems.append((None, f"has unknown fields: {', '.join(unknown)}"))
+
+    if not isinstance(rule.get("response"), str) or not rule["response"]:
+        problems.append(("response", "response must be a non-empty string"))
+
+    for field in RULE_TERM_FIELDS:
+        terms = rule.get(field, [])
+        if not isinstance(terms, list) or not all(isinstance(term, str) and term.strip() for term in terms):
+            problems.append((field, f"{field} must be a list of non-empty strings"))
+        elif rule.get("normalize") is True and not all(normalize_text(term).strip() for term in terms):
+            problems.append((field, f"{field} has a term that is empty once normalized"))
+
+    for field in RULE_FLAG_FIELDS:
+        if field in rule and not isinstance(rule[field], bool):
+            problems.append((field, f"{field} must be true or false"))
+
+    regex = rule.get("regex")
+    if regex is not None:
+        if not isinstance(regex, str) or not regex:
+            problems.append(("regex", "regex must be a non-empty string"))
+        else:
+            try:
+                re.compile(regex)
+            except re.error as e:
+                problems.append(("regex", f"invalid regex: {e}"))
+
+    if not rule.get("all_of") and not rule.get("any_of") and not regex:
+        problems.append((None, "needs at least one of all_of, any_of or regex"))
+    return problems
+
+
+def validate_rules(rules: Any) -> tuple[bool, str]:
+    """Check the "rules" list the way validate_config checks everything else"""
+    if not isinstance(rules, list):
+        return False, "Rules must be a list"
+
+    for position, rule in enumerate(rules, start=1):
+        problems = rule_problems(rule)
+        if problems:
+            return False, f"{rule_label(rule, position)}: {problems[0][1]}"
+
+    return True, "Rules are valid"
+
+
+_GLOBAL_FLAGS = re.compile(r"\(\?[aiLmsux]+\)")
+
+
+def _without_captures(pattern: str) -> Optional[str]:
+    """pattern with every plain (...) group turned into (?:...), or None when
+    that would change what it matches.
+
+    Backreferences, conditionals and named groups depend on group numbers or
+    names, and a global inline flag like (?x) only works at the very start of
+    a regex - none of those survive being one alternative among many.
+    """
+    out = []
+    index, length = 0, len(pattern)
+    in_class = False
+    while index < length:
+        char = pattern[index]
+        if char == "\\":
+            escaped = pattern[index + 1:index + 2]
+            if not in_class and escaped and escaped in "123456789":
+                return None  # numbered backreference
+            out.append(pattern[index:index + 2])
+            index += 2
+            continue
+        if in_class:
+            if char == "]":
+                in_class = False
+        elif char == "[":
+            in_class = True
+            out.append(char)
+            index += 1
+            # A ] right after [ or [^ is a literal, not the end of the class
+            if pattern[index:index + 1] == "^":
+                out.append("^")
+                index += 1
+            if pattern[index:index + 1] == "]":
+                out.append("]")
+                index += 1
+            continue
+        elif char == "(":
+            if pattern.startswith("(?", index):
+                if pattern.startswith(("(?P", "(?(", "(?<", "(?'"), index) and \
+                        not pattern.startswith(("(?<=", "(?<!"), index):
+                    return None  # named group/backreference or conditional
+                if _GLOBAL_FLAGS.match(pattern, index):
+                    return None
+                if pattern.startswith("(?#", index):
+                    end = pattern.find(")", index)
+                    if end < 0:
+                        return None
+                    out.append(pattern[index:end + 1])
+                    index = end + 1
+                    continue
+            else:
+                out.append("(?:")
+                index += 1
+                continue
+        out.append(char)
+        index += 1
+    return "".join(out)
+
+
+class TermAutomaton:
+    """Aho-Corasick over every literal term of every rule, reporting all hits.
+
+    Unlike KeywordMatcher (which only wants the best keyword) this returns the
+    set of term ids seen, so one pass over the message answers every rule.
+    """
+
+    def __init__(self, terms: List[Tuple[str, bool]]):
+        # terms[i] = (text, word_boundary) - already case-folded by the caller
+        self.terms = terms
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        # Nearest node down the fail chain that has output, so a scan skips the silent ones
+        self._output_link: List[int] = [0]
+
+        for term_id, (text, _) in enumerate(terms):
+            node = 0
+            for char in text:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._output_link.append(0)
+                node = next_node
+            self._output[node].append(term_id)
+
+        self._build_fail_links()
+
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                fail = self._fail[child]
+                self._output_link[child] = fail if self._output[fail] else self._output_link[fail]
+                queue.append(child)
+
+    def find_all(self, text: str) -> Set[int]:
+        """Ids of the terms that occur in text (respecting each term's word_boundary)"""
+        found = set()
+        if not self.terms:
+            return found
+
+        goto, fail = self._goto, self._fail
+        output, output_link = self._output, self._output_link
+        terms = self.terms
+        last = len(text) - 1
+        node = 0
+        for end, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            hit = node if output[node] else output_link[node]
+            while hit:
+                for term_id in output[hit]:
+                    if term_id in found:
+                        continue
+                    term, word_boundary = terms[term_id]
+                    if word_boundary:
+                        start = end - len(term) + 1
+                        # Only edges that are word characters need a boundary,
+                        # so "+15" still matches in "lf +15 key"
+                        if _is_word_char(term[0]) and start > 0 and _is_word_char(text[start - 1]):
+                            continue
+                        if _is_word_char(term[-1]) and end < last and _is_word_char(text[end + 1]):
+                            continue
+                    found.add(term_id)
+                hit = output_link[hit]
+        return found
+
+
+class _CompiledRule:
+    __slots__ = ("index", "name", "response", "all_of", "any_of", "none_of", "regex", "normalize")
+
+    def __init__(self, index, name, response, all_of, any_of, none_of, regex, normalize):
+        self.index = index
+        self.name = name
+        self.response = response
+        self.all_of = all_of      # frozenset of term ids
+        self.any_of = any_of
+        self.none_of = none_of
+        self.regex = regex        # compiled pattern or None
+        self.normalize = normalize
+
+
+class RuleEngine:
+    """Every configured rule compiled into two automata and one regex.
+
+    Per message: one Aho-Corasick pass over the raw text, one over the
+    normalized text (only if some rule normalizes), and one search of the
+    combined regex. Only rules with a positive hit are then checked, so
+    adding rules doesn't add a full per-rule scan of every message.
+    """
+
+    def __init__(self, rules: Iterable[Dict[str, Any]], case_sensitive: bool = False):
+        self.case_sensitive = case_sensitive
+        self.rules: List[_CompiledRule] = []
+
+        # Separate term tables for raw and normalized matching;
+        # identical terms across rules share one id
+        term_ids = ({}, {})
+        term_lists = ([], [])
+        # term id -> indexes of rules that term can trigger (all_of/any_of)
+        triggers = ({}, {})
+        # Rules with nothing but a regex: the ones screened by one combined
+        # alternation, and the ones that have to be searched on their own
+        regex_only = ([], [])
+        regex_parts = ([], [])
+        regex_alone = ([], [])
+
+        def term_id(text, word_boundary, normalize):
+            if normalize:
+                text = normalize_text(text)
+            elif not case_sensitive:
+                text = text.lower()
+            key = (text, word_boundary)
+            table = term_ids[normalize]
+            if key not in table:
+                table[key] = len(term_lists[normalize])
+                term_lists[normalize].append(key)
+            return table[key]
+
+        for index, rule in enumerate(rules):
+            normalize = bool(rule.get("normalize", False))
+            word_boundary = bool(rule.get("word_boundary", False))
+            terms = {field: frozenset(term_id(term, word_boundary, normalize) for term in rule.get(field, []))
+                     for field in RULE_TERM_FIELDS}
+
+            regex = None
+            if rule.get("regex"):
+                flags = re.IGNORECASE if normalize or not case_sensitive else 0
+                regex = re.compile(rule["regex"], flags)
+
+            compiled = _CompiledRule(index, rule.get("name") or f"rule {index + 1}", rule["response"],
+                                     terms["all_of"], terms["any_of"], terms["none_of"], regex, normalize)
+            self.rules.append(compiled)
+
+            positive = terms["all_of"] | terms["any_of"]
+            for term in positive:
+                triggers[normalize].setdefault(term, []).append(index)
+            if not positive and regex is not None:
+                part = self._combinable(rule["regex"], flags)
+                if part is None:
+                    regex_alone[normalize].append(index)
+                else:
+                    regex_only[normalize].append(index)
+                    regex_parts[normalize].append(part)
+
+        self._raw = TermAutomaton(term_lists[False])
+        self._normalized = TermAutomaton(term_lists[True])
+        self._raw_triggers = triggers[False]
+        self._normalized_triggers = triggers[True]
+        self._raw_regex_only, self._normalized_regex_only = regex_only
+        self._raw_regex_alone, self._normalized_regex_alone = regex_alone
+        self._raw_regex = self._combine(regex_parts[False])
+        self._normalized_regex = self._combine(regex_parts[True])
+        self._needs_normalized = bool(term_lists[True] or regex_only[True] or regex_alone[True])
+
+    @staticmethod
+    def _combinable(pattern, flags):
+        """pattern as one alternative of the combined regex, or None if it can't be one.
+
+        Plain groups become non-capturing, so the glued-together regex has no
+        group numbers to clash; patterns that need their groups (see
+        _without_captures) are searched on their own instead.
+        """
+        pattern = _without_captures(pattern)
+        if pattern is None:
+            return None
+        # Scoped flags keep each alternative's case handling independent
+        scoped = f"(?i:{pattern})" if flags else f"(?:{pattern})"
+        try:
+            if re.compile(scoped).groups:
+                return None
+        except re.error:
+            return None
+        return scoped
+
+    @staticmethod
+    def _combine(parts):
+        if not parts:
+            return None
+        try:
+            return re.compile("|".join(parts))
+        except re.error:
+            return None  # fall back to searching each rule on its own
+
+    def __len__(self):
+        return len(self.rules)
+
+    def first_match(self, content: str) -> Optional[Tuple[str, str]]:
+        """(rule name, response) of the first rule in config order that matches"""
+        if not self.rules:
+            return None
+
+        normalized = normalize_text(content) if self._needs_normalized else ""
+        raw_hits = self._raw.find_all(content if self.case_sensitive else content.lower())
+        normalized_hits = self._normalized.find_all(normalized)
+
+        candidates = set()
+        for term in raw_hits:
+            candidates.update(self._raw_triggers.get(term, ()))
+        for term in normalized_hits:
+            candidates.update(self._normalized_triggers.get(term, ()))
+        if self._raw_regex_only and (self._raw_regex is None or self._raw_regex.search(content)):
+            candidates.update(self._raw_regex_only)
+        if self._normalized_regex_only and (self._normalized_regex is None or self._normalized_regex.search(normalized)):
+            candidates.update(self._normalized_regex_only)
+        candidates.update(self._raw_regex_alone)
+        candidates.update(self._normalized_regex_alone)
+
+        for index in sorted(candidates):
+            rule = self.rules[index]
+            hits = normalized_hits if rule.normalize else raw_hits
+            if rule.all_of and not rule.all_of <= hits:
+                continue
+            if rule.any_of and rule.any_of.isdisjoint(hits):
+                continue
+            if rule.none_of and not rule.none_of.isdisjoint(hits):
+                continue
+            if rule.regex is not None:
+                if not rule.regex.search(normalized if rule.normalize else content):
+                    continue
+            return rule.name, rule.response
+        return None
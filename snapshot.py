@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import pickle
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+from atomic_file import atomic_open
+from rules import RuleEngine
+from triggers import CompiledConfig, KeywordMatcher
+
+# Bump whenever KeywordMatcher/RuleEngine change shape, so old snapshots are rebuilt
+SNAPSHOT_VERSION = 3
+SNAPSHOT_SUFFIX = ".compiled"
+# First line of a snapshot: magic, version and matcher hash, so a stale file
+# is recognised without unpickling the matchers behind it
+SNAPSHOT_MAGIC = b"BOOSTBOT-MATCHERS"
+
+
+def snapshot_path(config_path: str) -> str:
+    """Hidden file next to the config: ./config.json -> ./.config.json.compiled"""
+    directory, name = os.path.split(config_path)
+    return os.path.join(directory, f".{name}{SNAPSHOT_SUFFIX}")
+
+
+def matcher_hash(config: Dict[str, Any]) -> str:
+    """sha256 of exactly what the matchers are built from.
+
+    Keyword order is kept (it's the match priority); keyword responses, the
+    token, cooldowns and channels aren't part of the automata, so editing
+    them doesn't throw the snapshot away.
+    """
+    canonical = json.dumps({
+        "version": SNAPSHOT_VERSION,
+        "python": list(sys.version_info[:2]),
+        "case_sensitive": bool(config.get("case_sensitive", False)),
+        "keywords": list(config.get("keywords", {})),
+        "rules": config.get("rules", []),
+    }, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _header(key: str) -> bytes:
+    return b"%s %d %s\n" % (SNAPSHOT_MAGIC, SNAPSHOT_VERSION, key.encode("ascii"))
+
+
+def load_matchers(path: str, key: str) -> Optional[Tuple[KeywordMatcher, RuleEngine]]:
+    """The pickled matchers if the snapshot exists and was built from the same config, else None.
+
+    Only the one-line header is read when the hash doesn't match. The file
+    lives in the config directory, so anyone able to write it could edit the
+    config itself - unpickling it trusts nothing new.
+    """
+    expected = _header(key)
+    try:
+        with open(path, "rb") as f:
+            if f.readline(len(expected)) != expected:
+                return None  # older format, other version or other config
+            data = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Ignoring unreadable matcher snapshot {path}: {e}")
+        return None
+
+    if not isinstance(data, dict):
+        return None
+    keyword_matcher, rule_engine = data.get("keyword_matcher"), data.get("rule_engine")
+    if not isinstance(keyword_matcher, KeywordMatcher) or not isinstance(rule_engine, RuleEngine):
+        return None
+    return keyword_matcher, rule_engine
+
+
+def save_snapshot(config_path: str, compiled: CompiledConfig) -> bool:
+    """Atomically write compiled's matchers next to the config (safe to run off the event loop)"""
+    path = snapshot_path(config_path)
+    payload = {
+        "keyword_matcher": compiled.keyword_matcher,
+        "rule_engine": compiled.rule_engine,
+    }
+    try:
+        with atomic_open(path, "wb") as f:
+            f.write(_header(matcher_hash(compiled.source)))
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return True
+    except Exception as e:
+        print(f"Error saving matcher snapshot: {e}")
+        return False
+
+
+def compile_config(config: Dict[str, Any], config_path: str) -> Tuple[CompiledConfig, bool]:
+    """CompiledConfig for config, reusing the snapshot's matchers when the hash matches.
+
+    Returns (compiled, from_snapshot); when from_snapshot is False the caller
+    should save_snapshot() once it's convenient.
+    """
+    matchers = load_matchers(snapshot_path(config_path), matcher_hash(config))
+    if matchers is not None:
+        return CompiledConfig.from_config(config, *matchers), True
+    return CompiledConfig.from_config(config), False
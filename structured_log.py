@@ -0,0 +1,109 @@
+import json
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+LOG_FORMATS = ("text", "json")
+ENV_LOG_FORMAT = "BOOSTBOT_LOG_FORMAT"
+
+
+def render_record(record: Dict[str, Any]) -> str:
+    """Human-readable line for a record - same look as the old bot_log output"""
+    timestamp = datetime.fromtimestamp(record.get("ts", time.time())).strftime("%H:%M:%S")
+    level = record.get("level", "INFO")
+    prefix = "" if level == "INFO" else f"{level}: "
+    return f"[{timestamp}] {prefix}{record.get('msg', '')}"
+
+
+def format_record(record: Dict[str, Any], fmt: str) -> str:
+    if fmt == "json":
+        return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+    return render_record(record)
+
+
+def parse_line(line: str) -> Optional[Dict[str, Any]]:
+    """Turn a JSON log line back into a record; None for anything else (tracebacks, prints...)"""
+    line = line.strip()
+    if not line.startswith("{"):
+        return None
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if isinstance(record, dict) and "msg" in record:
+        return record
+    return None
+
+
+class LogPipeline:
+    """Non-blocking logger: callers enqueue, a writer thread does the I/O.
+
+    The writer drains everything that piled up since its last write and emits
+    it as one write + one flush, so a busy bot doesn't pay a flush per line and
+    the event loop never waits on stdout (which is a pipe to the GUI).
+    """
+
+    def __init__(self, stream=None, fmt: str = "text", batch_size: int = 500):
+        if fmt not in LOG_FORMATS:
+            fmt = "text"
+        self.stream = stream or sys.stdout
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._closed = False
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="boostbot-log-writer", daemon=True)
+            self._thread.start()
+
+    def log(self, message: str, level: str = "INFO", event: str = "log", **fields):
+        record = {"ts": round(time.time(), 3), "level": level, "event": event, "msg": message}
+        # Drop empty fields so JSON lines stay short
+        for key, value in fields.items():
+            if value is not None:
+                record[key] = value
+        if self._thread is None or self._closed:
+            # Not started yet (or shutting down) - write inline so nothing gets lost
+            self._write([record])
+        else:
+            self._queue.put(record)
+
+    def close(self, timeout: float = 2.0):
+        """Flush whatever is queued and stop the writer"""
+        if self._thread is None or self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _write(self, records):
+        try:
+            self.stream.write("".join(format_record(record, self.fmt) + "\n" for record in records))
+            self.stream.flush()
+        except Exception:
+            pass  # stdout went away (GUI closed) - nothing sensible to do with log lines
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            if record is None:
+                return
+            batch = [record]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is None:
+                    stop = True
+                    break
+                batch.append(record)
+            self._write(batch)
+            if stop:
+                return
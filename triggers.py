@@ -0,0 +1,295 @@
+import copy
+from collections import deque
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from cooldowns import COOLDOWN_SCOPES, DEFAULT_COOLDOWN_SCOPE
+from rules import RuleEngine
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over the configured keywords.
+
+    Built once per config load so on_message can find every keyword in a
+    single pass over the message instead of one `in` check per keyword.
+    """
+
+    # Sentinel meaning "no keyword matched"; bigger than any real index
+    NO_MATCH = float("inf")
+
+    def __init__(self, keywords: Iterable[str], case_sensitive: bool = False):
+        # Keep config order - the index in this list is the keyword's priority
+        self.keywords: List[str] = list(keywords)
+        self.case_sensitive = case_sensitive
+
+        # Trie stored as parallel lists, node 0 is the root
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Lowest keyword index that ends at this node (or anywhere down its fail chain)
+        self._best: List[float] = [self.NO_MATCH]
+
+        for index, keyword in enumerate(self.keywords):
+            pattern = keyword if case_sensitive else keyword.lower()
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(self.NO_MATCH)
+                node = next_node
+            # Duplicate patterns (e.g. "Key" and "key" when case-insensitive) -
+            # the earlier one in the config wins, same as the old linear scan
+            if index < self._best[node]:
+                self._best[node] = index
+
+        self._build_fail_links()
+
+    def _build_fail_links(self):
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            if self._best[0] < self._best[child]:
+                self._best[child] = self._best[0]
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                # Fold the fail chain's matches into this node so lookups don't walk it
+                if self._best[self._fail[child]] < self._best[child]:
+                    self._best[child] = self._best[self._fail[child]]
+                queue.append(child)
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def first_match(self, text: str) -> Optional[str]:
+        """Return the first keyword (in config order) found in text, or None"""
+        if not self.keywords:
+            return None
+
+        if not self.case_sensitive:
+            text = text.lower()
+
+        goto = self._goto
+        fail = self._fail
+        best = self._best
+
+        # An empty keyword matches everything, just like `"" in text` did
+        found = best[0]
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if best[node] < found:
+                found = best[node]
+                if found == 0:
+                    break  # can't beat the first keyword
+
+        if found == self.NO_MATCH:
+            return None
+        return self.keywords[found]
+
+
+class TriggerMatch(NamedTuple):
+    """What a message triggered: kind ("ROLE MENTION"/"KEYWORD"/"RULE"), the
+    name shown in logs, the key cooldown overrides use, and the response"""
+    kind: str
+    name: str
+    key: str
+    response: str
+
+
+class Decision(NamedTuple):
+    """What to do with one message: respond with match when acquired is True.
+
+    skipped says why not otherwise ("own message", "channel not allowed",
+    "no trigger" or "cooldown"); remaining is the cooldown left in seconds.
+    """
+    match: Optional[TriggerMatch]
+    acquired: bool
+    remaining: float = 0.0
+    skipped: Optional[str] = None
+
+
+def _snowflake_or_none(value) -> Optional[int]:
+    """Discord IDs are stored as strings in the config; anything non-numeric can never match"""
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class CompiledConfig:
+    """Read-only view of a loaded config, shaped for the on_message hot path.
+
+    Everything on_message needs is an attribute or an O(1) lookup keyed by
+    the ints discord.py already hands us, so no per-message str() or .get().
+    """
+    source: Mapping[str, Any]
+    restrict_channels: bool
+    allowed_channels: FrozenSet[int]
+    role_responses: Mapping[int, str]
+    keyword_responses: Mapping[str, str]
+    keyword_matcher: KeywordMatcher
+    rule_engine: RuleEngine
+    case_sensitive: bool
+    respond_to_self: bool
+    reply_to_message: bool
+    message_delay_minutes: int
+    cooldown_scope: str
+    channel_cooldowns: Mapping[int, float]  # seconds, overriding the default window
+    trigger_cooldowns: Mapping[str, float]
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], keyword_matcher: Optional[KeywordMatcher] = None,
+                    rule_engine: Optional[RuleEngine] = None) -> "CompiledConfig":
+        """Compile config; prebuilt matchers (from a snapshot of the same config) skip the expensive part"""
+        case_sensitive = bool(config.get("case_sensitive", False))
+
+        allowed_channels = set()
+        for channel_id in config.get("allowed_channels", []):
+            snowflake = _snowflake_or_none(channel_id)
+            if snowflake is not None:
+                allowed_channels.add(snowflake)
+
+        role_responses = {}
+        for role_id, response in config.get("role_mentions", {}).items():
+            snowflake = _snowflake_or_none(role_id)
+            if snowflake is not None and snowflake not in role_responses:
+                role_responses[snowflake] = response
+
+        keywords = dict(config.get("keywords", {}))
+
+        channel_cooldowns = {}
+        for channel_id, minutes in config.get("channel_cooldowns", {}).items():
+            snowflake = _snowflake_or_none(channel_id)
+            if snowflake is not None:
+                channel_cooldowns[snowflake] = float(minutes) * 60
+        trigger_cooldowns = {str(trigger): float(minutes) * 60
+                             for trigger, minutes in config.get("trigger_cooldowns", {}).items()}
+
+        if keyword_matcher is None:
+            keyword_matcher = KeywordMatcher(keywords.keys(), case_sensitive)
+        if rule_engine is None:
+            rule_engine = RuleEngine(config.get("rules", []), case_sensitive)
+
+        cooldown_scope = config.get("cooldown_scope", DEFAULT_COOLDOWN_SCOPE)
+        if cooldown_scope not in COOLDOWN_SCOPES:
+            cooldown_scope = DEFAULT_COOLDOWN_SCOPE
+
+        return cls(
+            # Snapshot, so later GUI-side edits to the dict can't leak in half-way
+            source=MappingProxyType(copy.deepcopy(config)),
+            # Decided on the raw list: a list of only junk IDs should still block everything
+            restrict_channels=bool(config.get("allowed_channels")),
+            allowed_channels=frozenset(allowed_channels),
+            role_responses=MappingProxyType(role_responses),
+            keyword_responses=MappingProxyType(keywords),
+            keyword_matcher=keyword_matcher,
+            rule_engine=rule_engine,
+            case_sensitive=case_sensitive,
+            respond_to_self=bool(config.get("respond_to_self", False)),
+            reply_to_message=bool(config.get("reply_to_message", True)),
+            message_delay_minutes=int(config.get("message_delay_minutes", 5)),
+            cooldown_scope=cooldown_scope,
+            channel_cooldowns=MappingProxyType(channel_cooldowns),
+            trigger_cooldowns=MappingProxyType(trigger_cooldowns),
+        )
+
+    def channel_allowed(self, channel_id: int) -> bool:
+        # Empty allow-list means "listen everywhere"
+        return not self.restrict_channels or channel_id in self.allowed_channels
+
+    def cooldown_for(self, channel_id: int, trigger_type: str, trigger: str) -> Tuple[Tuple, float]:
+        """(scheduler key, window seconds) for a response about to be sent.
+
+        The window is the trigger's own override, else the channel's, else
+        message_delay_minutes. trigger is the keyword, rule name or role ID.
+        """
+        window = self.trigger_cooldowns.get(trigger)
+        if window is None:
+            window = self.channel_cooldowns.get(channel_id, self.message_delay_minutes * 60)
+
+        if self.cooldown_scope == "global":
+            return ("global",), window
+        if self.cooldown_scope == "channel":
+            return (channel_id,), window
+        return (channel_id, trigger_type, trigger), window
+
+    def match_role(self, roles) -> Optional[Tuple[Any, str]]:
+        """First mentioned role (in mention order) that has a configured response"""
+        if not self.role_responses:
+            return None
+        for role in roles:
+            response = self.role_responses.get(role.id)
+            if response is not None:
+                return role, response
+        return None
+
+    def match_keyword(self, content: str) -> Optional[Tuple[str, str]]:
+        """First keyword in config order found in content, with its response"""
+        keyword = self.keyword_matcher.first_match(content)
+        if keyword is None:
+            return None
+        return keyword, self.keyword_responses[keyword]
+
+    def match_rule(self, content: str) -> Optional[Tuple[str, str]]:
+        """First rule in config order that matches content: (rule name, response)"""
+        if not self.rule_engine:
+            return None
+        return self.rule_engine.first_match(content)
+
+    def match_message(self, message) -> Optional[TriggerMatch]:
+        """The whole trigger decision for a message that passed the channel check.
+
+        Role mentions take priority over keywords, keywords over rules.
+        """
+        if message.role_mentions:
+            role_match = self.match_role(message.role_mentions)
+            if role_match is not None:
+                role, response = role_match
+                return TriggerMatch("ROLE MENTION", role.name, str(role.id), response)
+
+        keyword_match = self.match_keyword(message.content)
+        if keyword_match is not None:
+            keyword, response = keyword_match
+            return TriggerMatch("KEYWORD", keyword, keyword, response)
+
+        rule_match = self.match_rule(message.content)
+        if rule_match is not None:
+            rule_name, response = rule_match
+            return TriggerMatch("RULE", rule_name, rule_name, response)
+        return None
+
+    def decide(self, message, cooldowns, from_self: bool = False) -> Decision:
+        """Everything between receiving a message and sending the response.
+
+        The bot, the benchmark and replay all go through here, so they can't
+        drift apart. from_self is whether we wrote the message; the cooldown is
+        only taken once there is something to send.
+        """
+        if from_self and not self.respond_to_self:
+            return Decision(None, False, skipped="own message")
+        channel_id = message.channel.id
+        if not self.channel_allowed(channel_id):
+            return Decision(None, False, skipped="channel not allowed")
+        match = self.match_message(message)
+        if match is None:
+            return Decision(None, False, skipped="no trigger")
+        cooldown_key, window = self.cooldown_for(channel_id, match.kind, match.key)
+        acquired, remaining = cooldowns.try_acquire(cooldown_key, window)
+        if not acquired:
+            return Decision(match, False, remaining, "cooldown")
+        return Decision(match, True)